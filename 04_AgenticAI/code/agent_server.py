@@ -0,0 +1,254 @@
+"""
+agent_server.py
+
+This script serves the agentic AI chatbot from agentic_ai_tools.py over HTTP, so many users can chat at the same time.
+
+How it works:
+- Every session_id gets its own agent with its own ConversationBufferMemory (no shared chat history).
+- All sessions run on one asyncio event loop and call the agent with ainvoke().
+- Blocking tools (search, Wikipedia, calculator, python runner) run on a bounded thread pool,
+  so a slow tool never blocks the event loop and the number of tool threads stays fixed.
+- A semaphore limits how many agent turns run at once. Extra requests wait in a queue,
+  and are rejected with HTTP 503 when the queue is full.
+- The agent gets no python_code_runner tool (it exec()s model-written code on this host) unless
+  the server is started with --allow-python-exec, and the server listens on 127.0.0.1 by default.
+
+Endpoints:
+    POST   /chat                   {"session_id": "abc", "input": "sum of 120 and 20"}
+    DELETE /sessions/{session_id}  Drop a session and its memory
+    GET    /metrics                Concurrency, queue depth and thread pool stats
+
+Dependencies:
+    - fastapi
+    - uvicorn
+    - everything agentic_ai_tools.py needs
+
+Usage:
+    Ensure a valid OpenAI API key is set in the .env file as OPENAI_API_KEY.
+    python agent_server.py --port 8090 --max-concurrency 8 --max-queue 64 --tool-workers 4
+    python agent_server.py --host 0.0.0.0      # reachable from other machines
+    Then run agent_server_loadtest.py to measure sessions/sec.
+"""
+
+import argparse
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
+
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel
+
+
+# Thread pool that counts queued and running jobs, so queue depth can be reported
+class InstrumentedThreadPool(ThreadPoolExecutor):
+    def __init__(self, max_workers: int) -> None:
+        super().__init__(max_workers=max_workers, thread_name_prefix="agent-tool")
+        self._stats_lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+
+    def submit(self, fn, /, *args, **kwargs):
+        with self._stats_lock:
+            self.queued += 1
+
+        def tracked():
+            with self._stats_lock:
+                self.queued -= 1
+                self.running += 1
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._stats_lock:
+                    self.running -= 1
+                    self.completed += 1
+
+        return super().submit(tracked)
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "max_workers": self._max_workers,
+                "queued": self.queued,
+                "running": self.running,
+                "completed": self.completed,
+            }
+
+
+# One user conversation: its own agent (and memory) plus a lock so turns of the same session run in order
+class Session:
+    def __init__(self, agent) -> None:
+        self.agent = agent
+        self.lock = asyncio.Lock()
+        self.turns = 0
+        self.last_used = time.monotonic()
+
+
+class ChatRequest(BaseModel):
+    session_id: str
+    input: str
+
+
+class ChatResponse(BaseModel):
+    session_id: str
+    output: str
+    latency_ms: float
+
+
+def default_agent_factory(allow_python_exec: bool = False):
+    """
+    Build a real agent from agentic_ai_tools.py.
+    Imported lazily so the server module can be loaded (e.g. by the load test) without an OpenAI key.
+
+    Args:
+        allow_python_exec (bool): Give the agent python_code_runner, which runs model-written code
+            with exec() on this host. Anyone who can reach the server could then run code on it.
+    """
+    from agentic_ai_tools import build_agent
+    return build_agent(allow_python_exec=allow_python_exec)
+
+
+def create_app(
+    agent_factory=default_agent_factory,
+    max_concurrency: int = 8,
+    max_queue: int = 64,
+    tool_workers: int = 4,
+    max_sessions: int = 1000,
+) -> FastAPI:
+    """
+    Create the FastAPI app.
+
+    Args:
+        agent_factory: Callable returning a new agent (anything with an async ainvoke({"input": ...})).
+        max_concurrency (int): Agent turns allowed to run at the same time.
+        max_queue (int): Turns allowed to wait for a slot before new ones get HTTP 503.
+        tool_workers (int): Size of the thread pool used for blocking tool calls.
+        max_sessions (int): Sessions kept in memory; the least recently used one is dropped beyond this.
+
+    Returns:
+        FastAPI: The configured application.
+    """
+    sessions: "OrderedDict[str, Session]" = OrderedDict()
+    slots = asyncio.Semaphore(max_concurrency)
+    tool_pool = InstrumentedThreadPool(max_workers=tool_workers)
+    metrics = {
+        "running": 0,
+        "queued": 0,
+        "max_queued": 0,
+        "completed": 0,
+        "failed": 0,
+        "rejected": 0,
+        "sessions_created": 0,
+        "sessions_evicted": 0,
+    }
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        # LangChain runs sync tools with run_in_executor(None, ...), i.e. on the loop's default executor.
+        # Making our bounded pool the default caps the number of blocking tool threads.
+        asyncio.get_running_loop().set_default_executor(tool_pool)
+        yield
+        tool_pool.shutdown(wait=False, cancel_futures=True)
+
+    app = FastAPI(title="Agentic AI chatbot server", lifespan=lifespan)
+
+    def get_session(session_id: str) -> Session:
+        session = sessions.get(session_id)
+        if session is None:
+            session = Session(agent_factory())
+            sessions[session_id] = session
+            metrics["sessions_created"] += 1
+            while len(sessions) > max_sessions:
+                sessions.popitem(last=False)
+                metrics["sessions_evicted"] += 1
+        sessions.move_to_end(session_id)
+        session.last_used = time.monotonic()
+        return session
+
+    @app.post("/chat", response_model=ChatResponse)
+    async def chat(request: ChatRequest) -> ChatResponse:
+        if metrics["queued"] >= max_queue:
+            metrics["rejected"] += 1
+            raise HTTPException(status_code=503, detail="Server busy, try again later")
+
+        start = time.perf_counter()
+        session = get_session(request.session_id)
+
+        metrics["queued"] += 1
+        metrics["max_queued"] = max(metrics["max_queued"], metrics["queued"])
+        try:
+            # Session lock first: a turn waiting behind its own session must not hold a global slot
+            await session.lock.acquire()
+            try:
+                await slots.acquire()
+            except BaseException:
+                session.lock.release()
+                raise
+        finally:
+            metrics["queued"] -= 1
+
+        metrics["running"] += 1
+        try:
+            response = await session.agent.ainvoke({"input": request.input})
+            session.turns += 1
+            metrics["completed"] += 1
+        except Exception as e:
+            metrics["failed"] += 1
+            raise HTTPException(status_code=500, detail=str(e))
+        finally:
+            metrics["running"] -= 1
+            slots.release()
+            session.lock.release()
+
+        return ChatResponse(
+            session_id=request.session_id,
+            output=str(response["output"]),
+            latency_ms=(time.perf_counter() - start) * 1000,
+        )
+
+    @app.delete("/sessions/{session_id}")
+    async def end_session(session_id: str) -> dict:
+        if sessions.pop(session_id, None) is None:
+            raise HTTPException(status_code=404, detail="Session not found")
+        return {"detail": "Session deleted"}
+
+    @app.get("/metrics")
+    async def get_metrics() -> dict:
+        return {
+            **metrics,
+            "sessions": len(sessions),
+            "max_concurrency": max_concurrency,
+            "max_queue": max_queue,
+            "tool_pool": tool_pool.stats(),
+        }
+
+    return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Serve the agentic AI chatbot over HTTP")
+    parser.add_argument("--host", default="127.0.0.1", help="Use 0.0.0.0 to accept connections from other machines")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--max-concurrency", type=int, default=8)
+    parser.add_argument("--max-queue", type=int, default=64)
+    parser.add_argument("--tool-workers", type=int, default=4)
+    parser.add_argument("--allow-python-exec", action="store_true",
+                        help="Serve the python_code_runner tool (runs model-written code on this host)")
+    args = parser.parse_args()
+
+    app = create_app(
+        agent_factory=partial(default_agent_factory, allow_python_exec=args.allow_python_exec),
+        max_concurrency=args.max_concurrency,
+        max_queue=args.max_queue,
+        tool_workers=args.tool_workers,
+    )
+    uvicorn.run(app, host=args.host, port=args.port)
@@ -0,0 +1,155 @@
+"""
+agent_server_loadtest.py
+
+A small load test for agent_server.py that reports sessions/sec, turns/sec and latency percentiles.
+
+By default it starts the server in-process with a fake agent, so no OpenAI key or network is needed:
+- The fake agent "thinks" with asyncio.sleep (like waiting on the LLM API).
+- Then it calls a blocking tool with time.sleep, which goes through the server's bounded thread pool,
+  the same path the real tools take.
+- Each fake agent keeps its own history, so the test also checks that sessions don't share memory.
+
+Usage:
+    python agent_server_loadtest.py --sessions 200 --turns 3 --concurrency 50
+    python agent_server_loadtest.py --url http://localhost:8090 --sessions 20   # against a running server
+
+Dependencies:
+    - httpx
+    - fastapi, uvicorn (for the in-process server)
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+import httpx
+
+
+class FakeAgent:
+    """Stands in for the LangChain agent: async LLM wait followed by a blocking tool call."""
+
+    def __init__(self, llm_latency: float, tool_latency: float) -> None:
+        self.llm_latency = llm_latency
+        self.tool_latency = tool_latency
+        self.history = []
+
+    async def ainvoke(self, inputs: dict) -> dict:
+        await asyncio.sleep(self.llm_latency)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, time.sleep, self.tool_latency)
+        self.history.append(inputs["input"])
+        return {"output": f"turn {len(self.history)}: {inputs['input']}"}
+
+
+def percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_session(client: httpx.AsyncClient, turns: int, latencies: list, errors: list) -> None:
+    session_id = str(uuid.uuid4())
+    for turn in range(1, turns + 1):
+        start = time.perf_counter()
+        try:
+            resp = await client.post("/chat", json={"session_id": session_id, "input": f"{session_id} #{turn}"})
+            resp.raise_for_status()
+            output = resp.json()["output"]
+            # The fake agent numbers its turns, so a session must only ever see its own count
+            if output.startswith("turn ") and not output.startswith(f"turn {turn}:"):
+                errors.append(f"session {session_id} saw another session's memory: {output}")
+        except Exception as e:
+            errors.append(str(e))
+            return
+        latencies.append((time.perf_counter() - start) * 1000)
+    await client.delete(f"/sessions/{session_id}")
+
+
+async def run_load(url: str, sessions: int, turns: int, concurrency: int) -> dict:
+    latencies, errors = [], []
+    gate = asyncio.Semaphore(concurrency)
+
+    async def limited(client):
+        async with gate:
+            await run_session(client, turns, latencies, errors)
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, timeout=120, limits=limits) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(limited(client) for _ in range(sessions)))
+        elapsed = time.perf_counter() - start
+        server_metrics = (await client.get("/metrics")).json()
+
+    return {
+        "sessions": sessions,
+        "turns": len(latencies),
+        "errors": len(errors),
+        "elapsed_s": round(elapsed, 3),
+        "sessions_per_sec": round(sessions / elapsed, 2),
+        "turns_per_sec": round(len(latencies) / elapsed, 2),
+        "latency_ms": {
+            "mean": round(statistics.fmean(latencies), 1) if latencies else 0.0,
+            "p50": round(percentile(latencies, 50), 1),
+            "p99": round(percentile(latencies, 99), 1),
+        },
+        "server": server_metrics,
+        "first_errors": errors[:5],
+    }
+
+
+async def main(args) -> None:
+    server = None
+    url = args.url
+    if url is None:
+        import uvicorn
+        from agent_server import create_app
+
+        app = create_app(
+            agent_factory=lambda: FakeAgent(args.llm_latency, args.tool_latency),
+            max_concurrency=args.max_concurrency,
+            max_queue=args.max_queue,
+            tool_workers=args.tool_workers,
+        )
+        server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=args.port, log_level="warning"))
+        serve_task = asyncio.create_task(server.serve())
+        while not server.started:
+            await asyncio.sleep(0.05)
+        url = f"http://127.0.0.1:{args.port}"
+
+    try:
+        result = await run_load(url, args.sessions, args.turns, args.concurrency)
+    finally:
+        if server is not None:
+            server.should_exit = True
+            await serve_task
+
+    print("-----------------------------------------")
+    print(f"Sessions:        {result['sessions']} x {args.turns} turns ({result['errors']} errors)")
+    print(f"Elapsed:         {result['elapsed_s']} s")
+    print(f"Sessions/sec:    {result['sessions_per_sec']}")
+    print(f"Turns/sec:       {result['turns_per_sec']}")
+    print(f"Latency (ms):    mean {result['latency_ms']['mean']}  p50 {result['latency_ms']['p50']}  p99 {result['latency_ms']['p99']}")
+    print(f"Max queue depth: {result['server']['max_queued']}  (rejected {result['server']['rejected']})")
+    print(f"Tool pool:       {result['server']['tool_pool']}")
+    for error in result["first_errors"]:
+        print("Error:", error)
+    print("-----------------------------------------")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test for agent_server.py")
+    parser.add_argument("--url", default=None, help="Target a running server instead of an in-process fake one")
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=50, help="Client sessions running at once")
+    parser.add_argument("--port", type=int, default=8091)
+    parser.add_argument("--max-concurrency", type=int, default=16, help="Server agent slots (in-process only)")
+    parser.add_argument("--max-queue", type=int, default=256, help="Server queue limit (in-process only)")
+    parser.add_argument("--tool-workers", type=int, default=8, help="Server tool threads (in-process only)")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Fake LLM latency in seconds")
+    parser.add_argument("--tool-latency", type=float, default=0.02, help="Fake blocking tool latency in seconds")
+    asyncio.run(main(parser.parse_args()))
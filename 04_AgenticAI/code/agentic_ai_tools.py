@@ -21,22 +21,14 @@ Dependencies:
 Usage:
     Ensure a valid OpenAI API key is set in the .env file as OPENAI_API_KEY.
     Run the script and interact with the agent via the terminal.
+    To serve many users over HTTP instead, run agent_server.py (it reuses build_agent()).
 """
 
-from langchain_openai import ChatOpenAI
-from langchain.agents import initialize_agent, AgentType
-from langchain.tools import Tool
-from langchain_community.tools import WikipediaQueryRun, DuckDuckGoSearchRun
-from langchain_community.utilities import WikipediaAPIWrapper
-from langchain.memory import ConversationBufferMemory
 import math
+import threading
+from functools import lru_cache
 
-# Initialize DuckDuckGo search tool for web queries
-search_tool = DuckDuckGoSearchRun()
-
-# Initialize Wikipedia retriever and tool for Wikipedia queries
-wiki_retriver = WikipediaAPIWrapper()
-wiki_tool = WikipediaQueryRun(api_wrapper=wiki_retriver)
+from langchain_core.tools import Tool
 
 # Safe math evaluation function, only exposes 'math' module
 def safe_eval(expression: str):
@@ -66,34 +58,102 @@ python_executor = Tool(
     description="To run python code."
 )
 
-# List of all tools available to the agent
-tools = [search_tool, wiki_tool, math_tool, python_executor]
+# The web tools, the LLM and the agent come from langchain_community, langchain_openai and langchain,
+# about 1.5 s of imports, so they are imported and built on first use instead of before the first prompt
+@lru_cache(maxsize=None)
+def get_tools(allow_python_exec: bool = True):
+    """
+    List of all tools available to the agent.
+
+    Args:
+        allow_python_exec: Include python_code_runner, which exec()s whatever code the model writes.
+            Only for a local, trusted user; agent_server.py leaves it out unless asked.
+    """
+    from langchain_community.tools import WikipediaQueryRun, DuckDuckGoSearchRun
+    from langchain_community.utilities import WikipediaAPIWrapper
+
+    # Initialize DuckDuckGo search tool for web queries
+    search_tool = DuckDuckGoSearchRun()
+
+    # Initialize Wikipedia retriever and tool for Wikipedia queries
+    wiki_retriver = WikipediaAPIWrapper()
+    wiki_tool = WikipediaQueryRun(api_wrapper=wiki_retriver)
+
+    tools = [search_tool, wiki_tool, math_tool]
+    return tools + [python_executor] if allow_python_exec else tools
+
+@lru_cache(maxsize=None)
+def get_llm():
+    """The OpenAI chat model shared by all agents."""
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(model="gpt-4o-mini", temperature=0)
+
+# Build an agent with its own conversation memory so several sessions can share the same tools and LLM
+def build_agent(memory=None, allow_python_exec: bool = True):
+    """
+    Create an agent bound to the shared tools and LLM.
+
+    Args:
+        memory: Conversation memory for this agent. A fresh ConversationBufferMemory is used when omitted.
+        allow_python_exec: Give the agent the python_code_runner tool (see get_tools).
+
+    Returns:
+        AgentExecutor: The agent, usable with invoke() or ainvoke().
+    """
+    from langchain.agents import initialize_agent, AgentType
+    from langchain.memory import ConversationBufferMemory
+
+    if memory is None:
+        # Conversation memory to maintain chat history for context
+        memory = ConversationBufferMemory(return_messages=True)
+
+    # Initialize the agent with tools, LLM, agent type, and memory
+    return initialize_agent(
+        tools=get_tools(allow_python_exec),
+        llm=get_llm(),
+        agent=AgentType.OPENAI_FUNCTIONS,
+        memory=memory
+    )
 
-# Initialize the OpenAI chat model
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+def prefetch():
+    """Do the imports and build the shared tools and LLM on a background thread."""
+    def warm_up():
+        try:
+            get_llm()
+            get_tools()
+            import langchain.agents, langchain.memory  # noqa: F401
+        except Exception:
+            pass  # raised again when the agent is built
 
-# Conversation memory to maintain chat history for context
-memory = ConversationBufferMemory(return_messages=True)
+    threading.Thread(target=warm_up, daemon=True).start()
 
-# Initialize the agent with tools, LLM, agent type, and memory
-agent = initialize_agent(
-    tools=tools,
-    llm=llm,
-    agent=AgentType.OPENAI_FUNCTIONS,
-    memory=memory
-)
 
 # Main interactive loop for user queries
-while True:
-    query = input("Ask: ")
-    if query.lower() in ["exit", "quit"]:
-        print("byyy")
-        break
-    # Pass user input to the agent and print the response
-    response = agent.invoke(
-        {"input": query}
+if __name__ == "__main__":
+    from fast_path_router import build_router
+
+    # One agent for this session, built on its first use; the imports it needs run while the user types
+    get_agent = lru_cache(maxsize=None)(build_agent)
+    prefetch()
+
+    # Answer trivial math directly with the calculator tool, and keep those exchanges in the agent's memory
+    router = build_router(
+        [math_tool],
+        on_hit=lambda q, answer: get_agent().memory.save_context({"input": q}, {"output": answer})
     )
-    print("\n AI:", response["output"])
+
+    while True:
+        query = input("Ask: ")
+        if query.lower() in ["exit", "quit"]:
+            print("Fast path:", router.report())
+            print("byyy")
+            break
+        # Pass user input to the router (or the agent, when no rule matches) and print the response
+        response = router.invoke(
+            query,
+            lambda q: get_agent().invoke({"input": q})["output"]
+        )
+        print("\n AI:", response)
 
 
 """
@@ -0,0 +1,198 @@
+"""
+fast_path_router.py
+
+A pre-agent router that answers trivially tool-answerable requests without calling the LLM.
+
+Requests like "sum of 120 and 20" or "12 * 7" don't need GPT to pick the calculator tool;
+a regular expression can do that with full confidence. The router:
+- Matches the whole (normalized) input against a small set of high-confidence rules.
+- On a match, calls the tool directly and formats the answer.
+- Otherwise falls through to the agent.
+- Tracks hit rate and an estimate of the latency saved (avg agent latency - avg fast-path latency, per hit).
+
+Only exact, whole-input matches are routed, so anything ambiguous still goes to the agent.
+
+Usage:
+    router = build_router(tools)
+    answer = router.invoke(query, lambda q: agent.invoke({"input": q})["output"])
+    print(router.report())
+"""
+
+import re
+import time
+
+
+# ------------------------------------------------------
+#  Router. The same code is in 04_AgenticAI/code/fast_path_router.py and 05_MCP/fast_path_router.py:
+#  the two folders are separate projects, so each keeps a copy. Change both; only the rules differ.
+# ------------------------------------------------------
+PREFIX = r"(?:(?:what is|what's|whats|calculate|compute|find|show|list|get|what are)\s+)?(?:the\s+|me\s+)?"
+SUFFIX = r"\s*[?.!]*"
+
+
+class Rule:
+    """
+    One high-confidence intent.
+
+    Args:
+        name (str): Rule name, used in the report.
+        pattern (str): Regex that must match the whole normalized input.
+        tool (str): Name of the tool to call.
+        to_input: Function (match) -> tool input (a string, or a dict of tool arguments).
+        to_answer: Function (match, tool_result) -> answer text.
+    """
+
+    def __init__(self, name: str, pattern: str, tool: str, to_input, to_answer) -> None:
+        self.name = name
+        self.pattern = re.compile(PREFIX + pattern + SUFFIX, re.IGNORECASE)
+        self.tool = tool
+        self.to_input = to_input
+        self.to_answer = to_answer
+
+
+class FastPathStats:
+    """Hit/miss counters and timings for the router."""
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.fast_seconds = 0.0
+        self.agent_seconds = 0.0
+        self.hits_by_rule = {}
+
+    def report(self) -> dict:
+        total = self.hits + self.misses
+        avg_fast_ms = self.fast_seconds / self.hits * 1000 if self.hits else 0.0
+        avg_agent_ms = self.agent_seconds / self.misses * 1000 if self.misses else 0.0
+        return {
+            "requests": total,
+            "hits": self.hits,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "hits_by_rule": dict(self.hits_by_rule),
+            "avg_fast_path_ms": round(avg_fast_ms, 3),
+            "avg_agent_ms": round(avg_agent_ms, 1),
+            # Only meaningful once at least one request went through the agent
+            "est_saved_ms": round(self.hits * max(avg_agent_ms - avg_fast_ms, 0.0), 1),
+        }
+
+
+class FastPathRouter:
+    """
+    Routes a request straight to a tool when a rule matches, otherwise to the agent.
+
+    Args:
+        tools (list): LangChain tools; rules refer to them by name.
+        rules (list[Rule]): Rules tried in order. Rules whose tool is missing are ignored.
+        on_hit: Optional callback (text, answer) run after a fast-path answer,
+                e.g. to save the exchange into the agent's memory.
+    """
+
+    def __init__(self, tools: list, rules: list, on_hit=None) -> None:
+        self.tools_by_name = {tool.name: tool for tool in tools}
+        self.rules = [rule for rule in rules if rule.tool in self.tools_by_name]
+        self.on_hit = on_hit
+        self.stats = FastPathStats()
+
+    def match(self, text: str):
+        """Return (rule, match) for the first rule matching the whole input, or None."""
+        normalized = " ".join(text.strip().split())
+        for rule in self.rules:
+            m = rule.pattern.fullmatch(normalized)
+            if m:
+                return rule, m
+        return None
+
+    def _record_hit(self, rule: Rule, text: str, answer: str, start: float) -> str:
+        self.stats.hits += 1
+        self.stats.fast_seconds += time.perf_counter() - start
+        self.stats.hits_by_rule[rule.name] = self.stats.hits_by_rule.get(rule.name, 0) + 1
+        if self.on_hit:
+            self.on_hit(text, answer)
+        return answer
+
+    def invoke(self, text: str, fallback) -> str:
+        """
+        Answer `text` via the fast path if possible, else with fallback(text).
+        A tool error on the fast path also falls back to the agent.
+        """
+        start = time.perf_counter()
+        routed = self.match(text)
+        if routed:
+            rule, m = routed
+            try:
+                result = self.tools_by_name[rule.tool].invoke(rule.to_input(m))
+                return self._record_hit(rule, text, rule.to_answer(m, result), start)
+            except Exception:
+                pass
+
+        start = time.perf_counter()
+        answer = fallback(text)
+        self.stats.misses += 1
+        self.stats.agent_seconds += time.perf_counter() - start
+        return answer
+
+    async def ainvoke(self, text: str, fallback) -> str:
+        """Async version of invoke(); `fallback` must be an async function."""
+        start = time.perf_counter()
+        routed = self.match(text)
+        if routed:
+            rule, m = routed
+            try:
+                result = await self.tools_by_name[rule.tool].ainvoke(rule.to_input(m))
+                return self._record_hit(rule, text, rule.to_answer(m, result), start)
+            except Exception:
+                pass
+
+        start = time.perf_counter()
+        answer = await fallback(text)
+        self.stats.misses += 1
+        self.stats.agent_seconds += time.perf_counter() - start
+        return answer
+
+    def report(self) -> dict:
+        return self.stats.report()
+
+
+# ------------------------------------------------------
+#  Rules for the calculator tool
+# ------------------------------------------------------
+NUMBER = r"(-?\d+(?:\.\d+)?)"
+
+
+def format_number(value) -> str:
+    """Print 140.0 as 140, keep real decimals."""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _binary(op: str, swap: bool = False):
+    """Build a calculator expression from the two numbers in a match."""
+    def to_input(m):
+        a, b = (m.group(2), m.group(1)) if swap else (m.group(1), m.group(2))
+        return f"{a} {op} {b}"
+    return to_input
+
+
+def _answer(label: str, swap: bool = False):
+    def to_answer(m, result):
+        a, b = (m.group(2), m.group(1)) if swap else (m.group(1), m.group(2))
+        return f"The {label} of {a} and {b} is {format_number(result)}."
+    return to_answer
+
+
+# Rules for the `calculator` tool of agentic_ai_tools.py
+CALCULATOR_RULES = [
+    Rule("sum", rf"(?:sum of|add)\s+{NUMBER}\s+(?:and|to|with)\s+{NUMBER}", "calculator", _binary("+"), _answer("sum")),
+    Rule("plus", rf"{NUMBER}\s*(?:plus|\+)\s*{NUMBER}", "calculator", _binary("+"), _answer("sum")),
+    Rule("product", rf"(?:product of|multiply)\s+{NUMBER}\s+(?:and|by|with)\s+{NUMBER}", "calculator", _binary("*"), _answer("product")),
+    Rule("times", rf"{NUMBER}\s*(?:times|multiplied by|x|\*)\s*{NUMBER}", "calculator", _binary("*"), _answer("product")),
+    Rule("subtract", rf"subtract\s+{NUMBER}\s+from\s+{NUMBER}", "calculator", _binary("-", swap=True), _answer("difference", swap=True)),
+    Rule("minus", rf"{NUMBER}\s*(?:minus|-)\s*{NUMBER}", "calculator", _binary("-"), _answer("difference")),
+    Rule("divide", rf"(?:divide\s+)?{NUMBER}\s*(?:divided by|by|/)\s*{NUMBER}", "calculator", _binary("/"), _answer("quotient")),
+]
+
+
+def build_router(tools: list, on_hit=None) -> FastPathRouter:
+    """Router with the calculator rules, for the tools of agentic_ai_tools.py."""
+    return FastPathRouter(tools, CALCULATOR_RULES, on_hit=on_hit)
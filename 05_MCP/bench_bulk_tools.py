@@ -0,0 +1,100 @@
+"""
+bench_bulk_tools.py
+
+Shows how many tool round trips the bulk math tools save.
+
+An agent that only has `add(a, b)` has to sum a column of N numbers as a chain of N - 1 calls,
+each one waiting for the previous result - and in an agent loop, each call is also one LLM step.
+With `sum_numbers(numbers)` the same answer takes one call.
+
+For each N this script runs both strategies against mathserver.py and reports
+the number of tool calls, the wall time, and the LLM steps saved.
+
+Usage:
+    python bench_bulk_tools.py                         # mathserver mounted in-process
+    python bench_bulk_tools.py --transport stdio       # mathserver as a subprocess
+    python bench_bulk_tools.py --sizes 10 100 1000 --llm-step-ms 800
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import sys
+import time
+
+from mcp_pool import MCPSessionPool
+
+
+CONNECTIONS = {
+    "in_process": {"transport": "in_process", "server": "mathserver:mcp"},
+    "stdio": {"command": sys.executable, "args": ["mathserver.py"], "transport": "stdio"},
+}
+
+
+async def pairwise_sum(pool: MCPSessionPool, numbers: list) -> tuple:
+    """What an agent with only add(a, b) does: one call per number after the first."""
+    total, calls = numbers[0], 0
+    for n in numbers[1:]:
+        total = int(await pool.call_tool("math", "add", {"a": total, "b": n}))
+        calls += 1
+    return total, calls
+
+
+async def bulk_sum(pool: MCPSessionPool, numbers: list) -> tuple:
+    result = await pool.call_tool("math", "sum_numbers", {"numbers": numbers})
+    return int(float(result)), 1
+
+
+async def check_exact_results(pool: MCPSessionPool) -> None:
+    """Exact and decimal results longer than Python's default 28-digit decimal context keep every digit."""
+    big = "99999999999999999999"
+    long = "12345678901234567890123456789012345"
+    cases = [
+        ("product", {"numbers": [big, big], "precision": "decimal"}, str(int(big) ** 2)),
+        ("product", {"numbers": [big, big], "precision": "exact"}, str(int(big) ** 2)),
+        ("sum_numbers", {"numbers": [long, "1"], "precision": "decimal", "digits": 50}, str(int(long) + 1)),
+        ("sum_numbers", {"numbers": ["0.1", "0.2"], "precision": "decimal"}, "0.3"),
+        ("dot_product", {"a": [big, "1"], "b": [big, "1"], "precision": "decimal"}, str(int(big) ** 2 + 1)),
+    ]
+    for tool, arguments, expected in cases:
+        result = await pool.call_tool("math", tool, arguments)
+        assert result == expected, f"{tool}({arguments}) returned {result}, expected {expected}"
+
+
+async def main(args) -> None:
+    logging.disable(logging.INFO)
+    rows = []
+    async with MCPSessionPool({"math": CONNECTIONS[args.transport]}, cache_path=None) as pool:
+        await pool.call_tool("math", "add", {"a": 0, "b": 0})  # warm up: connect / spawn
+        await check_exact_results(pool)
+        for size in args.sizes:
+            numbers = [random.randint(1, 1000) for _ in range(size)]
+
+            start = time.perf_counter()
+            pairwise, pairwise_calls = await pairwise_sum(pool, numbers)
+            pairwise_ms = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            bulk, bulk_calls = await bulk_sum(pool, numbers)
+            bulk_ms = (time.perf_counter() - start) * 1000
+
+            assert pairwise == bulk == sum(numbers)
+            rows.append((size, pairwise_calls, pairwise_ms, bulk_calls, bulk_ms))
+
+    print("-----------------------------------------")
+    print(f"Summing N numbers over {args.transport} (an agent step ~ {args.llm_step_ms} ms of LLM time)")
+    print(f"{'N':>6}{'add calls':>11}{'add ms':>10}{'bulk calls':>12}{'bulk ms':>10}{'round trips saved':>19}{'est. agent time saved':>23}")
+    for size, pairwise_calls, pairwise_ms, bulk_calls, bulk_ms in rows:
+        saved = pairwise_calls - bulk_calls
+        agent_saved_s = (saved * args.llm_step_ms + pairwise_ms - bulk_ms) / 1000
+        print(f"{size:>6}{pairwise_calls:>11}{pairwise_ms:>10.1f}{bulk_calls:>12}{bulk_ms:>10.1f}{saved:>19}{agent_saved_s:>22.1f}s")
+    print("-----------------------------------------")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Round trips saved by the bulk math tools")
+    parser.add_argument("--transport", choices=sorted(CONNECTIONS), default="in_process")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 100, 500])
+    parser.add_argument("--llm-step-ms", type=float, default=800, help="Assumed LLM latency per agent step")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,115 @@
+"""
+bench_todo_store.py
+
+Compares the indexed SQLite TodoStore (todo_store.py) with the old in-memory approach
+on a million synthetic to-dos.
+
+The old my_todo.py kept a dict of "DD-MM-YYYY" -> [titles]. An exact date is a dict lookup,
+but a range ("this week", "next 30 days") has no order to use: every key has to be parsed
+and compared, so range queries are O(n) in the number of dates (and the data was rebuilt on every call
+and gone on restart). The store answers both from a B-tree index on the due date: O(log n + k).
+
+Usage:
+    python bench_todo_store.py                      # 1,000,000 to-dos spread over ~10 years
+    python bench_todo_store.py --rows 200000 --queries 200
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+from todo_store import TodoStore, format_date, parse_period
+
+
+def synthetic_todos(rows: int, days: int, start: date):
+    for i in range(rows):
+        yield start + timedelta(days=random.randrange(days)), f"todo #{i}"
+
+
+def dict_range(data: dict, start: date, end: date) -> dict:
+    """What a range query costs on the old date-keyed dict: parse and compare every key."""
+    grouped = {}
+    for key, titles in data.items():
+        day = datetime.strptime(key, "%d-%m-%Y").date()
+        if start <= day <= end:
+            grouped[key] = titles
+    return dict(sorted(grouped.items(), key=lambda item: datetime.strptime(item[0], "%d-%m-%Y")))
+
+
+def timed(fn, queries: list) -> dict:
+    fn(*queries[0])  # warm up: page cache / first parse
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        fn(*query)
+        latencies.append((time.perf_counter() - started) * 1e6)
+    latencies.sort()
+    return {
+        "mean_us": statistics.fmean(latencies),
+        "p99_us": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+    }
+
+
+def main(args) -> None:
+    random.seed(0)
+    first_day = date(2025, 1, 1)
+    todos = list(synthetic_todos(args.rows, args.days, first_day))
+
+    started = time.perf_counter()
+    data = {}
+    for day, title in todos:
+        data.setdefault(format_date(day), []).append(title)
+    dict_build_s = time.perf_counter() - started
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench_todos.db")
+        store = TodoStore(path, seed=False)
+        started = time.perf_counter()
+        store.add_many(todos)
+        store_build_s = time.perf_counter() - started
+        db_mb = os.path.getsize(path) / 2**20
+
+        days = [first_day + timedelta(days=random.randrange(args.days)) for _ in range(args.queries)]
+        exact = [(day,) for day in days]
+        periods = {
+            "this week": [parse_period("this week", day) for day in days],
+            "next 30 days": [parse_period("next 30 days", day) for day in days],
+        }
+
+        results = {
+            "exact date": (
+                timed(lambda day: data.get(format_date(day), []), exact),
+                timed(store.get_day, exact),
+            )
+        }
+        for name, ranges in periods.items():
+            results[name] = (
+                timed(lambda start, end: dict_range(data, start, end), ranges),
+                timed(lambda start, end: store.get_range(start, end), ranges),
+            )
+
+        # Same answers from both
+        start, end = periods["this week"][0]
+        assert store.get_range(start, end) == dict_range(data, start, end)
+
+    print("-----------------------------------------")
+    print(f"{args.rows:,} to-dos over {args.days:,} days, {args.queries} queries per row")
+    print(f"build: dict {dict_build_s:.2f} s (in memory, lost on restart) | "
+          f"store {store_build_s:.2f} s ({db_mb:.0f} MB on disk, persistent)")
+    print(f"{'query':<14}{'dict mean µs':>14}{'dict p99 µs':>13}{'store mean µs':>15}{'store p99 µs':>14}{'speedup':>9}")
+    for name, (old, new) in results.items():
+        print(f"{name:<14}{old['mean_us']:>14.0f}{old['p99_us']:>13.0f}{new['mean_us']:>15.0f}{new['p99_us']:>14.0f}"
+              f"{old['mean_us'] / new['mean_us']:>8.1f}x")
+    print("-----------------------------------------")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Indexed to-do store vs. date-keyed dict")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=3650, help="Spread the to-dos over this many days")
+    parser.add_argument("--queries", type=int, default=100)
+    main(parser.parse_args())
@@ -0,0 +1,92 @@
+"""
+bench_transports.py
+
+Per-call latency of the math server's `add(a, b)` tool over each MCP transport:
+    - in_process:      FastMCP mounted in this process, tools called directly (no JSON-RPC)
+    - in_memory:       FastMCP mounted in this process, full MCP protocol over memory streams
+    - stdio:           mathserver.py spawned as a subprocess
+    - streamable_http: mathserver.py served over HTTP on localhost
+
+Every transport goes through MCPSessionPool, with a warm-up call first,
+so the numbers are the steady-state cost of one tool call.
+
+Usage:
+    python bench_transports.py --calls 500
+"""
+
+import argparse
+import asyncio
+import logging
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+from mcp_pool import MCPSessionPool
+
+
+def wait_for_port(port: int, timeout: float = 15.0) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        with socket.socket() as sock:
+            if sock.connect_ex(("127.0.0.1", port)) == 0:
+                return
+        time.sleep(0.1)
+    raise RuntimeError(f"Server on port {port} did not start")
+
+
+async def bench(connection: dict, calls: int) -> dict:
+    async with MCPSessionPool({"math": connection}, cache_path=None) as pool:
+        await pool.call_tool("math", "add", {"a": 1, "b": 2})  # warm up: connect / spawn
+        latencies = []
+        for i in range(calls):
+            start = time.perf_counter()
+            result = await pool.call_tool("math", "add", {"a": i, "b": 1})
+            latencies.append((time.perf_counter() - start) * 1e6)
+            assert result == str(i + 1), result
+    latencies.sort()
+    return {
+        "mean_us": statistics.fmean(latencies),
+        "p50_us": latencies[len(latencies) // 2],
+        "p99_us": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+    }
+
+
+async def main(args) -> None:
+    # FastMCP logs every request at INFO (with rich formatting), which would dominate the timings
+    logging.disable(logging.INFO)
+    transports = {
+        "in_process": {"transport": "in_process", "server": "mathserver:mcp"},
+        "in_memory": {"transport": "in_memory", "server": "mathserver:mcp"},
+        "stdio": {"command": sys.executable, "args": ["mathserver.py"], "transport": "stdio"},
+        "streamable_http": {"url": f"http://127.0.0.1:{args.port}/mcp", "transport": "streamable_http"},
+    }
+
+    http_server = subprocess.Popen(
+        [sys.executable, "mathserver.py", "--transport", "streamable-http", "--port", str(args.port)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for_port(args.port)
+        results = {name: await bench(connection, args.calls) for name, connection in transports.items()}
+    finally:
+        http_server.terminate()
+        http_server.wait()
+
+    baseline = results["in_process"]["mean_us"]
+    print("-----------------------------------------")
+    print(f"add(a, b) x {args.calls} calls")
+    print(f"{'transport':<16}{'mean µs':>10}{'p50 µs':>10}{'p99 µs':>10}{'vs in_process':>15}")
+    for name, row in results.items():
+        print(f"{name:<16}{row['mean_us']:>10.0f}{row['p50_us']:>10.0f}{row['p99_us']:>10.0f}"
+              f"{row['mean_us'] / baseline:>14.1f}x")
+    print("-----------------------------------------")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MCP transport latency benchmark")
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--port", type=int, default=8001, help="Port for the streamable-http server")
+    asyncio.run(main(parser.parse_args()))
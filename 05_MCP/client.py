@@ -4,8 +4,10 @@ client.py
 A command-line client for interacting with MCP (Modular Command Platform) servers using LangChain and OpenAI.
 
 Features:
-    - Connects to two MCP servers: a math server (local, stdio) and a to-do server (HTTP).
+    - Connects to two MCP servers: a math server (mounted in-process) and a to-do server (HTTP).
+    - Keeps one long-lived session per server and caches tool schemas on disk (see mcp_pool.py).
     - Uses a React-style agent to process user requests and route them to the appropriate tool.
+    - Answers trivial math/to-do requests directly with the tool, without an LLM call (see fast_path_router.py).
     - Continuously prompts the user for input and displays the agent's response.
     - Exits gracefully when the user types 'exit'.
 
@@ -18,45 +20,62 @@ import os
 import asyncio
 
 import openai
-from langchain_mcp_adapters.client import MultiServerMCPClient
 from langgraph.prebuilt import create_react_agent
 from langchain_openai import ChatOpenAI
 
+from fast_path_router import build_router
+from mcp_pool import MCPSessionPool
+
 from dotenv import load_dotenv
 load_dotenv()
 
 # Load OpenAI API Key
 openai.api_key = os.getenv("OPENAI_API_KEY")
 
+# MCP servers used by the agent
+CONNECTIONS = {
+    # mathserver.py is co-located, so it is mounted in this process instead of spawned over stdio.
+    # Use {"command": "python", "args": ["mathserver.py"], "transport": "stdio"} to run it as a subprocess.
+    "math": {
+        "server": "mathserver:mcp",
+        "transport": "in_process"
+    },
+    "my_todo": {
+        "url": "http://localhost:8000/mcp",
+        "transport": "streamable_http"
+    }
+}
+
 async def main():
-    client = MultiServerMCPClient(
-        {
-            "math": {
-                "command": "python",
-                "args": ["mathserver.py"],
-                "transport": "stdio"
-            },
-            "my_todo": {
-                "url": "http://localhost:8000/mcp",
-                "transport": "streamable_http"
-            }
-        }
-    )
-    
-    tools = await client.get_tools()
+    # Sessions stay open for the whole run; tool schemas come from the disk cache when it is up to date,
+    # so a server is only spawned/contacted when one of its tools is first used.
+    pool = MCPSessionPool(CONNECTIONS)
+
+    tools = await pool.get_tools()
     model = ChatOpenAI(model="gpt-4o-mini", temperature=0.1)
     agent = create_react_agent(
         model, tools
     )
 
+    # Trivial requests ("sum of 120 and 20", "todos for 05-07-2025") go straight to the tool, skipping the LLM
+    router = build_router(tools)
+
+    async def ask_agent(user_input: str) -> str:
+        todo_response = await agent.ainvoke(
+            {"messages": [{"role": "user", "content": user_input}]}
+        )
+        return todo_response['messages'][-1].content
+
     while True:
         user_input = input("Enter your request (type 'exit' to quit): ")
         if user_input.strip().lower() == "exit":
+            print("Fast path:", router.report())
+            print("MCP sessions:", pool.report())
             print("Exiting...")
             break
-        todo_response = await agent.ainvoke(
-            {"messages": [{"role": "user", "content": user_input}]}
-        )
-        print("Todo's response:", todo_response['messages'][-1].content)
+        response = await router.ainvoke(user_input, ask_agent)
+        print("Todo's response:", response)
+
+    await pool.aclose()
 
 asyncio.run(main())
\ No newline at end of file
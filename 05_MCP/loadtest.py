@@ -0,0 +1,472 @@
+"""
+loadtest.py
+
+Load generator for the MCP servers in this repo:
+    - mathserver.py                       (stdio, or streamable-http with --transport streamable-http)
+    - my_todo.py                          (streamable-http on :8000)
+    - projects/mcp_server/main.py         (FastApiMCP mount, SSE at /mcp)
+
+It opens N concurrent MCP client sessions (each one its own connection, or its own server
+subprocess for stdio), and every session calls tools back to back, picked at random from a
+weighted mix, until the run is over. It reports:
+    - throughput (calls/s, over the window after all sessions connected), and session connect time
+    - latency percentiles (p50/p90/p95/p99/max), overall and per tool
+    - error rate (exceptions, timeouts and tool results flagged isError)
+    - server memory (RSS, sampled during the run; needs psutil and a server pid to watch)
+
+and writes everything to a JSON file, so runs can be compared (--baseline prints the deltas).
+
+Usage:
+    # math server, one stdio subprocess per session
+    python loadtest.py --preset math --transport stdio --sessions 10 --duration 20
+
+    # math server over HTTP, started (and memory-sampled) by the load test
+    python loadtest.py --preset math --transport streamable_http --sessions 50 \\
+        --spawn "python mathserver.py --transport streamable-http --port 8001"
+
+    # to-do server that is already running (python my_todo.py)
+    python loadtest.py --preset todo --sessions 50 --server-pid $(pgrep -f my_todo.py)
+
+    # FastApiMCP mount of the to-do API (cd ../projects/mcp_server && python main.py)
+    python loadtest.py --preset todo_api --sessions 20 --mix "get_all_todos_todos__get=1"
+
+    # custom mix / arguments, and comparison with a previous run
+    python loadtest.py --preset math --mix "add=5,multiply=3" --output run2.json --baseline run1.json
+
+    # list the tools (and their names) a server exposes
+    python loadtest.py --preset todo_api --list-tools
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import shlex
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+from urllib.parse import urlparse
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.sse import sse_client
+from mcp.client.stdio import stdio_client
+from mcp.client.streamable_http import streamablehttp_client
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+TRANSPORTS = ("streamable_http", "sse", "stdio")
+
+# Connection details and a default tool mix / tool arguments for each server in the repo
+PRESETS = {
+    "math": {
+        "transport": "stdio",
+        "command": f"{sys.executable} mathserver.py",
+        "url": "http://127.0.0.1:8001/mcp",
+        "mix": "add=5,multiply=3,sum_numbers=1",
+        "tool_args": {
+            "add": {"a": 2, "b": 3},
+            "multiply": {"a": 4, "b": 5},
+            "sum_numbers": {"numbers": list(range(100))},
+        },
+    },
+    "todo": {
+        "transport": "streamable_http",
+        "command": f"{sys.executable} my_todo.py",
+        "url": "http://127.0.0.1:8000/mcp",
+        "mix": "get_my_todys=5,get_todos_for_period=2",
+        "tool_args": {
+            "get_my_todys": {"date_arg": "05-07-2025"},
+            "get_todos_for_period": {"period": "05-07-2025 to 31-07-2025"},
+            "get_todos_in_range": {"start_date": "01-07-2025", "end_date": "31-07-2025"},
+        },
+    },
+    "todo_api": {
+        "transport": "sse",
+        "command": None,
+        "url": "http://127.0.0.1:8000/mcp",
+        "mix": "get_all_todos_todos__get=1",
+        "tool_args": {},
+    },
+}
+
+
+def parse_mix(mix: str) -> dict:
+    """"add=5,multiply=3" -> {"add": 5.0, "multiply": 3.0}. A tool without a weight gets 1."""
+    weights = {}
+    for part in mix.split(","):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition("=")
+        weights[name.strip()] = float(weight) if weight.strip() else 1.0
+    if not weights or any(w < 0 for w in weights.values()) or sum(weights.values()) == 0:
+        raise ValueError(f"Invalid tool mix: {mix!r}")
+    return weights
+
+
+def percentile(values: list, q: float) -> float:
+    """q-th percentile (0-100) of an already sorted list, nearest-rank."""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * q / 100))]
+
+
+def latency_summary(latencies_ms: list) -> dict:
+    latencies_ms = sorted(latencies_ms)
+    return {
+        "count": len(latencies_ms),
+        "mean_ms": statistics.fmean(latencies_ms) if latencies_ms else 0.0,
+        "p50_ms": percentile(latencies_ms, 50),
+        "p90_ms": percentile(latencies_ms, 90),
+        "p95_ms": percentile(latencies_ms, 95),
+        "p99_ms": percentile(latencies_ms, 99),
+        "max_ms": latencies_ms[-1] if latencies_ms else 0.0,
+    }
+
+
+def wait_for_port(url: str, timeout: float = 20.0) -> None:
+    parsed = urlparse(url)
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        with socket.socket() as sock:
+            if sock.connect_ex((parsed.hostname, parsed.port or 80)) == 0:
+                return
+        time.sleep(0.1)
+    raise RuntimeError(f"Server at {url} did not start")
+
+
+@asynccontextmanager
+async def open_session(transport: str, url: str, command: str):
+    """An initialized ClientSession over the given transport."""
+    if transport == "stdio":
+        program, *args = shlex.split(command)
+        client = stdio_client(StdioServerParameters(command=program, args=args), errlog=subprocess.DEVNULL)
+    elif transport == "sse":
+        client = sse_client(url)
+    else:
+        client = streamablehttp_client(url)
+    async with client as streams:
+        async with ClientSession(streams[0], streams[1]) as session:
+            await session.initialize()
+            yield session
+
+
+class MemorySampler:
+    """
+    Samples the resident memory of the server processes in a background task.
+
+    Watches the given pids (plus their children), or - for stdio - the server subprocesses
+    this load test spawned. Does nothing if psutil is not installed.
+    """
+
+    def __init__(self, pids: list, children_of_self: bool, interval: float = 0.25) -> None:
+        self.pids = pids
+        self.children_of_self = children_of_self
+        self.interval = interval
+        self.samples_mb = []
+        self._task = None
+
+    @property
+    def enabled(self) -> bool:
+        return psutil is not None and (bool(self.pids) or self.children_of_self)
+
+    def _processes(self) -> list:
+        roots = [psutil.Process(pid) for pid in self.pids if psutil.pid_exists(pid)]
+        processes = list(roots)
+        for root in roots:
+            processes.extend(root.children(recursive=True))
+        if self.children_of_self:
+            processes.extend(psutil.Process().children(recursive=True))
+        return processes
+
+    def sample(self) -> None:
+        if not self.enabled:
+            return
+        processes = self._processes()
+        if not processes:
+            return  # stdio servers not spawned yet / already gone
+        total = 0
+        for process in processes:
+            try:
+                total += process.memory_info().rss
+            except psutil.Error:
+                pass  # exited between listing and sampling
+        self.samples_mb.append(total / 2**20)
+
+    async def _run(self) -> None:
+        while True:
+            self.sample()
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self.enabled:
+            self.sample()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def summary(self) -> dict:
+        if not self.samples_mb:
+            reason = "psutil not installed" if psutil is None else "no server pid to watch (use --server-pid or --spawn)"
+            return {"available": False, "reason": reason}
+        return {
+            "available": True,
+            "start_rss_mb": self.samples_mb[0],
+            "peak_rss_mb": max(self.samples_mb),
+            "end_rss_mb": self.samples_mb[-1],
+            "mean_rss_mb": statistics.fmean(self.samples_mb),
+            "samples": len(self.samples_mb),
+        }
+
+
+class LoadTest:
+    """
+    N concurrent sessions, each calling tools from the weighted mix until the deadline
+    (or until it has made `calls_per_session` calls). The calls start, and `duration` is
+    counted, once every session has connected.
+    """
+
+    def __init__(self, transport: str, url: str, command: str, sessions: int, mix: dict, tool_args: dict,
+                 duration: float, calls_per_session: int = None, ramp_up: float = 0.0, timeout: float = 30.0) -> None:
+        self.transport = transport
+        self.url = url
+        self.command = command
+        self.sessions = sessions
+        self.mix = mix
+        self.tool_args = tool_args
+        self.duration = duration
+        self.calls_per_session = calls_per_session
+        self.ramp_up = ramp_up
+        self.timeout = timeout
+        self.latencies = {name: [] for name in mix}
+        self.errors = {name: 0 for name in mix}
+        self.error_samples = []
+        self.connect_ms = []
+        self.connect_errors = 0
+        self.window_start = None
+        self.last_call_end = None
+        self._pending = 0
+        self._all_ready = None
+
+    def _record_error(self, where: str, error) -> None:
+        if len(self.error_samples) < 20:
+            self.error_samples.append(f"{where}: {error}")
+
+    def _session_ready(self) -> None:
+        """A session connected (or failed to); the last one opens the measurement window."""
+        self._pending -= 1
+        if self._pending == 0:
+            self.window_start = time.perf_counter()
+            self._all_ready.set()
+
+    async def _session(self, index: int, rng: random.Random) -> None:
+        await asyncio.sleep(self.ramp_up * index / max(self.sessions, 1))
+        names, weights = list(self.mix), list(self.mix.values())
+        connect_start = time.perf_counter()
+        ready = False
+        try:
+            async with open_session(self.transport, self.url, self.command) as session:
+                self.connect_ms.append((time.perf_counter() - connect_start) * 1000)
+                ready = True
+                self._session_ready()
+                # No calls until every session is connected, so the window measures all N under load
+                await self._all_ready.wait()
+                calls = 0
+                while time.perf_counter() - self.window_start < self.duration:
+                    if self.calls_per_session is not None and calls >= self.calls_per_session:
+                        break
+                    name = rng.choices(names, weights)[0]
+                    call_start = time.perf_counter()
+                    try:
+                        result = await asyncio.wait_for(
+                            session.call_tool(name, self.tool_args.get(name, {})), self.timeout
+                        )
+                        failed = result.isError
+                        if failed:
+                            self._record_error(name, " ".join(getattr(c, "text", "") for c in result.content))
+                    except Exception as e:
+                        failed = True
+                        self._record_error(name, repr(e))
+                    self.last_call_end = time.perf_counter()
+                    self.latencies[name].append((self.last_call_end - call_start) * 1000)
+                    self.errors[name] += failed
+                    calls += 1
+        except Exception as e:
+            self.connect_errors += 1
+            self._record_error("session", repr(e))
+            if not ready:
+                self._session_ready()
+
+    async def run(self, sampler: MemorySampler) -> dict:
+        sampler.start()
+        self._pending = self.sessions
+        self._all_ready = asyncio.Event()
+        connect_start = time.perf_counter()
+        await asyncio.gather(*(self._session(i, random.Random(i)) for i in range(self.sessions)))
+        # Throughput is over the window from the last session connecting to the last call
+        # finishing; connecting (and --ramp-up) and closing the sessions are left out
+        elapsed = (self.last_call_end or time.perf_counter()) - self.window_start
+        sampler.sample()
+        await sampler.stop()
+
+        all_latencies = [ms for values in self.latencies.values() for ms in values]
+        calls = len(all_latencies)
+        errors = sum(self.errors.values())
+        return {
+            "connect_phase_s": self.window_start - connect_start,
+            "elapsed_s": elapsed,
+            "calls": calls,
+            "errors": errors,
+            "error_rate": errors / calls if calls else 0.0,
+            "throughput_cps": calls / elapsed if elapsed else 0.0,
+            "sessions_connected": len(self.connect_ms),
+            "session_errors": self.connect_errors,
+            "connect": latency_summary(self.connect_ms),
+            "latency": latency_summary(all_latencies),
+            "per_tool": {
+                name: {**latency_summary(values), "errors": self.errors[name]}
+                for name, values in self.latencies.items()
+            },
+            "memory": sampler.summary(),
+            "error_samples": self.error_samples,
+        }
+
+
+def print_report(config: dict, results: dict) -> None:
+    latency = results["latency"]
+    print("-----------------------------------------")
+    print(f"{config['target']} over {config['transport']}: {config['sessions']} sessions, "
+          f"{results['elapsed_s']:.1f} s measured after {results['connect_phase_s']:.1f} s connecting, mix {config['mix']}")
+    print(f"calls: {results['calls']}  throughput: {results['throughput_cps']:.1f} calls/s  "
+          f"errors: {results['errors']} ({results['error_rate']:.2%})  "
+          f"sessions: {results['sessions_connected']}/{config['sessions']} "
+          f"(connect p50 {results['connect']['p50_ms']:.0f} ms)")
+    print(f"{'tool':<28}{'calls':>8}{'err':>6}{'p50 ms':>9}{'p90 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for name, row in [*results["per_tool"].items(), ("ALL", {**latency, "errors": results["errors"]})]:
+        print(f"{name:<28}{row['count']:>8}{row['errors']:>6}{row['p50_ms']:>9.1f}{row['p90_ms']:>9.1f}"
+              f"{row['p95_ms']:>9.1f}{row['p99_ms']:>9.1f}{row['max_ms']:>9.1f}")
+    memory = results["memory"]
+    if memory["available"]:
+        print(f"server memory: start {memory['start_rss_mb']:.0f} MB, peak {memory['peak_rss_mb']:.0f} MB, "
+              f"end {memory['end_rss_mb']:.0f} MB")
+    else:
+        print(f"server memory: not sampled ({memory['reason']})")
+    for sample in results["error_samples"][:5]:
+        print(f"  error: {sample[:200]}")
+    print("-----------------------------------------")
+
+
+def print_comparison(results: dict, baseline_path: str) -> None:
+    with open(baseline_path) as f:
+        baseline = json.load(f)["results"]
+    rows = [
+        ("throughput calls/s", baseline["throughput_cps"], results["throughput_cps"]),
+        ("p50 ms", baseline["latency"]["p50_ms"], results["latency"]["p50_ms"]),
+        ("p99 ms", baseline["latency"]["p99_ms"], results["latency"]["p99_ms"]),
+        ("error rate", baseline["error_rate"], results["error_rate"]),
+    ]
+    if baseline["memory"].get("available") and results["memory"]["available"]:
+        rows.append(("peak rss MB", baseline["memory"]["peak_rss_mb"], results["memory"]["peak_rss_mb"]))
+    print(f"vs. {baseline_path}")
+    print(f"{'metric':<22}{'baseline':>12}{'this run':>12}{'change':>10}")
+    for name, old, new in rows:
+        change = f"{(new - old) / old:+.1%}" if old else "n/a"
+        print(f"{name:<22}{old:>12.3f}{new:>12.3f}{change:>10}")
+
+
+async def list_tools(transport: str, url: str, command: str) -> None:
+    async with open_session(transport, url, command) as session:
+        for tool in (await session.list_tools()).tools:
+            print(f"{tool.name}: {json.dumps(tool.inputSchema.get('properties', {}))}")
+
+
+async def main(args) -> None:
+    # FastMCP logs every request at INFO; keep the load generator's own process quiet
+    logging.disable(logging.INFO)
+    preset = PRESETS[args.preset]
+    transport = args.transport or preset["transport"]
+    url = args.url or preset["url"]
+    command = args.command or preset["command"]
+    if transport == "stdio" and not command:
+        raise SystemExit(f"--command is required for stdio with preset {args.preset!r}")
+    if args.list_tools:
+        await list_tools(transport, url, command)
+        return
+
+    mix = parse_mix(args.mix or preset["mix"])
+    tool_args = {**preset["tool_args"], **json.loads(args.tool_args or "{}")}
+
+    server = None
+    server_pids = list(args.server_pid or [])
+    if args.spawn:
+        server = subprocess.Popen(shlex.split(args.spawn), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        server_pids.append(server.pid)
+    try:
+        if transport != "stdio":
+            wait_for_port(url)
+        load_test = LoadTest(
+            transport, url, command, args.sessions, mix, tool_args,
+            duration=args.duration, calls_per_session=args.calls_per_session,
+            ramp_up=args.ramp_up, timeout=args.timeout,
+        )
+        sampler = MemorySampler(server_pids, children_of_self=transport == "stdio")
+        results = await load_test.run(sampler)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    config = {
+        "target": args.preset,
+        "transport": transport,
+        "url": url if transport != "stdio" else None,
+        "command": command if transport == "stdio" else args.spawn,
+        "sessions": args.sessions,
+        "duration_s": args.duration,
+        "calls_per_session": args.calls_per_session,
+        "ramp_up_s": args.ramp_up,
+        "mix": mix,
+        "tool_args": tool_args,
+    }
+    print_report(config, results)
+    with open(args.output, "w") as f:
+        json.dump({"timestamp": datetime.now().isoformat(timespec="seconds"), "config": config, "results": results},
+                  f, indent=2)
+    print(f"Results written to {args.output}")
+    if args.baseline:
+        print_comparison(results, args.baseline)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent load test for the MCP servers")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="math", help="Server to target (defaults below)")
+    parser.add_argument("--transport", choices=TRANSPORTS, help="Overrides the preset's transport")
+    parser.add_argument("--url", help="Server URL for streamable_http / sse")
+    parser.add_argument("--command", help='Server command for stdio, e.g. "python mathserver.py"')
+    parser.add_argument("--sessions", type=int, default=10, help="Concurrent client sessions")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run")
+    parser.add_argument("--calls-per-session", type=int, help="Stop each session after this many calls")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="Seconds over which sessions are started")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-call timeout in seconds")
+    parser.add_argument("--mix", help='Weighted tool mix, e.g. "add=5,multiply=3"')
+    parser.add_argument("--tool-args", help='JSON arguments per tool, e.g. \'{"add": {"a": 1, "b": 2}}\'')
+    parser.add_argument("--spawn", help="Start this server command for the run (and sample its memory)")
+    parser.add_argument("--server-pid", type=int, action="append", help="Pid of a running server to sample memory of")
+    parser.add_argument("--output", default="loadtest_results.json", help="JSON file for the results")
+    parser.add_argument("--baseline", help="Previous results JSON to compare against")
+    parser.add_argument("--list-tools", action="store_true", help="Print the server's tools and exit")
+    asyncio.run(main(parser.parse_args()))
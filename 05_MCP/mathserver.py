@@ -2,25 +2,43 @@
 mathserver.py
 
 A simple MCP (Modular Command Platform) server exposing basic math operations as tools.
-This server provides two tools:
+This server provides two scalar tools:
     - add(a: int, b: int): Returns the sum of two integers.
     - multiply(a: int, b: int): Returns the product of two integers.
 
-The server uses FastMCP and communicates via stdio transport.
+And bulk tools that work on whole arrays in a single call (evaluated with NumPy), so an agent
+summing a column of numbers makes one tool call instead of one `add` call per pair:
+    - sum_numbers(numbers), product(numbers), dot_product(a, b)
+    - elementwise(op, a, b): add / subtract / multiply / divide / power, element by element
+    - reduce_numbers(op, numbers): min, max, mean, median, cumsum, cumprod, argmin, argmax
+    - describe(numbers): count, sum, mean, std, var, min, max and percentiles
+
+sum_numbers, product, dot_product and elementwise take a `precision`:
+    - "float":   NumPy float64 (fast, ~15 significant digits)
+    - "exact":   exact rational arithmetic (fractions); pass numbers as strings to keep every digit
+    - "decimal": decimal arithmetic with `digits` significant digits
+
+The server uses FastMCP and communicates via stdio transport by default.
+It can also be served over HTTP, or mounted inside a client process (see mcp_pool.py).
 
 Usage:
     python mathserver.py
+    python mathserver.py --transport streamable-http --port 8001
 
 Dependencies:
     - mcp
+    - numpy
 
 Author: [Your Name]
 Date: [Date]
 """
-# ...existing code...
-from mcp.server import FastMCP
-# ...existing code...
+from decimal import Decimal, localcontext
+from fractions import Fraction
+from functools import reduce
+from typing import Literal
+import operator
 
+import numpy as np
 from mcp.server import FastMCP
 
 
@@ -40,5 +58,198 @@ def multiply(a: int, b: int)-> int:
     """
     return a * b
 
+
+# ------------------------------------------------------
+#  Bulk tools
+# ------------------------------------------------------
+Precision = Literal["float", "exact", "decimal"]
+
+PY_OPS = {
+    "add": operator.add,
+    "subtract": operator.sub,
+    "multiply": operator.mul,
+    "divide": operator.truediv,
+    "power": operator.pow,
+}
+NP_OPS = {
+    "add": np.add,
+    "subtract": np.subtract,
+    "multiply": np.multiply,
+    "divide": np.divide,
+    "power": np.power,
+}
+
+
+def _to_array(numbers: list) -> np.ndarray:
+    return np.asarray([float(x) for x in numbers], dtype=np.float64)
+
+
+def _to_exact(numbers: list, precision: str) -> list:
+    """Convert to Fraction/Decimal through str(), so 0.1 stays exactly one tenth."""
+    if precision == "exact":
+        return [Fraction(str(x)) for x in numbers]
+    return [Decimal(str(x)) for x in numbers]
+
+
+def _zero(precision: str):
+    return Fraction(0) if precision == "exact" else Decimal(0)
+
+
+def _format(value, precision: str):
+    """floats stay numbers; exact/decimal results are returned as strings to keep every digit."""
+    if precision == "float":
+        return float(value)
+    if isinstance(value, Fraction) and value.denominator == 1:
+        return str(value.numerator)
+    if isinstance(value, Decimal):
+        # int() keeps every digit; normalize() would round to the current context's precision
+        return str(int(value)) if value.is_finite() and value == value.to_integral_value() else str(value)
+    return str(value)
+
+
+def _exact_eval(precision: str, digits: int, fn):
+    """Run fn() under a decimal context with `digits` significant digits (no-op for fractions)."""
+    with localcontext() as ctx:
+        ctx.prec = digits
+        return fn()
+
+
+@mcp.tool()
+def sum_numbers(numbers: list[float | str], precision: Precision = "float", digits: int = 50) -> float | str:
+    """
+    Sum a whole list of numbers in one call.
+
+    Args:
+        numbers: The numbers to add up.
+        precision: "float" (NumPy), "exact" (fractions) or "decimal" (`digits` significant digits).
+        digits: Significant digits for "decimal" precision.
+    """
+    if precision == "float":
+        return _format(np.sum(_to_array(numbers)), precision)
+    values = _to_exact(numbers, precision)
+    return _format(_exact_eval(precision, digits, lambda: sum(values, _zero(precision))), precision)
+
+
+@mcp.tool()
+def product(numbers: list[float | str], precision: Precision = "float", digits: int = 50) -> float | str:
+    """
+    Multiply a whole list of numbers together in one call.
+
+    Args:
+        numbers: The numbers to multiply.
+        precision: "float" (NumPy), "exact" (fractions) or "decimal" (`digits` significant digits).
+        digits: Significant digits for "decimal" precision.
+    """
+    if precision == "float":
+        return _format(np.prod(_to_array(numbers)), precision)
+    values = _to_exact(numbers, precision)
+    return _format(_exact_eval(precision, digits, lambda: reduce(operator.mul, values, _zero(precision) + 1)), precision)
+
+
+@mcp.tool()
+def dot_product(a: list[float | str], b: list[float | str], precision: Precision = "float", digits: int = 50) -> float | str:
+    """
+    Dot product of two equally long vectors: sum(a[i] * b[i]).
+
+    Args:
+        a: First vector.
+        b: Second vector, same length as a.
+        precision: "float" (NumPy), "exact" (fractions) or "decimal" (`digits` significant digits).
+        digits: Significant digits for "decimal" precision.
+    """
+    if len(a) != len(b):
+        raise ValueError(f"Vectors must have the same length, got {len(a)} and {len(b)}")
+    if precision == "float":
+        return _format(np.dot(_to_array(a), _to_array(b)), precision)
+    xs, ys = _to_exact(a, precision), _to_exact(b, precision)
+    return _format(_exact_eval(precision, digits, lambda: sum((x * y for x, y in zip(xs, ys)), _zero(precision))), precision)
+
+
+@mcp.tool()
+def elementwise(
+    op: Literal["add", "subtract", "multiply", "divide", "power"],
+    a: list[float | str],
+    b: list[float | str],
+    precision: Precision = "float",
+    digits: int = 50,
+) -> list[float | str]:
+    """
+    Apply an operation element by element: result[i] = a[i] <op> b[i].
+    If b has a single element it is applied to every element of a (e.g. multiply a column by 3).
+
+    Args:
+        op: add, subtract, multiply, divide or power.
+        a: Left operands.
+        b: Right operands, same length as a, or a single number.
+        precision: "float" (NumPy), "exact" (fractions) or "decimal" (`digits` significant digits).
+        digits: Significant digits for "decimal" precision.
+    """
+    if len(b) not in (1, len(a)):
+        raise ValueError(f"b must have 1 or {len(a)} elements, got {len(b)}")
+    if precision == "float":
+        return [float(x) for x in NP_OPS[op](_to_array(a), _to_array(b))]
+    xs, ys = _to_exact(a, precision), _to_exact(b, precision)
+    if len(ys) == 1:
+        ys = ys * len(xs)
+    fn = PY_OPS[op]
+    results = _exact_eval(precision, digits, lambda: [fn(x, y) for x, y in zip(xs, ys)])
+    return [_format(r, precision) for r in results]
+
+
+@mcp.tool()
+def reduce_numbers(
+    op: Literal["min", "max", "mean", "median", "cumsum", "cumprod", "argmin", "argmax"],
+    numbers: list[float],
+) -> float | list[float]:
+    """
+    Reduce a list of numbers with NumPy.
+    min/max/mean/median return a number, argmin/argmax the index of that element,
+    cumsum/cumprod the running totals.
+
+    Args:
+        op: The reduction to apply.
+        numbers: The input numbers.
+    """
+    values = _to_array(numbers)
+    result = getattr(np, op)(values)
+    if isinstance(result, np.ndarray):
+        return [float(x) for x in result]
+    return result.item()
+
+
+@mcp.tool()
+def describe(numbers: list[float], percentiles: tuple[float, ...] = (25, 50, 75), ddof: int = 0) -> dict:
+    """
+    Descriptive statistics of a list of numbers: count, sum, mean, std, var, min, max and percentiles.
+
+    Args:
+        numbers: The input numbers.
+        percentiles: Percentiles to compute, between 0 and 100.
+        ddof: Delta degrees of freedom for std/var (0 = population, 1 = sample).
+    """
+    values = _to_array(numbers)
+    if values.size == 0:
+        return {"count": 0}
+    points = np.percentile(values, list(percentiles)) if percentiles else []
+    return {
+        "count": int(values.size),
+        "sum": float(values.sum()),
+        "mean": float(values.mean()),
+        "std": float(values.std(ddof=ddof)),
+        "var": float(values.var(ddof=ddof)),
+        "min": float(values.min()),
+        "max": float(values.max()),
+        "percentiles": {f"p{p:g}": float(v) for p, v in zip(percentiles, points)},
+    }
+
+
 if __name__ == "__main__":
-    mcp.run(transport="stdio")
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Math MCP server")
+    parser.add_argument("--transport", default="stdio", choices=["stdio", "sse", "streamable-http"])
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    mcp.settings.port = args.port
+    mcp.run(transport=args.transport)
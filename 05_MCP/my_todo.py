@@ -1,6 +1,10 @@
 """
 This module defines a simple to-do retrieval service using FastMCP.
 
+To-dos are kept in a persistent SQLite store with a sorted date index (see todo_store.py),
+so range queries like "this week" or "next 30 days" stay fast with millions of entries,
+and the blocking database calls run in worker threads so the server's event loop never blocks.
+
 Classes:
     None
 
@@ -8,14 +12,24 @@ Functions:
     get_my_todys(date_arg: str) -> list[str]:
         Retrieves the list of to-do items for a given date in "DD-MM-YYYY" format.
         Returns a list of to-do items if found, otherwise returns a default message.
+    get_todos_in_range(start_date: str, end_date: str, offset: int = 0) -> dict:
+        Retrieves one page of to-do items between two "DD-MM-YYYY" dates (inclusive), grouped by date.
+    get_todos_for_period(period: str, offset: int = 0) -> dict:
+        Retrieves one page of to-do items for a period like "today", "this week" or "next 30 days".
+    add_todo(date_arg: str, title: str) -> str:
+        Adds a to-do item for a given "DD-MM-YYYY" date.
 
 Usage:
-    Run this module directly to start the FastMCP server with the to-do retrieval tool enabled.
+    Run this module directly to start the FastMCP server with the to-do tools enabled.
 """
 from mcp.server import FastMCP
 
+from todo_store import TodoStore, format_date, parse_date, parse_period
+
 mcp = FastMCP("My Todo")
 
+store = TodoStore()
+
 @mcp.tool()
 async def get_my_todys(date_arg: str)->list[str]:
     """
@@ -28,15 +42,66 @@ async def get_my_todys(date_arg: str)->list[str]:
         list[str]: A list of to-do items for the specified date. If no items are found for the date,
                    returns a default message indicating nothing to do.
     """
+    try:
+        day = parse_date(date_arg)
+    except ValueError:
+        return ["Nothing to do, Chears!"]
+    todos = await store.aget_day(day)
+    return todos or ["Nothing to do, Chears!"]
+
+
+@mcp.tool()
+async def get_todos_in_range(start_date: str, end_date: str, offset: int = 0) -> dict:
+    """
+    Retrieve to-do items between two dates, inclusive, one page at a time.
+
+    Args:
+        start_date (str): First date, in "DD-MM-YYYY" format.
+        end_date (str): Last date, in "DD-MM-YYYY" format.
+        offset (int): Number of to-dos to skip; pass the previous page's "next_offset".
+
+    Returns:
+        dict: "todos": to-do items grouped by "DD-MM-YYYY" date, in date order (dates without
+              to-dos are left out); "next_offset": offset of the next page, or null if this
+              page holds the rest of the range.
+    """
+    return await store.aget_range_page(parse_date(start_date), parse_date(end_date), offset)
+
+
+@mcp.tool()
+async def get_todos_for_period(period: str, offset: int = 0) -> dict:
+    """
+    Retrieve to-do items for a period described in words.
+
+    Args:
+        period (str): One of "today", "tomorrow", "yesterday", "this week", "next week", "last week",
+                      "this month", "next month", "next N days", "last N days",
+                      or "DD-MM-YYYY to DD-MM-YYYY".
+        offset (int): Number of to-dos to skip; pass the previous page's "next_offset".
+
+    Returns:
+        dict: "todos": to-do items grouped by "DD-MM-YYYY" date, in date order; "next_offset":
+              offset of the next page, or null if this page holds the rest of the period.
+    """
+    start, end = parse_period(period)
+    return await store.aget_range_page(start, end, offset)
 
-    print("todo-----")
-    print(date_arg)
-    data = {
-        "05-07-2025": ["Cloth cleaning", "medicine purchase"],
-        "06-07-2025": ["car service"]
-    }
 
-    return data.get(date_arg, ["Nothing to do, Chears!"])
+@mcp.tool()
+async def add_todo(date_arg: str, title: str) -> str:
+    """
+    Add a to-do item.
+
+    Args:
+        date_arg (str): The date in "DD-MM-YYYY" format the to-do is due.
+        title (str): What needs to be done.
+
+    Returns:
+        str: Confirmation message.
+    """
+    day = parse_date(date_arg)
+    await store.aadd(day, title)
+    return f"Added '{title}' for {format_date(day)}"
 
 
 if __name__ == "__main__":
@@ -0,0 +1,213 @@
+"""
+todo_store.py
+
+Persistent, date-indexed storage for the to-do MCP server (my_todo.py).
+
+Todos live in a SQLite file with a B-tree index on the due date. Dates are stored as ISO
+strings (YYYY-MM-DD), which sort the same way as the dates themselves, so:
+    - an exact-date lookup is one index seek: O(log n)
+    - a range ("this week", "next 30 days") is one seek plus a scan of the k matches: O(log n + k)
+
+SQLite calls are blocking, so every public method has an async twin that runs it in a worker
+thread (asyncio.to_thread); the streamable-http server's event loop never waits on disk.
+Each worker thread gets its own connection, and the database runs in WAL mode so reads
+don't block behind writes.
+
+Usage:
+    store = TodoStore("my_todos.db")
+    await store.aadd("05-07-2025", "Cloth cleaning")
+    await store.aget_range(date(2025, 7, 1), date(2025, 7, 7))
+"""
+
+import asyncio
+import os
+import re
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+
+
+DB_PATH = os.getenv("TODO_STORE_PATH", "my_todos.db")
+DATE_FORMAT = "%d-%m-%Y"
+PAGE_SIZE = 500   # to-dos per page of get_range_page (one MCP tool result)
+
+# The to-dos my_todo.py used to hard-code; loaded into a new, empty store
+DEFAULT_TODOS = {
+    "05-07-2025": ["Cloth cleaning", "medicine purchase"],
+    "06-07-2025": ["car service"],
+}
+
+
+def parse_date(date_arg: str) -> date:
+    """Parse a "DD-MM-YYYY" date (the format the to-do tools use)."""
+    return datetime.strptime(date_arg.strip(), DATE_FORMAT).date()
+
+
+def format_date(day: date) -> str:
+    return day.strftime(DATE_FORMAT)
+
+
+def parse_period(period: str, today: date = None) -> tuple:
+    """
+    Turn a natural-language period into an inclusive (start, end) date range.
+
+    Supported:
+        "today", "tomorrow", "yesterday",
+        "this week", "next week", "last week"      (weeks start on Monday)
+        "this month", "next month",
+        "next N days", "last N days"               (today included)
+        "DD-MM-YYYY", "DD-MM-YYYY to DD-MM-YYYY"
+
+    Raises:
+        ValueError: If the period is not recognized.
+    """
+    today = today or date.today()
+    text = " ".join(period.strip().lower().split())
+
+    single = {"today": 0, "tomorrow": 1, "yesterday": -1}
+    if text in single:
+        day = today + timedelta(days=single[text])
+        return day, day
+
+    weeks = {"this week": 0, "next week": 1, "last week": -1}
+    if text in weeks:
+        start = today - timedelta(days=today.weekday()) + timedelta(weeks=weeks[text])
+        return start, start + timedelta(days=6)
+
+    if text in ("this month", "next month"):
+        start = today.replace(day=1)
+        if text == "next month":
+            start = (start + timedelta(days=32)).replace(day=1)
+        end = (start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+        return start, end
+
+    match = re.fullmatch(r"(next|last|past) (\d+) days?", text)
+    if match:
+        days = int(match.group(2))
+        if match.group(1) == "next":
+            return today, today + timedelta(days=days - 1)
+        return today - timedelta(days=days - 1), today
+
+    match = re.fullmatch(r"(\d{2}-\d{2}-\d{4})(?: (?:to|-|until) (\d{2}-\d{2}-\d{4}))?", text)
+    if match:
+        start = parse_date(match.group(1))
+        end = parse_date(match.group(2)) if match.group(2) else start
+        return start, end
+
+    raise ValueError(f"Unrecognized period: {period!r}")
+
+
+class TodoStore:
+    """
+    SQLite-backed to-do store with a sorted date index.
+
+    Args:
+        path (str): Database file. Created (and seeded with DEFAULT_TODOS) if it doesn't exist.
+        seed (bool): Load DEFAULT_TODOS into an empty store.
+    """
+
+    def __init__(self, path: str = DB_PATH, seed: bool = True) -> None:
+        self.path = path
+        self._local = threading.local()
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS todos ("
+                " id INTEGER PRIMARY KEY,"
+                " due TEXT NOT NULL,"
+                " title TEXT NOT NULL)"
+            )
+            # (due, id) keeps rows of the same day in insertion order without a sort step, and
+            # including the title makes it a covering index: queries never touch the table itself
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_todos_due ON todos (due, id, title)")
+        if seed and self.count() == 0:
+            self.add_many((parse_date(day), title) for day, titles in DEFAULT_TODOS.items() for title in titles)
+
+    def _conn(self) -> sqlite3.Connection:
+        """One connection per thread (sqlite3 connections must not be shared across threads)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # ------------------------------------------------------
+    #  Blocking API
+    # ------------------------------------------------------
+    def add(self, day: date, title: str) -> int:
+        conn = self._conn()
+        with conn:
+            cursor = conn.execute("INSERT INTO todos (due, title) VALUES (?, ?)", (day.isoformat(), title))
+        return cursor.lastrowid
+
+    def add_many(self, items) -> int:
+        """Insert (date, title) pairs in one transaction. Returns the number of rows inserted."""
+        conn = self._conn()
+        with conn:
+            cursor = conn.executemany(
+                "INSERT INTO todos (due, title) VALUES (?, ?)",
+                ((day.isoformat(), title) for day, title in items),
+            )
+        return cursor.rowcount
+
+    def get_day(self, day: date) -> list:
+        rows = self._conn().execute(
+            "SELECT title FROM todos WHERE due = ? ORDER BY id", (day.isoformat(),)
+        ).fetchall()
+        return [title for (title,) in rows]
+
+    def get_range(self, start: date, end: date, limit: int = None, offset: int = 0) -> dict:
+        """
+        Todos due between start and end (inclusive), grouped by "DD-MM-YYYY" date in date order.
+        With `limit`, at most that many, skipping the first `offset` of the range.
+        """
+        rows = self._conn().execute(
+            "SELECT due, title FROM todos WHERE due BETWEEN ? AND ? ORDER BY due, id LIMIT ? OFFSET ?",
+            (start.isoformat(), end.isoformat(), -1 if limit is None else limit, offset),
+        ).fetchall()
+        return self._group(rows)
+
+    def get_range_page(self, start: date, end: date, offset: int = 0, limit: int = PAGE_SIZE) -> dict:
+        """
+        One page of get_range: {"todos": {date: [titles]}, "next_offset": int or None}.
+        `next_offset` is the offset of the next page, or None when this page ends the range.
+        """
+        rows = self._conn().execute(
+            "SELECT due, title FROM todos WHERE due BETWEEN ? AND ? ORDER BY due, id LIMIT ? OFFSET ?",
+            (start.isoformat(), end.isoformat(), limit + 1, offset),
+        ).fetchall()
+        more = len(rows) > limit
+        return {"todos": self._group(rows[:limit]), "next_offset": offset + limit if more else None}
+
+    @staticmethod
+    def _group(rows: list) -> dict:
+        grouped = {}
+        for due, title in rows:
+            titles = grouped.get(due)
+            if titles is None:
+                titles = grouped[due] = []
+            titles.append(title)
+        return {format_date(date.fromisoformat(due)): titles for due, titles in grouped.items()}
+
+    def count(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM todos").fetchone()[0]
+
+    # ------------------------------------------------------
+    #  Async API (runs the blocking calls in a worker thread)
+    # ------------------------------------------------------
+    async def aadd(self, day: date, title: str) -> int:
+        return await asyncio.to_thread(self.add, day, title)
+
+    async def aadd_many(self, items) -> int:
+        return await asyncio.to_thread(self.add_many, list(items))
+
+    async def aget_day(self, day: date) -> list:
+        return await asyncio.to_thread(self.get_day, day)
+
+    async def aget_range(self, start: date, end: date, limit: int = None, offset: int = 0) -> dict:
+        return await asyncio.to_thread(self.get_range, start, end, limit, offset)
+
+    async def aget_range_page(self, start: date, end: date, offset: int = 0, limit: int = PAGE_SIZE) -> dict:
+        return await asyncio.to_thread(self.get_range_page, start, end, offset, limit)
@@ -4,7 +4,7 @@ tool_enabled_chatbot_graph.py
 LangGraph implementation of a conversational chatbot integrated with external tools.
 
 This example uses:
-- OpenAI's GPT model (`gpt-4.1`) for generating assistant responses.
+- OpenAI's GPT models (`gpt-4.1-mini`, escalating to `gpt-4.1`) for generating assistant responses.
 - Tavily (via `langchain_tavily`) for real-time web search functionality.
 - LangGraph's `ToolNode` and `tools_condition` for auto-invoking tools when needed.
 
@@ -47,7 +47,7 @@ from langgraph.graph import StateGraph, START, END
 from langgraph.graph.message import add_messages
 from langgraph.prebuilt import ToolNode, tools_condition
 
-from utils import show  # helper function to visualize the graph
+from utils import show, stream_chat, CascadeChatModel, NodeCache, LazyRegistry  # helpers to visualize, stream, cascade, cache and build lazily
 
 # ------------------------------------------------------
 #  Step 1: Set up environment variables for API keys
@@ -58,12 +58,16 @@ os.environ["TAVILY_API_KEY"] = os.getenv('TAVILY_API_KEY')
 # ------------------------------------------------------
 #  Step 2: Initialize LLM and tools
 # ------------------------------------------------------
-llm = init_chat_model("openai:gpt-4.1")  # LLM interface
 tool = TavilySearch(max_results=2)       # Search tool
 tools = [tool]
 
-# Bind tools to the LLM
-llm_with_tools = llm.bind_tools(tools)
+# LLM interface: gpt-4.1-mini first, escalating to gpt-4.1 on bad tool calls or weak answers,
+# with the tools bound. Built on first use (the OpenAI client takes ~0.6 s to import).
+registry = LazyRegistry()
+registry.register("llm_with_tools", lambda: CascadeChatModel(tiers=[
+    init_chat_model("openai:gpt-4.1-mini", logprobs=True),   # token probabilities for the confidence check
+    init_chat_model("openai:gpt-4.1"),
+]).bind_tools(tools))
 
 # ------------------------------------------------------
 #  Step 3: Define graph state schema
@@ -80,9 +84,11 @@ graph_builder = StateGraph(State)
 
 # LLM node: handles user input and generates assistant response
 def chatbot(state: State):
-    return {"messages": [llm_with_tools.invoke(state["messages"])]}
+    return {"messages": [registry.get("llm_with_tools").invoke(state["messages"])]}
 
-graph_builder.add_node("chatbot", chatbot)
+# With NODE_CACHE=1, histories recently answered by this model + tool set are served from node_cache.db
+node_cache = NodeCache.from_env()
+graph_builder.add_node("chatbot", node_cache.wrap(chatbot, model=registry.lazy("llm_with_tools")))
 
 # Tool node: runs tools if tool_calls exist in the LLM response
 tool_node = ToolNode(tools=[tool])
@@ -121,22 +127,22 @@ show(graph, "02_graph.png")
 
 def stream_graph_updates(user_input: str):
     """
-    Streams the assistant response by passing the user's input
-    into the compiled LangGraph execution.
+    Streams the assistant response token by token, shows tool calls
+    as they start and finish, and reports the turn's latency.
     """
-    for event in graph.stream({"messages": [{"role": "user", "content": user_input}]}):
-        for value in event.values():
-            print("Assistant:", value["messages"][-1].content)
+    stream_chat(graph, user_input)
 
 # ------------------------------------------------------
 #  Step 8: CLI loop for interaction
 # ------------------------------------------------------
 
 if __name__ == "__main__":
+    registry.prefetch()  # build the LLM while the user types
     while True:
         try:
             user_input = input("User: ")
             if user_input.lower() in ["quit", "exit", "q"]:
+                node_cache.print_report()
                 print("Goodbye!")
                 break
 
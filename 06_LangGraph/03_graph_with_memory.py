@@ -3,13 +3,13 @@ from typing import Annotated
 from typing_extensions import TypedDict
 
 from langgraph.graph import StateGraph, add_messages
-from langgraph.prebuilt import ToolNode, tools_condition
-from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.prebuilt import tools_condition
 
 from langchain.chat_models import init_chat_model
 from langchain_tavily import TavilySearch
 
-from utils import show
+from utils import (show, BasicToolNode, DeltaSqliteSaver, MessagePolicy, ToolOutputCompactor, ResultStore, TAVILY_BUDGET,
+                   NodeCache, LazyRegistry)
 
 # ------------------------------------------------------
 #  Step 1: Environment setup
@@ -20,10 +20,20 @@ os.environ["TAVILY_API_KEY"] = os.getenv("TAVILY_API_KEY")
 # ------------------------------------------------------
 #  Step 2: LLM and Tool initialization
 # ------------------------------------------------------
-llm = init_chat_model("openai:gpt-4.1")
 tool = TavilySearch(max_results=2)
-tools = [tool]
-llm_with_tool = llm.bind_tools(tools)
+
+# Search results are re-sent to the LLM on every later turn (the graph has memory), so keep only
+# title/url/content within a size budget; the full result stays fetchable with fetch_full_result
+compactor = ToolOutputCompactor(budgets={tool.name: TAVILY_BUDGET}, store=ResultStore())
+tools = [tool, compactor.fetch_tool]
+
+# Built on first use (the OpenAI client takes ~0.6 s to import), so the prompt shows at once
+registry = LazyRegistry()
+registry.register("llm_with_tool", lambda: init_chat_model("openai:gpt-4.1").bind_tools(tools))
+
+# What the LLM sees: search outputs older than 3 turns become stubs, and the oldest turns
+# are dropped above 8k tokens (the checkpointed state keeps the full history)
+policy = MessagePolicy(keep_turns=3, max_tokens=8000)
 
 # ------------------------------------------------------
 #  Step 3: Define graph state schema
@@ -39,12 +49,15 @@ graph_builder = StateGraph(State)
 def chatbot(state: State):
     """Main chatbot node that uses the LLM (with tools) to process messages."""
     return {
-        "messages": [llm_with_tool.invoke(state["messages"])]
+        "messages": [registry.get("llm_with_tool").invoke(policy(state["messages"]))]
     }
 
-graph_builder.add_node("chatbot", chatbot)
+# With NODE_CACHE=1, replayed threads and repeated conversations are answered from node_cache.db
+# (keyed on the thread's messages and the model + tools, not on message ids; see NODE_CACHE_TTL)
+node_cache = NodeCache.from_env()
+graph_builder.add_node("chatbot", node_cache.wrap(chatbot, model=registry.lazy("llm_with_tool")))
 
-tool_node = ToolNode(tools=[tool])
+tool_node = BasicToolNode(tools, timeout=30, compactor=compactor)
 graph_builder.add_node("tools", tool_node)
 
 # ------------------------------------------------------
@@ -57,7 +70,8 @@ graph_builder.set_entry_point("chatbot")
 # ------------------------------------------------------
 #  Step 6: Compile graph with memory
 # ------------------------------------------------------
-memory = InMemorySaver()
+# Durable: threads survive restarts. Only new messages are stored per step, with a full snapshot every 20.
+memory = DeltaSqliteSaver("checkpoints_memory.db", snapshot_every=20, keep_last=50)
 graph = graph_builder.compile(checkpointer=memory)
 
 # ------------------------------------------------------
@@ -83,10 +97,14 @@ def stream_graph_update(user_input: str, config: dict):
 # ------------------------------------------------------
 if __name__ == "__main__":
     config = {"configurable": {"thread_id": "1"}}
+    registry.prefetch()  # build the LLM while the user types
     while True:
         try:
             user_input = input("User: ")
             if user_input.lower() in ["quit", "exit", "q"]:
+                compactor.print_report()
+                node_cache.print_report()
+                print("Message policy:", policy.report())
                 print("Goodbye!")
                 break
             stream_graph_update(user_input, config)
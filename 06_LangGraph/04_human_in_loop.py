@@ -7,10 +7,18 @@ Flow:
 3. The human provides input.
 4. The graph resumes from the paused point and continues the conversation.
 
+Paused threads are recorded in a durable queue (utils.InterruptQueue), so a different process
+can list them and resume one later:
+    $ python 04_human_in_loop.py                                  # demo: pause, then resume in-process
+    $ python 04_human_in_loop.py --ask "Find me an expert on agents" --thread 42
+    $ python 04_human_in_loop.py --list
+    $ python 04_human_in_loop.py --resume 42 "Talk to the LangGraph team."
+
 Requirements:
 - OPENAI_API_KEY and TAVILY_API_KEY must be set in the environment.
 """
 
+import argparse
 import os
 from typing import Annotated
 from typing_extensions import TypedDict
@@ -18,8 +26,7 @@ from typing_extensions import TypedDict
 # LangGraph core
 from langgraph.graph import StateGraph, add_messages
 from langgraph.prebuilt import ToolNode, tools_condition
-from langgraph.checkpoint.memory import InMemorySaver
-from langgraph.types import Command, interrupt
+from langgraph.types import interrupt
 
 # LangChain core
 from langchain_core.tools import tool
@@ -27,7 +34,7 @@ from langchain.chat_models import init_chat_model
 from langchain_tavily import TavilySearch
 
 # Optional: Graph visualization helper (custom utility)
-from utils import show
+from utils import show, DeltaSqliteSaver, InterruptQueue, LazyRegistry
 
 
 # ------------------------------------------------------
@@ -62,8 +69,9 @@ tools = [tavily_tool, human_assistance]
 # ------------------------------------------------------
 # Step 3: Initialize the LLM bound with tools
 # ------------------------------------------------------
-llm = init_chat_model("openai:gpt-4.1")
-llm_with_tools = llm.bind_tools(tools)
+# Built on first use: `--list` never needs the LLM (or the ~0.6 s it takes to import the OpenAI client)
+registry = LazyRegistry()
+registry.register("llm_with_tools", lambda: init_chat_model("openai:gpt-4.1").bind_tools(tools))
 
 
 # ------------------------------------------------------
@@ -85,7 +93,7 @@ def chatbot(state: State):
     - Calls the LLM (with tools bound).
     - Ensures at most one tool is called at a time (important for interrupts).
     """
-    message = llm_with_tools.invoke(state["messages"])
+    message = registry.get("llm_with_tools").invoke(state["messages"])
     assert len(message.tool_calls) <= 1  # Avoid multiple tool calls in parallel
     return {"messages": [message]}
 
@@ -106,11 +114,15 @@ graph_builder.set_entry_point("chatbot")  # Start at chatbot
 
 
 # ------------------------------------------------------
-# Step 7: Compile graph with in-memory checkpoint
+# Step 7: Compile graph with a durable checkpoint
 # ------------------------------------------------------
-memory = InMemorySaver()
+# SQLite file: a thread paused at an interrupt can be resumed after a restart
+memory = DeltaSqliteSaver("checkpoints_human_in_loop.db", snapshot_every=20)
 graph = graph_builder.compile(checkpointer=memory)
 
+# Pending interrupts live in the same file: listing them never loads a thread's state
+pending = InterruptQueue("checkpoints_human_in_loop.db", graph_name="human_in_loop")
+
 
 # ------------------------------------------------------
 # Step 8: (Optional) Save graph visualization
@@ -119,41 +131,72 @@ show(graph, "03_graph_with_human_in_loop.png")
 
 
 # ------------------------------------------------------
-# Step 9: Run a sample conversation
+# Step 9: Helpers to start, list and resume threads
 # ------------------------------------------------------
-if __name__ == "__main__":
-    # Thread/session configuration
-    config = {"configurable": {"thread_id": "1"}}
+def print_events(events):
+    """Print the latest message of each state update, and any pause."""
+    for event in events:
+        if "messages" in event:
+            event["messages"][-1].pretty_print()
+        if "__interrupt__" in event:
+            for item in event["__interrupt__"]:
+                print(f"\n[paused] waiting for a human: {item.value}")
 
-    #  Initial user message
-    user_input = "I need some expert guidance for building an AI agent. Could you request assistance for me?"
 
-    # Run the graph with the first message
-    events = graph.stream(
+def ask(user_input: str, thread_id: str):
+    """Start (or continue) a thread; if it pauses, it is added to the pending queue."""
+    config = {"configurable": {"thread_id": thread_id}}
+    print_events(pending.stream(
+        graph,
         {"messages": [{"role": "user", "content": user_input}]},
         config,
         stream_mode="values",
-    )
+    ))
 
-    # Print events until we hit an interrupt
-    for event in events:
-        if "messages" in event:
-            event["messages"][-1].pretty_print()
 
-    # 2 Human provides the assistance (resuming the interrupt)
-    human_response = (
-        "We, the experts, are here to help! "
-        "We recommend using LangGraph to build your agent, "
-        "as it's more reliable and extensible than simple autonomous agents."
-    )
+def list_pending(limit: int = 20):
+    """Threads waiting for a human, oldest first."""
+    items = pending.list(limit=limit)
+    print(f"{pending.count()} thread(s) waiting for a human")
+    for item in items:
+        print(f"  thread {item['thread_id']:<12} waiting {item['age_s']:>8.0f}s  {item['value']}")
 
-    # Command to resume the graph with the human's response
-    human_command = Command(resume={"data": human_response})
 
-    # Continue execution after human assistance
-    events = graph.stream(human_command, config, stream_mode="values")
+def resume(thread_id: str, human_response: str):
+    """Answer a paused thread (from any process) and continue its run."""
+    print_events(pending.resume(graph, thread_id, {"data": human_response}, stream_mode="values"))
 
-    # Print remaining messages
-    for event in events:
-        if "messages" in event:
-            event["messages"][-1].pretty_print()
+
+# ------------------------------------------------------
+# Step 10: Run a sample conversation
+# ------------------------------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Human-in-the-loop chatbot with a durable interrupt queue")
+    parser.add_argument("--ask", metavar="MESSAGE", help="Start a thread with this message")
+    parser.add_argument("--thread", default="1", help="Thread id for --ask")
+    parser.add_argument("--list", action="store_true", help="List threads waiting for a human")
+    parser.add_argument("--resume", nargs=2, metavar=("THREAD", "RESPONSE"), help="Answer a paused thread")
+    args = parser.parse_args()
+
+    if args.list:
+        list_pending()
+    elif args.resume:
+        resume(*args.resume)
+    elif args.ask:
+        ask(args.ask, args.thread)
+    else:
+        #  Initial user message: the AI asks for human assistance and the thread pauses
+        user_input = "I need some expert guidance for building an AI agent. Could you request assistance for me?"
+        ask(user_input, args.thread)
+        list_pending()
+
+        # 2 Human provides the assistance (resuming the interrupt)
+        human_response = (
+            "We, the experts, are here to help! "
+            "We recommend using LangGraph to build your agent, "
+            "as it's more reliable and extensible than simple autonomous agents."
+        )
+
+        # Continue execution after human assistance
+        if pending.get(args.thread):
+            resume(args.thread, human_response)
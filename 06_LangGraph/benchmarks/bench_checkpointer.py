@@ -0,0 +1,122 @@
+"""
+bench_checkpointer.py
+
+Storage growth and resume latency of DeltaSqliteSaver: message deltas with a base snapshot
+every N checkpoints, against full snapshots at every checkpoint (snapshot_every=1, which is
+what InMemorySaver and the stock savers store).
+
+A chatbot -> tools -> chatbot graph with fake nodes (no API keys needed) runs a conversation
+of T turns; every turn appends a user message, a tool call, a ~2 KB tool result and an answer.
+For each mode it reports the database size, per-turn write time, and the time a fresh process
+needs to load the thread back (`graph.get_state`).
+
+Usage (from the 06_LangGraph folder):
+    $ python -m benchmarks.bench_checkpointer
+    $ python -m benchmarks.bench_checkpointer --turns 200 --snapshot-every 10 25 50
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from typing import Annotated
+from typing_extensions import TypedDict
+
+from langchain_core.messages import AIMessage, ToolMessage
+from langgraph.graph import StateGraph, START, END, add_messages
+
+from utils.checkpointer import DeltaSqliteSaver
+
+
+class State(TypedDict):
+    messages: Annotated[list, add_messages]
+
+
+def chatbot(state: State):
+    last = state["messages"][-1]
+    if isinstance(last, ToolMessage):
+        return {"messages": [AIMessage(content=f"Here is what I found about turn {len(state['messages'])}. " * 4)]}
+    return {"messages": [AIMessage(content="", tool_calls=[
+        {"name": "search", "args": {"query": last.content}, "id": f"call_{len(state['messages'])}"}
+    ])]}
+
+
+def tools(state: State):
+    call = state["messages"][-1].tool_calls[0]
+    return {"messages": [ToolMessage(content="search result text " * 100, tool_call_id=call["id"])]}
+
+
+def route(state: State):
+    return "tools" if state["messages"][-1].tool_calls else END
+
+
+def build_graph(checkpointer):
+    builder = StateGraph(State)
+    builder.add_node("chatbot", chatbot)
+    builder.add_node("tools", tools)
+    builder.add_edge(START, "chatbot")
+    builder.add_conditional_edges("chatbot", route, ["tools", END])
+    builder.add_edge("tools", "chatbot")
+    return builder.compile(checkpointer=checkpointer)
+
+
+def db_size(path: str) -> int:
+    return sum(os.path.getsize(p) for p in (path, f"{path}-wal") if os.path.exists(p))
+
+
+def run(turns: int, snapshot_every: int, workdir: str) -> dict:
+    path = os.path.join(workdir, f"checkpoints_{snapshot_every}.db")
+    config = {"configurable": {"thread_id": "bench"}}
+    saver = DeltaSqliteSaver(path, snapshot_every=snapshot_every)
+    graph = build_graph(saver)
+    turn_ms = []
+    for turn in range(turns):
+        start = time.perf_counter()
+        graph.invoke({"messages": [{"role": "user", "content": f"question {turn}"}]}, config)
+        turn_ms.append((time.perf_counter() - start) * 1000)
+    stats = saver.storage_stats("bench")
+    saver.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    saver.close()
+
+    # Resume: a new saver (as after a restart) loading the latest state of the thread
+    resume_ms = []
+    for _ in range(5):
+        start = time.perf_counter()
+        resumed = DeltaSqliteSaver(path, snapshot_every=snapshot_every)
+        state = build_graph(resumed).get_state(config)
+        resume_ms.append((time.perf_counter() - start) * 1000)
+        resumed.close()
+    assert len(state.values["messages"]) == turns * 4
+
+    return {
+        "db_bytes": db_size(path),
+        "stored_bytes": stats["total_bytes"],
+        "checkpoints": stats["checkpoints"],
+        "turn_ms": statistics.fmean(turn_ms),
+        "last_turns_ms": statistics.fmean(turn_ms[-10:]),
+        "resume_ms": statistics.median(resume_ms),
+    }
+
+
+def main(args) -> None:
+    modes = [1] + [n for n in args.snapshot_every if n != 1]
+    with tempfile.TemporaryDirectory() as workdir:
+        results = {n: run(args.turns, n, workdir) for n in modes}
+
+    full = results[1]
+    print("-----------------------------------------")
+    print(f"{args.turns} turns, 4 messages each ({full['checkpoints']} checkpoints)")
+    print(f"{'mode':<22}{'db size':>10}{'vs full':>9}{'ms/turn':>9}{'last 10':>9}{'resume ms':>11}")
+    for n, row in results.items():
+        label = "full snapshots" if n == 1 else f"delta, base every {n}"
+        print(f"{label:<22}{row['db_bytes'] / 2**20:>8.1f}MB{row['db_bytes'] / full['db_bytes']:>8.0%}"
+              f"{row['turn_ms']:>9.1f}{row['last_turns_ms']:>9.1f}{row['resume_ms']:>11.1f}")
+    print("-----------------------------------------")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Delta vs full-snapshot checkpoint storage")
+    parser.add_argument("--turns", type=int, default=100)
+    parser.add_argument("--snapshot-every", type=int, nargs="+", default=[10, 20, 50])
+    main(parser.parse_args())
@@ -0,0 +1,323 @@
+"""
+bench_framework.py
+
+Per-node overhead of LangGraph itself, with no LLM or tool in the way.
+
+Every node here does (almost) nothing, so the time measured is the framework's: scheduling a
+superstep, copying and merging state through channels/reducers, streaming, and checkpointing.
+Scenarios:
+    - edge:     the 02_01_graph_with_edge.py graph (check_number -> even_node | odd_node)
+    - chain:    N nodes in a line, each incrementing a counter
+    - fanout:   START -> W parallel nodes -> join, results merged with an operator.add reducer
+    - loop:     one node looping on a conditional edge K times
+    - payload:  the chain again, carrying a large state value the nodes never touch
+                (the difference with `chain` is the cost of copying state between nodes)
+    - messages: the chain with an add_messages reducer, every node appending one message
+
+each run with `invoke`, `batch` and `stream`, with no checkpointer and with InMemorySaver
+(and DeltaSqliteSaver on request). It reports µs per executed node and memory allocated per run
+(tracemalloc, in a separate pass so tracing doesn't skew the timings).
+
+Results are appended to a history file (JSONL, one record per run). With --compare, each case is
+checked against the last recorded run: slowdowns above --threshold are listed as regressions
+(and --fail-on-regression exits with status 1, e.g. for CI).
+
+Usage (from the 06_LangGraph folder):
+    $ python -m benchmarks.bench_framework
+    $ python -m benchmarks.bench_framework --scenarios chain fanout --checkpointers none memory sqlite
+    $ python -m benchmarks.bench_framework --compare --threshold 0.15 --fail-on-regression
+"""
+
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import operator
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from importlib.metadata import version
+from typing import Annotated
+from typing_extensions import TypedDict
+
+from langchain_core.messages import AIMessage
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph import StateGraph, START, END, add_messages
+
+
+HISTORY_PATH = "bench_framework_history.jsonl"
+MODES = ("invoke", "batch", "stream")
+
+
+# ------------------------------------------------------
+#  Scenarios: (builder(checkpointer), input(i), nodes executed per run)
+# ------------------------------------------------------
+class CounterState(TypedDict):
+    n: int
+    payload: list
+
+
+class FanoutState(TypedDict):
+    n: int
+    results: Annotated[list, operator.add]
+
+
+class MessagesState(TypedDict):
+    messages: Annotated[list, add_messages]
+
+
+def edge_scenario(args):
+    os.environ.setdefault("GRAPH_RENDER", "off")   # importing the example must not render its picture
+    with contextlib.redirect_stdout(io.StringIO()):
+        builder = importlib.import_module("02_01_graph_with_edge").graph_builder
+    return builder.compile, lambda i: {"number": i}, 2
+
+
+def chain_scenario(args, payload_items: int = 0):
+    def step(state):
+        return {"n": state["n"] + 1}
+
+    builder = StateGraph(CounterState)
+    previous = START
+    for i in range(args.depth):
+        builder.add_node(f"step_{i}", step)
+        builder.add_edge(previous, f"step_{i}")
+        previous = f"step_{i}"
+    builder.add_edge(previous, END)
+    payload = [{"id": i, "text": "x" * 64} for i in range(payload_items)]
+    return builder.compile, lambda i: {"n": i, "payload": payload}, args.depth
+
+
+def fanout_scenario(args):
+    builder = StateGraph(FanoutState)
+    for i in range(args.width):
+        builder.add_node(f"branch_{i}", lambda state, i=i: {"results": [i]})
+        builder.add_edge(START, f"branch_{i}")
+    builder.add_node("join", lambda state: {"n": len(state["results"])})
+    builder.add_edge([f"branch_{i}" for i in range(args.width)], "join")
+    builder.add_edge("join", END)
+    return builder.compile, lambda i: {"n": 0, "results": []}, args.width + 1
+
+
+def loop_scenario(args):
+    builder = StateGraph(CounterState)
+    builder.add_node("tick", lambda state: {"n": state["n"] + 1})
+    builder.add_edge(START, "tick")
+    builder.add_conditional_edges("tick", lambda state: "tick" if state["n"] < args.loops else END, ["tick", END])
+    return builder.compile, lambda i: {"n": 0}, args.loops
+
+
+def messages_scenario(args):
+    builder = StateGraph(MessagesState)
+    previous = START
+    for i in range(args.depth):
+        builder.add_node(f"say_{i}", lambda state, i=i: {"messages": [AIMessage(content=f"step {i}")]})
+        builder.add_edge(previous, f"say_{i}")
+        previous = f"say_{i}"
+    builder.add_edge(previous, END)
+    return builder.compile, lambda i: {"messages": [{"role": "user", "content": f"run {i}"}]}, args.depth
+
+
+SCENARIOS = {
+    "edge": edge_scenario,
+    "chain": chain_scenario,
+    "fanout": fanout_scenario,
+    "loop": loop_scenario,
+    "payload": lambda args: chain_scenario(args, payload_items=args.payload_items),
+    "messages": messages_scenario,
+}
+
+
+def make_checkpointer(kind: str, workdir: str):
+    if kind == "none":
+        return None
+    if kind == "memory":
+        return InMemorySaver()
+    if kind == "sqlite":
+        from utils.checkpointer import DeltaSqliteSaver
+        return DeltaSqliteSaver(os.path.join(workdir, f"bench_{time.perf_counter_ns()}.db"))
+    raise ValueError(f"Unknown checkpointer: {kind}")
+
+
+# ------------------------------------------------------
+#  Measurement
+# ------------------------------------------------------
+class Runner:
+    """Runs one compiled graph in one mode; every run gets its own thread_id when checkpointing."""
+
+    def __init__(self, graph, make_input, mode: str, batch_size: int, checkpointed: bool, recursion_limit: int):
+        self.graph, self.make_input, self.mode = graph, make_input, mode
+        self.batch_size = batch_size if mode == "batch" else 1
+        self.checkpointed = checkpointed
+        self.recursion_limit = recursion_limit
+        self.count = 0
+
+    def _config(self) -> dict:
+        self.count += 1
+        config = {"recursion_limit": self.recursion_limit}
+        if self.checkpointed:
+            config["configurable"] = {"thread_id": f"run-{self.count}"}
+        return config
+
+    def run(self) -> None:
+        if self.mode == "invoke":
+            self.graph.invoke(self.make_input(self.count), self._config())
+        elif self.mode == "stream":
+            for _ in self.graph.stream(self.make_input(self.count), self._config(), stream_mode="updates"):
+                pass
+        else:
+            configs = [self._config() for _ in range(self.batch_size)]
+            self.graph.batch([self.make_input(i) for i in range(self.batch_size)], configs)
+
+
+def measure(runner: Runner, nodes: int, runs: int, repeats: int) -> dict:
+    with contextlib.redirect_stdout(io.StringIO()):   # the edge example prints from its nodes
+        for _ in range(3):
+            runner.run()   # warm-up
+        per_run = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            for _ in range(runs):
+                runner.run()
+            per_run.append((time.perf_counter() - start) / (runs * runner.batch_size))
+
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        for _ in range(runs):
+            runner.run()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    run_s = statistics.median(per_run)
+    return {
+        "us_per_node": round(run_s / nodes * 1e6, 2),
+        "us_per_run": round(run_s * 1e6, 1),
+        "peak_kb_per_run": round((peak - before) / 1024, 1),
+        "retained_kb_per_run": round((current - before) / 1024 / (runs * runner.batch_size), 2),
+    }
+
+
+# ------------------------------------------------------
+#  History and regressions
+# ------------------------------------------------------
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def last_record(path: str):
+    try:
+        with open(path) as f:
+            lines = [line for line in f if line.strip()]
+    except OSError:
+        return None
+    return json.loads(lines[-1]) if lines else None
+
+
+def regressions(current: dict, previous: dict, threshold: float) -> list:
+    found = []
+    for case, row in current.items():
+        before = previous.get(case)
+        if before and before["us_per_node"] > 0:
+            change = row["us_per_node"] / before["us_per_node"] - 1
+            if change > threshold:
+                found.append((case, before["us_per_node"], row["us_per_node"], change))
+    return found
+
+
+def main(args) -> int:
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for scenario in args.scenarios:
+            for checkpointer_kind in args.checkpointers:
+                for mode in args.modes:
+                    compile_graph, make_input, nodes = SCENARIOS[scenario](args)
+                    checkpointer = make_checkpointer(checkpointer_kind, workdir)
+                    graph = compile_graph(checkpointer=checkpointer)
+                    runner = Runner(graph, make_input, mode, args.batch_size, checkpointer is not None,
+                                    recursion_limit=max(25, nodes + 10))
+                    results[f"{scenario}/{mode}/{checkpointer_kind}"] = {
+                        "nodes": nodes, **measure(runner, nodes, args.runs, args.repeats)
+                    }
+                    if hasattr(checkpointer, "close"):
+                        checkpointer.close()
+
+    previous = last_record(args.history) if args.compare else None
+    print("-----------------------------------------")
+    print(f"LangGraph {version('langgraph')}, Python {platform.python_version()} "
+          f"(chain depth {args.depth}, fan-out width {args.width}, loop {args.loops}, batch {args.batch_size})")
+    print(f"{'case':<30}{'nodes':>6}{'µs/node':>10}{'µs/run':>11}{'peak KB':>9}{'kept KB':>9}"
+          + (f"{'vs last':>9}" if previous else ""))
+    for case, row in results.items():
+        line = (f"{case:<30}{row['nodes']:>6}{row['us_per_node']:>10.1f}{row['us_per_run']:>11.1f}"
+                f"{row['peak_kb_per_run']:>9.1f}{row['retained_kb_per_run']:>9.2f}")
+        if previous and case in previous["results"]:
+            line += f"{row['us_per_node'] / previous['results'][case]['us_per_node'] - 1:>+9.0%}"
+        print(line)
+
+    # State-copy cost: what the unused payload adds to every node of the chain
+    for mode in args.modes:
+        for kind in args.checkpointers:
+            small, large = results.get(f"chain/{mode}/{kind}"), results.get(f"payload/{mode}/{kind}")
+            if small and large:
+                print(f"state copy ({args.payload_items} items) {mode}/{kind}: "
+                      f"{large['us_per_node'] - small['us_per_node']:+.1f} µs/node")
+    print("-----------------------------------------")
+
+    record = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "langgraph": version("langgraph"),
+        "langchain_core": version("langchain-core"),
+        "settings": {k: getattr(args, k) for k in ("depth", "width", "loops", "payload_items", "batch_size", "runs")},
+        "results": results,
+    }
+    status = 0
+    if previous:
+        if previous.get("settings") != record["settings"]:
+            print(f"Note: settings differ from the last run ({previous['timestamp']}), comparison is approximate")
+        found = regressions(results, previous["results"], args.threshold)
+        if found:
+            print(f"Regressions (> {args.threshold:.0%} slower per node than {previous['timestamp']}, "
+                  f"commit {previous.get('commit')}):")
+            for case, before, after, change in found:
+                print(f"  {case:<30}{before:>8.1f} -> {after:>8.1f} µs/node ({change:+.0%})")
+            status = 1 if args.fail_on_regression else 0
+        else:
+            print(f"No regressions against {previous['timestamp']}")
+    if args.history:
+        with open(args.history, "a") as f:
+            f.write(json.dumps(record) + "\n")
+        print(f"Results appended to {args.history}")
+    return status
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-node LangGraph framework overhead")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--checkpointers", nargs="+", choices=["none", "memory", "sqlite"], default=["none", "memory"])
+    parser.add_argument("--depth", type=int, default=20, help="Nodes in the chain/payload/messages graphs")
+    parser.add_argument("--width", type=int, default=10, help="Parallel branches in the fan-out graph")
+    parser.add_argument("--loops", type=int, default=20, help="Iterations of the loop graph")
+    parser.add_argument("--payload-items", type=int, default=1000, help="Size of the untouched state value")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--runs", type=int, default=20, help="Runs per timing repeat")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--history", default=HISTORY_PATH, help="JSONL file results are appended to ('' to skip)")
+    parser.add_argument("--compare", action="store_true", help="Compare with the last record in --history")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Slowdown that counts as a regression")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,146 @@
+"""
+bench_graph_server.py
+
+Load test of graph_server.py with the fake streaming chat model (no API keys).
+
+Starts the server in-process on a free port, then C simulated users each send T turns over the
+SSE endpoint, one after another, as a chat UI would. Users are spread over the thread_ids so that
+some threads get concurrent turns from several users (they must run one after another, not race).
+Reports turns/sec, end-to-end latency and time-to-first-token percentiles (as the client sees them),
+rejected/timed-out turns, and checks that no thread's turns interleaved.
+
+Client and server share one process here, and each turn costs a few ms of CPU, so at a few
+hundred users the numbers measure Python's CPU rather than the server's scheduling.
+
+Usage (from the 06_LangGraph folder):
+    $ python -m benchmarks.bench_graph_server
+    $ python -m benchmarks.bench_graph_server --users 500 --turns 3 --max-concurrency 64 --max-queue 200
+
+Requires: fastapi, uvicorn, httpx
+"""
+
+import argparse
+import asyncio
+import json
+import socket
+import threading
+import time
+
+import httpx
+import uvicorn
+
+from graph_server import TurnScheduler, build_fake_graph, create_app
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(app, port: int) -> uvicorn.Server:
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", timeout_keep_alive=60))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def percentile(values: list, p: float) -> float:
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+
+async def one_turn(client: httpx.AsyncClient, thread_id: str, message: str) -> dict:
+    start = time.perf_counter()
+    first_token = None
+    try:
+        async with client.stream("POST", f"/threads/{thread_id}/runs/stream", json={"message": message}) as response:
+            if response.status_code != 200:
+                await response.aread()
+                return {"status": response.status_code}
+            event = None
+            async for line in response.aiter_lines():
+                if line.startswith("event: "):
+                    event = line[7:]
+                elif line.startswith("data: "):
+                    if event == "token" and first_token is None:
+                        first_token = time.perf_counter() - start
+                    elif event == "error":
+                        return {"status": json.loads(line[6:])["status"]}
+    except httpx.HTTPError as e:
+        return {"status": type(e).__name__}
+    return {"status": 200, "latency": time.perf_counter() - start, "ttft": first_token}
+
+
+async def user(client: httpx.AsyncClient, user_id: int, thread_id: str, turns: int, results: list) -> None:
+    for turn in range(turns):
+        results.append(await one_turn(client, thread_id, f"user {user_id} turn {turn}"))
+
+
+async def load(port: int, args) -> tuple:
+    results = []
+    limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=120) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            user(client, u, f"thread-{u % args.threads}", args.turns, results) for u in range(args.users)
+        ))
+        elapsed = time.perf_counter() - start
+        health = (await client.get("/health")).json()
+    return results, elapsed, health
+
+
+def main(args) -> None:
+    graph = build_fake_graph(args.first_token_delay, args.token_delay, args.answer_words)
+    scheduler = TurnScheduler(args.max_concurrency, args.max_queue, args.queue_timeout)
+    port = free_port()
+    server = start_server(create_app(graph, scheduler), port)
+    try:
+        results, elapsed, health = asyncio.run(load(port, args))
+    finally:
+        server.should_exit = True
+
+    ok = [r for r in results if r["status"] == 200]
+    latencies = [r["latency"] * 1000 for r in ok]
+    ttfts = [r["ttft"] * 1000 for r in ok if r["ttft"] is not None]
+    by_status = {}
+    for r in results:
+        by_status[str(r["status"])] = by_status.get(str(r["status"]), 0) + 1
+
+    # Turns of one thread run one after another, so its messages alternate user, assistant, user, ...
+    interleaved = 0
+    for thread_id in {f"thread-{u % args.threads}" for u in range(args.users)}:
+        messages = graph.get_state({"configurable": {"thread_id": thread_id}}).values.get("messages", [])
+        interleaved += any(m.type != ("human" if i % 2 == 0 else "ai") for i, m in enumerate(messages))
+
+    ideal_ms = (args.first_token_delay + args.token_delay * args.answer_words) * 1000
+    print("-----------------------------------------")
+    print(f"{args.users} users x {args.turns} turns over {args.threads} threads; "
+          f"max concurrency {args.max_concurrency}, max queue {args.max_queue}")
+    print(f"fake model: first token {args.first_token_delay * 1000:.0f} ms, "
+          f"{args.answer_words} tokens, one turn ~{ideal_ms:.0f} ms")
+    print(f"turns/sec:        {len(ok) / elapsed:>9.1f}   ({len(ok)} ok in {elapsed:.1f}s)")
+    print(f"latency ms:       p50 {percentile(latencies, 50):>7.0f}   p99 {percentile(latencies, 99):>7.0f}"
+          f"   max {max(latencies, default=float('nan')):>7.0f}")
+    print(f"first token ms:   p50 {percentile(ttfts, 50):>7.0f}   p99 {percentile(ttfts, 99):>7.0f}")
+    print(f"responses:        {dict(sorted(by_status.items()))}")
+    print(f"server:           {health}")
+    print(f"threads with interleaved turns: {interleaved}")
+    print("-----------------------------------------")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test of graph_server.py with a fake chat model")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--threads", type=int, default=75, help="Distinct thread_ids the users are spread over")
+    parser.add_argument("--max-concurrency", type=int, default=64)
+    parser.add_argument("--max-queue", type=int, default=256)
+    parser.add_argument("--queue-timeout", type=float, default=30.0)
+    parser.add_argument("--first-token-delay", type=float, default=0.2)
+    parser.add_argument("--token-delay", type=float, default=0.01)
+    parser.add_argument("--answer-words", type=int, default=30)
+    main(parser.parse_args())
@@ -0,0 +1,132 @@
+"""
+bench_interrupt_queue.py
+
+Finding and resuming paused human-in-the-loop threads: InterruptQueue against scanning checkpoints.
+
+N threads of a small chat graph (a few KB of messages each) are paused at an `interrupt(...)`,
+with state in a DeltaSqliteSaver file. Then, as a separate worker process would after a restart
+(fresh saver and queue objects):
+    - scan:  find the paused threads by loading every thread's state (`graph.get_state`)
+    - queue: `InterruptQueue.list()` of the oldest waiting threads, and `count()`
+    - resume: `InterruptQueue.resume()` of random threads, end to end (claim, load one checkpoint, run)
+with the time and the memory (tracemalloc peak) each takes.
+
+Usage (from the 06_LangGraph folder):
+    $ python -m benchmarks.bench_interrupt_queue
+    $ python -m benchmarks.bench_interrupt_queue --threads 5000 --resumes 100
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+from typing import Annotated
+from typing_extensions import TypedDict
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph import StateGraph, START, END, add_messages
+from langgraph.types import interrupt
+
+from utils.checkpointer import DeltaSqliteSaver
+from utils.interrupt_queue import InterruptQueue
+
+
+class State(TypedDict):
+    messages: Annotated[list, add_messages]
+
+
+def history(thread: int, turns: int) -> list:
+    messages = []
+    for turn in range(turns):
+        messages.append(HumanMessage(content=f"Thread {thread}, question {turn}: " + "context " * 40))
+        messages.append(AIMessage(content=f"Answer {turn}: " + "details " * 60))
+    return messages
+
+
+def ask_human(state: State):
+    answer = interrupt({"query": f"Please review: {state['messages'][-1].content[:40]}"})
+    return {"messages": [AIMessage(content=f"The expert says: {answer['data']}")]}
+
+
+def build_graph(checkpointer):
+    builder = StateGraph(State)
+    builder.add_node("ask_human", ask_human)
+    builder.add_edge(START, "ask_human")
+    builder.add_edge("ask_human", END)
+    return builder.compile(checkpointer=checkpointer)
+
+
+def timed(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed * 1000, peak / 2**20
+
+
+def main(args) -> None:
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "checkpoints.db")
+
+        # Pause N threads (the "web" process)
+        saver = DeltaSqliteSaver(path)
+        queue = InterruptQueue(path)
+        graph = build_graph(saver)
+        start = time.perf_counter()
+        for thread in range(args.threads):
+            config = {"configurable": {"thread_id": f"thread-{thread}"}}
+            for _ in queue.stream(graph, {"messages": history(thread, args.turns)}, config):
+                pass
+        pause_ms = (time.perf_counter() - start) * 1000 / args.threads
+        saver.close()
+        queue.close()
+
+        # A worker process starting fresh
+        saver = DeltaSqliteSaver(path)
+        queue = InterruptQueue(path)
+        graph = build_graph(saver)
+
+        def scan():
+            waiting = []
+            for thread in range(args.threads):
+                state = graph.get_state({"configurable": {"thread_id": f"thread-{thread}"}})
+                if state.interrupts:
+                    waiting.append(thread)
+            return waiting
+
+        scanned, scan_ms, scan_mb = timed(scan)
+        listed, list_ms, list_mb = timed(lambda: queue.list(limit=20))
+        count, count_ms, _ = timed(queue.count)
+        assert len(scanned) == count == args.threads and len(listed) == 20
+
+        resume_ms, resume_mb = [], []
+        for thread in random.Random(0).sample(range(args.threads), args.resumes):
+            events, ms, mb = timed(lambda: list(queue.resume(graph, f"thread-{thread}", {"data": "approved"})))
+            resume_ms.append(ms)
+            resume_mb.append(mb)
+        assert queue.count() == args.threads - args.resumes
+        db_mb = sum(os.path.getsize(p) for p in (path, f"{path}-wal") if os.path.exists(p)) / 2**20
+
+    print("-----------------------------------------")
+    print(f"{args.threads:,} paused threads, {args.turns * 2} messages each ({db_mb:.0f} MB database), "
+          f"{pause_ms:.2f} ms per pause")
+    print(f"{'operation':<34}{'ms':>10}{'peak MB':>10}")
+    print(f"{'scan all threads (get_state)':<34}{scan_ms:>10.1f}{scan_mb:>10.1f}")
+    print(f"{'queue.list(limit=20)':<34}{list_ms:>10.2f}{list_mb:>10.2f}")
+    print(f"{'queue.count()':<34}{count_ms:>10.2f}")
+    print(f"{'queue.resume() p50':<34}{statistics.median(resume_ms):>10.2f}{statistics.median(resume_mb):>10.2f}")
+    print(f"{'queue.resume() max':<34}{max(resume_ms):>10.2f}{max(resume_mb):>10.2f}")
+    print("-----------------------------------------")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Listing and resuming paused threads")
+    parser.add_argument("--threads", type=int, default=2000)
+    parser.add_argument("--turns", type=int, default=5, help="Question/answer pairs in each thread's history")
+    parser.add_argument("--resumes", type=int, default=50)
+    main(parser.parse_args())
@@ -0,0 +1,89 @@
+"""
+bench_message_policy.py
+
+How prompt size grows over a long session, with and without a message policy.
+
+Simulates a 100-turn chat where every turn searches once (a ~6 KB TavilySearch-like result) and
+answers. At every LLM call (two per turn: deciding to search, then answering) it counts the tokens
+the chatbot node would send, for:
+    - add_messages:           the whole history, as the graphs do today
+    - evict (keep N turns):   MessagePolicy(keep_turns=N), older tool outputs stubbed
+    - evict + ceiling:        MessagePolicy(keep_turns=N, max_tokens=M), oldest turns dropped above M
+    - evicting reducer:       evicting_add_messages(N) as the state reducer (stored state is stubbed too)
+
+Usage (from the 06_LangGraph folder):
+    $ python -m benchmarks.bench_message_policy
+    $ python -m benchmarks.bench_message_policy --turns 200 --keep-turns 2 --max-tokens 6000
+"""
+
+import argparse
+import random
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from langgraph.graph.message import add_messages
+
+from utils.message_policy import MessagePolicy, count_tokens, evicting_add_messages
+
+
+WORDS = "agent graph state memory search result langgraph python token model tool node checkpoint".split()
+
+
+def text(words: int) -> str:
+    return " ".join(random.choices(WORDS, k=words))
+
+
+def turn_messages(turn: int) -> tuple:
+    """The messages of one turn, in the order the graph appends them."""
+    call_id = f"call_{turn}"
+    question = HumanMessage(content=f"Question {turn}: {text(20)}?")
+    tool_call = AIMessage(content="", tool_calls=[{"name": "tavily_search", "args": {"query": text(6)}, "id": call_id}])
+    result = ToolMessage(content=text(900), name="tavily_search", tool_call_id=call_id)
+    answer = AIMessage(content=text(120))
+    return [question], [tool_call, result], [answer]
+
+
+def simulate(turns: int, reducer, prepare) -> list:
+    """Prompt tokens of every LLM call in the session."""
+    state = reducer([], [SystemMessage(content="You are a helpful assistant.")])
+    prompt_tokens = []
+    for turn in range(turns):
+        question, tool_step, answer = turn_messages(turn)
+        state = reducer(state, question)
+        prompt_tokens.append(sum(count_tokens(m) for m in prepare(state)))   # LLM decides to search
+        state = reducer(state, tool_step)
+        prompt_tokens.append(sum(count_tokens(m) for m in prepare(state)))   # LLM answers
+        state = reducer(state, answer)
+    return prompt_tokens
+
+
+def main(args) -> None:
+    strategies = {
+        "add_messages": (add_messages, lambda messages: messages),
+        f"evict (keep {args.keep_turns})": (add_messages, MessagePolicy(keep_turns=args.keep_turns)),
+        f"evict + {args.max_tokens} ceiling": (
+            add_messages, MessagePolicy(keep_turns=args.keep_turns, max_tokens=args.max_tokens)
+        ),
+        "evicting reducer": (evicting_add_messages(args.keep_turns), lambda messages: messages),
+    }
+    results = {}
+    for name, (reducer, prepare) in strategies.items():
+        random.seed(0)
+        results[name] = simulate(args.turns, reducer, prepare)
+
+    checkpoints = sorted({t for t in (1, 5, 10, 25, 50, 75, 100, args.turns) if t <= args.turns})
+    print("-----------------------------------------")
+    print(f"Prompt tokens of the answering LLM call, by turn ({args.turns}-turn session, one ~900-word search result per turn)")
+    print(f"{'strategy':<24}" + "".join(f"{f'turn {t}':>11}" for t in checkpoints) + f"{'session total':>15}{'vs full':>9}")
+    baseline = sum(results["add_messages"])
+    for name, tokens in results.items():
+        row = "".join(f"{tokens[2 * t - 1]:>11,}" for t in checkpoints)
+        print(f"{name:<24}{row}{sum(tokens):>15,}{sum(tokens) / baseline:>8.0%}")
+    print("-----------------------------------------")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prompt growth with and without stale tool-output eviction")
+    parser.add_argument("--turns", type=int, default=100)
+    parser.add_argument("--keep-turns", type=int, default=3)
+    parser.add_argument("--max-tokens", type=int, default=8000)
+    main(parser.parse_args())
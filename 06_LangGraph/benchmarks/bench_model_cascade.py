@@ -0,0 +1,96 @@
+"""
+bench_model_cascade.py
+
+Compares a small->large model cascade against always using the large model.
+
+For the same prompt set (easy lookups mixed with harder reasoning questions) it reports
+average latency, total cost and, for the cascade, how often it escalated.
+
+Usage (from the 06_LangGraph folder):
+    $ python -m benchmarks.bench_model_cascade
+    $ python -m benchmarks.bench_model_cascade --small openai:gpt-4.1-nano --large openai:gpt-4.1 --repeat 3
+
+Environment Variables Required:
+- `OPENAI_API_KEY`
+"""
+
+import argparse
+import statistics
+import time
+
+from langchain.chat_models import init_chat_model
+
+from utils.model_cascade import CascadeChatModel, PRICES, model_name
+
+
+PROMPTS = [
+    "What is the capital of Japan?",
+    "Translate 'How are you today?' into French.",
+    "Classify the sentiment: 'I absolutely love the new design of your website!'",
+    "What is 17 * 23?",
+    "Extract the names from: 'Alice and Bob are meeting Charlie at the park tomorrow.'",
+    "Summarize in one sentence: LangGraph lets you build stateful, multi-actor applications with LLMs.",
+    "Compare optimistic and pessimistic locking step by step, and say when each one is the better choice.",
+    "Design a schema for a multi-tenant todo app and analyze how it handles tenant isolation.",
+]
+
+
+def cost_of(message, name: str) -> float:
+    usage = getattr(message, "usage_metadata", None) or {}
+    price_in, price_out = PRICES.get(name, (0.0, 0.0))
+    return (usage.get("input_tokens", 0) * price_in + usage.get("output_tokens", 0) * price_out) / 1e6
+
+
+def run_large_only(llm, prompts: list) -> dict:
+    name = model_name(llm)
+    latencies, cost = [], 0.0
+    for prompt in prompts:
+        start = time.perf_counter()
+        message = llm.invoke(prompt)
+        latencies.append((time.perf_counter() - start) * 1000)
+        cost += cost_of(message, name)
+    return {"avg_latency_ms": statistics.fmean(latencies), "cost_usd": cost}
+
+
+def run_cascade(cascade: CascadeChatModel, prompts: list) -> dict:
+    latencies = []
+    for prompt in prompts:
+        start = time.perf_counter()
+        cascade.invoke(prompt)
+        latencies.append((time.perf_counter() - start) * 1000)
+    report = cascade.report()
+    cost = sum(row["cost_usd"] for row in report["per_model"].values())
+    return {
+        "avg_latency_ms": statistics.fmean(latencies),
+        "cost_usd": cost,
+        "escalation_rate": report["escalation_rate"],
+        "per_model": report["per_model"],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Model cascade vs large-model-only benchmark")
+    parser.add_argument("--small", default="openai:gpt-4.1-mini")
+    parser.add_argument("--large", default="openai:gpt-4.1")
+    parser.add_argument("--repeat", type=int, default=1, help="Run the prompt set this many times")
+    args = parser.parse_args()
+
+    prompts = PROMPTS * args.repeat
+    # The small model returns token probabilities (OpenAI only), so the confidence check applies to it
+    small_kwargs = {"logprobs": True} if args.small.startswith("openai:") else {}
+    small, large = init_chat_model(args.small, **small_kwargs), init_chat_model(args.large)
+
+    baseline = run_large_only(large, prompts)
+    cascaded = run_cascade(CascadeChatModel(tiers=[small, large]), prompts)
+
+    print("-----------------------------------------")
+    print(f"Prompts: {len(prompts)}")
+    print(f"Large only ({args.large}): avg {baseline['avg_latency_ms']:.0f} ms, cost ${baseline['cost_usd']:.5f}")
+    print(f"Cascade ({args.small} -> {args.large}): avg {cascaded['avg_latency_ms']:.0f} ms, "
+          f"cost ${cascaded['cost_usd']:.5f}, escalation rate {cascaded['escalation_rate']:.0%}")
+    for name, row in cascaded["per_model"].items():
+        print(f"  {name}: {row['calls']} calls, {row['accepted']} answers, ${row['cost_usd']:.5f}")
+    if baseline["cost_usd"]:
+        print(f"Cost saved: {1 - cascaded['cost_usd'] / baseline['cost_usd']:.0%}")
+    print(f"Latency change: {cascaded['avg_latency_ms'] - baseline['avg_latency_ms']:+.0f} ms per request")
+    print("-----------------------------------------")
@@ -0,0 +1,167 @@
+"""
+bench_startup.py
+
+How long each entry point of the repo takes to start, and which imports that time goes to.
+
+Every script is run in a fresh interpreter (`python -X importtime`) in a temporary directory:
+    - chat scripts run as `__main__` until their first `input()` prompt (the moment a user can type)
+    - servers and libraries are only imported (they would otherwise start serving)
+API keys are set to placeholders and OPENAI_BASE_URL points at a closed local port, so nothing
+reaches the network; a script that calls an API before its first prompt shows the error instead.
+
+Reported per entry point (median of --repeat runs, after one warm-up run that compiles .pyc files):
+    startup ms  - process start to first prompt / end of import, as the parent process sees it
+    imports ms  - time spent importing modules (from -X importtime)
+    the top-level packages that took longest to import
+
+Usage (from the 06_LangGraph folder):
+    $ python -m benchmarks.bench_startup
+    $ python -m benchmarks.bench_startup --only 06_LangGraph --repeat 5 --top 10
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+
+REPO = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+# (path from the repo root [and arguments], "prompt" = run until the first input() or the end, "import" = import only)
+ENTRY_POINTS = [
+    ("01_LLM_Basics/code/chatbot_openai.py", "prompt"),
+    ("02_RAG/code/rag_based_chatbot.py", "prompt"),
+    ("03_LangChain/code/basic_101.py", "prompt"),
+    ("04_AgenticAI/code/agentic_ai_tools.py", "prompt"),
+    ("04_AgenticAI/code/agent_server.py", "import"),
+    ("05_MCP/client.py", "import"),
+    ("06_LangGraph/01_graph_simple.py", "prompt"),
+    ("06_LangGraph/02_01_graph_with_edge.py", "prompt"),
+    ("06_LangGraph/02_02_graph_with_tool.py", "prompt"),
+    ("06_LangGraph/03_graph_with_memory.py", "prompt"),
+    ("06_LangGraph/04_human_in_loop.py --list", "prompt"),
+    ("06_LangGraph/graph_server.py", "import"),
+    ("projects/mcp_server/app.py", "import"),
+]
+
+# Runs in the child: stop at the first input() and report how long the script took to get there
+CHILD = """
+import builtins, json, os, runpy, sys, time
+start = time.perf_counter()
+script, kind, out = sys.argv[1:4]
+script_args = sys.argv[4:]
+
+def done(status):
+    with open(out, "w") as f:
+        json.dump({"script_ms": (time.perf_counter() - start) * 1000, "status": status}, f)
+    os._exit(0)   # exit right here: the scripts' `except:` fallbacks would otherwise call the LLM
+
+builtins.input = lambda *args, **kwargs: done("ok")
+sys.argv = [script, *script_args]
+sys.path.insert(0, os.path.dirname(script))
+try:
+    runpy.run_path(script, run_name="__main__" if kind == "prompt" else "startup_bench")
+except BaseException as e:
+    done(f"{type(e).__name__}: {str(e).splitlines()[0] if str(e) else ''}"[:70])
+done("ok")
+"""
+
+
+def parse_importtime(stderr: str) -> tuple:
+    """(total import ms, {top-level package: cumulative ms}) from `-X importtime` output."""
+    packages = {}
+    total_us = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        if name.startswith("  "):
+            continue   # imported by another module: already inside its parent's cumulative time
+        package = name.strip().split(".")[0]
+        packages[package] = packages.get(package, 0) + int(cumulative) / 1000
+        total_us += int(cumulative)
+    return total_us / 1000, packages
+
+
+def run_once(path: str, kind: str) -> dict:
+    script, *script_args = path.split()
+    script = os.path.join(REPO, script)
+    env = {
+        **os.environ,
+        "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY", "sk-startup-bench"),
+        "TAVILY_API_KEY": os.environ.get("TAVILY_API_KEY", "tvly-startup-bench"),
+        "OPENAI_BASE_URL": "http://127.0.0.1:9/v1",
+        "PYTHONWARNINGS": "ignore",
+    }
+    with tempfile.TemporaryDirectory() as workdir:
+        out = os.path.join(workdir, "result.json")
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", CHILD, script, kind, out, *script_args],
+            cwd=workdir, env=env, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE, text=True, timeout=120,
+        )
+        wall_ms = (time.perf_counter() - start) * 1000
+        result = {"status": f"exit code {proc.returncode}"}
+        if os.path.exists(out):
+            with open(out) as f:
+                result = json.load(f)
+    imports_ms, packages = parse_importtime(proc.stderr)
+    return {**result, "startup_ms": wall_ms, "imports_ms": imports_ms, "packages": packages}
+
+
+def measure(path: str, kind: str, repeat: int) -> dict:
+    run_once(path, kind)   # warm-up: compiles .pyc files
+    runs = [run_once(path, kind) for _ in range(repeat)]
+    packages = {}
+    for run in runs:
+        for package, ms in run["packages"].items():
+            packages.setdefault(package, []).append(ms)
+    return {
+        "startup_ms": statistics.median(r["startup_ms"] for r in runs),
+        "imports_ms": statistics.median(r["imports_ms"] for r in runs),
+        "packages": {p: statistics.median(v) for p, v in packages.items()},
+        "status": runs[-1]["status"],
+    }
+
+
+def main(args) -> None:
+    entries = [(p, k) for p, k in ENTRY_POINTS if not args.only or any(o in p for o in args.only)]
+    baseline = measure_baseline(args.repeat)
+    print("-----------------------------------------")
+    print(f"python {sys.version.split()[0]}, bare interpreter start {baseline:.0f} ms, median of {args.repeat} runs")
+    print(f"{'entry point':<44}{'kind':<8}{'startup ms':>11}{'imports ms':>12}  status")
+    results = {}
+    for path, kind in entries:
+        result = results[path] = measure(path, kind, args.repeat)
+        print(f"{path:<44}{kind:<8}{result['startup_ms']:>11.0f}{result['imports_ms']:>12.0f}  {result['status']}")
+        slowest = sorted(result["packages"].items(), key=lambda item: -item[1])[:args.top]
+        print("    " + ", ".join(f"{p} {ms:.0f}" for p, ms in slowest if ms >= 1))
+    print("-----------------------------------------")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"python": sys.version.split()[0], "baseline_ms": baseline, "results": results}, f, indent=2)
+        print(f"Saved to {args.json}")
+
+
+def measure_baseline(repeat: int) -> float:
+    """Start-up of an interpreter that imports nothing: the floor under every entry point."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Start-up time and import breakdown of every entry point")
+    parser.add_argument("--only", nargs="*", help="Only entry points whose path contains one of these")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=6, help="Slowest top-level imports to list per entry point")
+    parser.add_argument("--json", help="Also save the results to this file")
+    main(parser.parse_args())
@@ -0,0 +1,84 @@
+"""
+bench_tool_node.py
+
+Latency of one BasicToolNode step when the LLM asks for several searches at once.
+
+The search tool is simulated (a sleep of 100-400 ms, like a web search round trip), so no API keys
+are needed. For each number of parallel tool calls it compares:
+    - sequential: one call after another (the old behaviour)      -> sum of the latencies
+    - threaded:   BasicToolNode.__call__ on its thread pool         -> ~ the slowest call
+    - async:      BasicToolNode.ainvoke on the event loop           -> ~ the slowest call
+
+Usage (from the 06_LangGraph folder):
+    $ python -m benchmarks.bench_tool_node
+    $ python -m benchmarks.bench_tool_node --calls 1 2 4 8 16 --max-workers 4
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from langchain_core.messages import AIMessage
+from langchain_core.tools import tool
+
+from utils.node_tools import BasicToolNode
+
+
+LATENCIES = {}
+
+
+@tool
+def search(query: str) -> str:
+    """Simulated web search."""
+    time.sleep(LATENCIES[query])
+    return f"results for {query}"
+
+
+@tool("search_async")
+async def search_async(query: str) -> str:
+    """Simulated web search (async)."""
+    await asyncio.sleep(LATENCIES[query])
+    return f"results for {query}"
+
+
+def tool_call_state(name: str, queries: list) -> dict:
+    tool_calls = [{"name": name, "args": {"query": q}, "id": f"call_{i}"} for i, q in enumerate(queries)]
+    return {"messages": [AIMessage(content="", tool_calls=tool_calls)]}
+
+
+def main(args) -> None:
+    random.seed(0)
+    print("-----------------------------------------")
+    print(f"Simulated searches of 100-400 ms, max_workers={args.max_workers}")
+    print(f"{'calls':>6}{'sum of calls ms':>17}{'sequential ms':>15}{'threaded ms':>13}{'async ms':>10}{'speedup':>9}")
+    for n in args.calls:
+        queries = [f"query {n}-{i}" for i in range(n)]
+        for q in queries:
+            LATENCIES[q] = random.uniform(0.1, 0.4)
+
+        timings = {}
+        for label, node_kwargs in (("sequential", {"sequential": True}), ("threaded", {})):
+            node = BasicToolNode([search], max_workers=args.max_workers, timeout=args.timeout, **node_kwargs)
+            start = time.perf_counter()
+            outputs = node(tool_call_state("search", queries))["messages"]
+            timings[label] = (time.perf_counter() - start) * 1000
+            assert [m.tool_call_id for m in outputs] == [f"call_{i}" for i in range(n)]
+
+        node = BasicToolNode([search_async], max_workers=args.max_workers, timeout=args.timeout)
+        start = time.perf_counter()
+        asyncio.run(node.ainvoke(tool_call_state("search_async", queries)))
+        timings["async"] = (time.perf_counter() - start) * 1000
+
+        total = sum(LATENCIES[q] for q in queries) * 1000
+        print(f"{n:>6}{total:>17.0f}{timings['sequential']:>15.0f}{timings['threaded']:>13.0f}{timings['async']:>10.0f}"
+              f"{timings['sequential'] / timings['threaded']:>8.1f}x")
+    print("-----------------------------------------")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent vs sequential tool execution")
+    parser.add_argument("--calls", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--max-workers", type=int, default=8)
+    parser.add_argument("--timeout", type=float, default=10.0, help="Per-tool timeout in seconds")
+    main(parser.parse_args())
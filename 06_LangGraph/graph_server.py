@@ -0,0 +1,339 @@
+"""
+graph_server.py
+
+Serves a compiled LangGraph graph over HTTP, for many conversations (thread_ids) at once.
+
+The examples in this folder run one conversation, `thread_id: "1"`, behind a blocking `input()`
+loop. This server runs the same graphs with `graph.astream` on an asyncio event loop:
+
+- POST /threads/{thread_id}/runs/stream   {"message": "..."}  -> Server-Sent Events:
+      event: token      data: {"text": "..."}                    LLM tokens as they are generated
+      event: tool_call  data: {"name": ..., "args": ...}         the LLM asked for a tool
+      event: tool       data: {"name": ..., "status": ..., "chars": ...}
+      event: interrupt  data: {"value": ...}                      the graph paused (human in the loop)
+      event: end        data: {"ttft_ms": ..., "total_ms": ..., "queued_ms": ...}
+- POST /threads/{thread_id}/runs          {"message": "..."}  -> {"answer": ..., "total_ms": ...}
+- GET  /health                                                -> running / queued turns and limits
+
+Concurrency:
+- Per-thread serialization: turns of the same thread_id run one after another (an asyncio.Lock
+  per thread), so two requests never race on the thread's checkpoint. Different threads run in parallel.
+- Global limit: at most --max-concurrency turns run at once; the rest wait in a queue.
+- Backpressure: when --max-queue turns are already waiting, new requests get 429 with Retry-After,
+  and a turn that waits longer than --queue-timeout seconds gets 503, instead of piling up.
+- The SSE response is produced as the graph streams; a client that disconnects cancels its run.
+
+Usage:
+    $ python graph_server.py                                   # 03_graph_with_memory.py's graph
+    $ python graph_server.py --graph 02_02_graph_with_tool:graph --port 8100
+    $ python graph_server.py --fake --token-delay 0.02         # fake chat model, no API keys
+    $ curl -N -X POST localhost:8100/threads/42/runs/stream -H 'content-type: application/json' \\
+          -d '{"message": "What is LangGraph?"}'
+
+Load test against the fake model: python -m benchmarks.bench_graph_server
+
+Requires: fastapi, uvicorn
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import time
+from contextlib import aclosing
+from typing import Annotated, Any
+from typing_extensions import TypedDict
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph import StateGraph, START, END, add_messages
+from pydantic import BaseModel
+
+
+# ------------------------------------------------------
+#  Step 1: A fake chat model for load tests (no API keys)
+# ------------------------------------------------------
+class FakeStreamingChatModel(BaseChatModel):
+    """Answers every message with `answer_words` words, one token every `token_delay` seconds."""
+
+    answer_words: int = 30
+    first_token_delay: float = 0.2
+    token_delay: float = 0.01
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-streaming"
+
+    def _answer(self, messages: list) -> list:
+        question = messages[-1].content if messages else ""
+        words = f"You said: {question}. Here is a made-up answer".split()
+        words += ["lorem"] * max(0, self.answer_words - len(words))
+        return [w + " " for w in words[: self.answer_words]]
+
+    def _generate(self, messages: list, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        time.sleep(self.first_token_delay + self.token_delay * self.answer_words)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="".join(self._answer(messages))))])
+
+    async def _astream(self, messages: list, stop=None, run_manager=None, **kwargs: Any):
+        await asyncio.sleep(self.first_token_delay)
+        for token in self._answer(messages):
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                await run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+            await asyncio.sleep(self.token_delay)
+
+
+class ChatState(TypedDict):
+    messages: Annotated[list, add_messages]
+
+
+def build_fake_graph(first_token_delay: float = 0.2, token_delay: float = 0.01, answer_words: int = 30,
+                     checkpointer=None):
+    """START -> chatbot -> END, with FakeStreamingChatModel and (by default) an InMemorySaver."""
+    llm = FakeStreamingChatModel(first_token_delay=first_token_delay, token_delay=token_delay,
+                                 answer_words=answer_words)
+
+    async def chatbot(state: ChatState):
+        return {"messages": [await llm.ainvoke(state["messages"])]}
+
+    builder = StateGraph(ChatState)
+    builder.add_node("chatbot", chatbot)
+    builder.add_edge(START, "chatbot")
+    builder.add_edge("chatbot", END)
+    return builder.compile(checkpointer=checkpointer if checkpointer is not None else InMemorySaver())
+
+
+def load_graph(spec: str):
+    """Import "module:attribute", e.g. "03_graph_with_memory:graph" (the module builds the graph on import)."""
+    module_name, _, attribute = spec.partition(":")
+    return getattr(importlib.import_module(module_name), attribute or "graph")
+
+
+# ------------------------------------------------------
+#  Step 2: Admission control - per-thread locks, global limit, bounded queue
+# ------------------------------------------------------
+class Overloaded(Exception):
+    """Raised when the queue is full (429) or a turn waited too long for a slot (503)."""
+
+    def __init__(self, status_code: int, detail: str) -> None:
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class TurnScheduler:
+    """
+    Lets a turn run when its thread is idle and a global slot is free.
+
+    Args:
+        max_concurrency (int): Turns running at the same time.
+        max_queue (int): Turns allowed to wait; beyond that, requests are rejected right away.
+        queue_timeout (float): Seconds a turn may wait before it is given up.
+    """
+
+    def __init__(self, max_concurrency: int = 32, max_queue: int = 256, queue_timeout: float = 30.0) -> None:
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.slots = asyncio.Semaphore(max_concurrency)
+        self.thread_locks = {}   # thread_id -> [asyncio.Lock, number of turns using it]
+        self.running = 0
+        self.waiting = 0
+        self.stats = {"completed": 0, "rejected": 0, "timed_out": 0, "failed": 0}
+
+    def admit(self) -> None:
+        """Fail fast (before any response is started) when the queue is full."""
+        if self.waiting >= self.max_queue:
+            self.stats["rejected"] += 1
+            raise Overloaded(429, f"Server busy: {self.waiting} turns already waiting")
+
+    async def _acquire(self, thread_id: str):
+        entry = self.thread_locks.setdefault(thread_id, [asyncio.Lock(), 0])
+        entry[1] += 1
+        try:
+            # Thread lock first: a turn waiting behind its own thread must not hold a global slot
+            await entry[0].acquire()
+            try:
+                await self.slots.acquire()
+            except BaseException:
+                entry[0].release()
+                raise
+        except BaseException:
+            self._drop(thread_id, entry)
+            raise
+        return entry
+
+    def _drop(self, thread_id: str, entry: list) -> None:
+        entry[1] -= 1
+        if entry[1] == 0:
+            del self.thread_locks[thread_id]   # idle threads don't keep a lock around
+
+    async def run(self, thread_id: str, turn):
+        """Run the async generator `turn()` once the thread and a slot are available; yields its items."""
+        self.admit()
+        queued_at = time.perf_counter()
+        self.waiting += 1
+        try:
+            entry = await asyncio.wait_for(self._acquire(thread_id), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.stats["timed_out"] += 1
+            raise Overloaded(503, f"Waited more than {self.queue_timeout}s for a free slot")
+        finally:
+            self.waiting -= 1
+        self.running += 1
+        try:
+            # aclosing: a consumer that stops early (client gone) closes the graph's stream right away
+            async with aclosing(turn((time.perf_counter() - queued_at) * 1000)) as items:
+                async for item in items:
+                    yield item
+            self.stats["completed"] += 1
+        except Exception:
+            self.stats["failed"] += 1
+            raise
+        finally:
+            self.running -= 1
+            self.slots.release()
+            entry[0].release()
+            self._drop(thread_id, entry)
+
+
+# ------------------------------------------------------
+#  Step 3: One chat turn as a stream of events
+# ------------------------------------------------------
+async def turn_events(graph, thread_id: str, message: str, queued_ms: float):
+    """(event, data) pairs for one turn: tokens, tool calls/results, interrupts, and the timings at the end."""
+    config = {"configurable": {"thread_id": thread_id}}
+    start = time.perf_counter()
+    first_token = None
+    answer = []
+    inputs = {"messages": [{"role": "user", "content": message}]}
+    async for mode, payload in graph.astream(inputs, config, stream_mode=["messages", "updates"]):
+        if mode == "messages":
+            chunk, metadata = payload
+            if isinstance(chunk, ToolMessage) or chunk.type not in ("ai", "AIMessageChunk"):
+                continue
+            text = chunk.content if isinstance(chunk.content, str) else ""
+            if text:
+                if first_token is None:
+                    first_token = (time.perf_counter() - start) * 1000
+                answer.append(text)
+                yield "token", {"text": text, "node": metadata.get("langgraph_node")}
+            continue
+        for node, update in payload.items():
+            if node == "__interrupt__":
+                for item in update:
+                    yield "interrupt", {"value": item.value}
+                continue
+            for item in (update or {}).get("messages", []) if isinstance(update, dict) else []:
+                if isinstance(item, ToolMessage):
+                    yield "tool", {"name": item.name, "status": item.status, "chars": len(str(item.content))}
+                elif isinstance(item, AIMessage):
+                    for call in item.tool_calls:
+                        answer.clear()   # what came before a tool call isn't the final answer
+                        yield "tool_call", {"name": call["name"], "args": call["args"]}
+    yield "end", {
+        "answer": "".join(answer),
+        "ttft_ms": round(first_token, 1) if first_token is not None else None,
+        "total_ms": round((time.perf_counter() - start) * 1000, 1),
+        "queued_ms": round(queued_ms, 1),
+    }
+
+
+def sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+# ------------------------------------------------------
+#  Step 4: HTTP API
+# ------------------------------------------------------
+class TurnRequest(BaseModel):
+    message: str
+
+
+def create_app(graph, scheduler: TurnScheduler = None) -> FastAPI:
+    scheduler = scheduler or TurnScheduler()
+    app = FastAPI(title="LangGraph graph server")
+    app.state.scheduler = scheduler
+
+    @app.exception_handler(Overloaded)
+    async def overloaded(request: Request, exc: Overloaded):
+        return JSONResponse({"detail": exc.detail}, status_code=exc.status_code, headers={"Retry-After": "1"})
+
+    @app.post("/threads/{thread_id}/runs/stream")
+    async def stream_turn(thread_id: str, body: TurnRequest, request: Request):
+        scheduler.admit()   # 429 now, while a status code can still be sent
+
+        async def events():
+            turn = scheduler.run(thread_id, lambda queued_ms: turn_events(graph, thread_id, body.message, queued_ms))
+            last_check = 0.0
+            try:
+                async with aclosing(turn):
+                    async for event, data in turn:
+                        # Checking the connection costs about as much as sending a token: do it a few times a second
+                        if time.perf_counter() - last_check > 0.25:
+                            if await request.is_disconnected():
+                                break   # closing the stream cancels the run and frees its slot
+                            last_check = time.perf_counter()
+                        yield sse(event, data)
+            except Overloaded as e:
+                yield sse("error", {"status": e.status_code, "detail": e.detail})
+            except Exception as e:
+                yield sse("error", {"status": 500, "detail": str(e)})
+
+        return StreamingResponse(events(), media_type="text/event-stream",
+                                 headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+    @app.post("/threads/{thread_id}/runs")
+    async def run_turn(thread_id: str, body: TurnRequest):
+        result = {}
+        turn = scheduler.run(thread_id, lambda queued_ms: turn_events(graph, thread_id, body.message, queued_ms))
+        async with aclosing(turn):
+            async for event, data in turn:
+                if event == "interrupt":
+                    result["interrupt"] = data["value"]
+                elif event == "end":
+                    result.update(data)
+        if not result:
+            raise HTTPException(500, "The run produced no result")
+        return result
+
+    @app.get("/health")
+    async def health():
+        return {
+            "running": scheduler.running,
+            "waiting": scheduler.waiting,
+            "active_threads": len(scheduler.thread_locks),
+            "max_concurrency": scheduler.max_concurrency,
+            "max_queue": scheduler.max_queue,
+            **scheduler.stats,
+        }
+
+    return app
+
+
+# ------------------------------------------------------
+#  Step 5: Run the server
+# ------------------------------------------------------
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve a compiled LangGraph graph over HTTP/SSE")
+    parser.add_argument("--graph", default="03_graph_with_memory:graph", help="module:attribute of a compiled graph")
+    parser.add_argument("--fake", action="store_true", help="Serve a fake streaming chat graph instead (no API keys)")
+    parser.add_argument("--first-token-delay", type=float, default=0.2, help="--fake: seconds before the first token")
+    parser.add_argument("--token-delay", type=float, default=0.01, help="--fake: seconds between tokens")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--max-concurrency", type=int, default=32)
+    parser.add_argument("--max-queue", type=int, default=256)
+    parser.add_argument("--queue-timeout", type=float, default=30.0)
+    args = parser.parse_args()
+
+    graph = build_fake_graph(args.first_token_delay, args.token_delay) if args.fake else load_graph(args.graph)
+    scheduler = TurnScheduler(args.max_concurrency, args.max_queue, args.queue_timeout)
+    uvicorn.run(create_app(graph, scheduler), host=args.host, port=args.port, log_level="warning")
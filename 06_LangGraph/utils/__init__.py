@@ -1,2 +1,38 @@
-from .node_tools import BasicToolNode
-from .display_graphs import show
\ No newline at end of file
+# Submodules are imported on first use of one of their names, so `from utils import show`
+# doesn't import langchain_core (node_tools) or langgraph (checkpointer)
+import importlib
+
+_EXPORTS = {
+    "BasicToolNode": "node_tools",
+    "show": "display_graphs",
+    "CascadeChatModel": "model_cascade",
+    "ToolOutputCompactor": "tool_output",
+    "OutputBudget": "tool_output",
+    "ResultStore": "tool_output",
+    "TAVILY_BUDGET": "tool_output",
+    "DeltaSqliteSaver": "checkpointer",
+    "MessagePolicy": "message_policy",
+    "evicting_add_messages": "message_policy",
+    "stream_chat": "streaming",
+    "astream_chat": "streaming",
+    "InterruptQueue": "interrupt_queue",
+    "NodeCache": "node_cache",
+    "MemoryCache": "node_cache",
+    "SqliteCache": "node_cache",
+    "Cassette": "cassette",
+    "LazyRegistry": "registry",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,555 @@
+"""
+cassette.py
+
+Record the HTTP calls a script makes to OpenAI and Tavily once, then replay them offline.
+
+Every example in this repo calls live APIs, so two runs never see the same answers or the same
+latency, and nothing runs without keys and a network. A `Cassette` sits under the HTTP clients
+the LangChain integrations use and stores each call as one JSON line:
+
+    - httpx     - `ChatOpenAI`, `init_chat_model("openai:...")`, `OpenAIEmbeddings`, `openai.OpenAI`
+    - requests  - `TavilySearch` (sync)
+    - aiohttp   - `TavilySearch` (async, e.g. under `graph.astream`)
+
+Each line is keyed by a hash of the request (method, URL, canonical JSON body - no headers, so no
+API keys) and keeps the response body (JSON bodies stored compactly), status, content type, time to
+first byte and total time. Streamed (SSE) responses are replayed event by event.
+
+Modes:
+    record  - call the APIs and write a new cassette
+    replay  - answer only from the cassette; an unrecorded request gets a 404 naming it (no network)
+    auto    - replay what is recorded, record what isn't
+Replay latency is "recorded" (sleep as long as the real call took: same time to first token and
+total time) or "zero" (as fast as the code around the calls can go).
+
+The same request made several times (e.g. the same question twice) replays its recordings in order.
+
+Usage:
+    with Cassette("cassettes/graph_with_tool.jsonl.gz", mode="replay", latency="zero"):
+        graph.invoke(...)
+
+    # Any script in the repo, from the 06_LangGraph folder:
+    $ python -m utils.cassette record --inputs questions.txt cassettes/rag.jsonl.gz ../02_RAG/code/rag_based_chatbot.py
+    $ python -m utils.cassette replay --inputs questions.txt --latency zero --repeat 5 \\
+          cassettes/rag.jsonl.gz ../02_RAG/code/rag_based_chatbot.py
+    (options go before the script; anything after the script is passed on to it)
+"""
+
+import argparse
+import asyncio
+import base64
+import builtins
+import gzip
+import hashlib
+import json
+import os
+import runpy
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import httpx
+
+
+# Body fields that hold credentials: left out of keys and never written
+SECRET_FIELDS = {"api_key", "apiKey", "key", "token"}
+
+# Placeholders so clients can be constructed without real keys when replaying
+REPLAY_ENV = {"OPENAI_API_KEY": "sk-replay", "TAVILY_API_KEY": "tvly-replay"}
+
+
+class CassetteError(RuntimeError):
+    pass
+
+
+# ------------------------------------------------------
+#  Request keys and stored responses
+# ------------------------------------------------------
+def _strip_secrets(value):
+    if isinstance(value, dict):
+        return {k: _strip_secrets(v) for k, v in value.items() if k not in SECRET_FIELDS}
+    if isinstance(value, list):
+        return [_strip_secrets(v) for v in value]
+    return value
+
+
+def _clean_url(url: str) -> str:
+    """The URL with its query sorted and credential parameters removed."""
+    parts = urlsplit(str(url))
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in SECRET_FIELDS)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ""))
+
+
+def request_key(method: str, url: str, body=None) -> str:
+    """Hash of method, cleaned URL and body (JSON bodies compared by value, not formatting)."""
+    if isinstance(body, (bytes, bytearray)):
+        body = bytes(body).decode("utf-8", errors="replace")
+    if isinstance(body, str) and body:
+        try:
+            body = json.loads(body)
+        except ValueError:
+            pass
+    canonical = json.dumps(
+        [method.upper(), _clean_url(url), _strip_secrets(body) if body else None],
+        sort_keys=True, separators=(",", ":"), default=str,
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()[:32]
+
+
+def _entry(key: str, method: str, url: str, status: int, content_type: str, body: bytes,
+           ttfb_ms: float, elapsed_ms: float) -> dict:
+    entry = {
+        "key": key, "method": method.upper(), "url": _clean_url(url), "status": status,
+        "content_type": content_type, "ttfb_ms": round(ttfb_ms, 1), "elapsed_ms": round(elapsed_ms, 1),
+    }
+    if "json" in content_type:
+        try:
+            entry["json"] = json.loads(body)
+            return entry
+        except ValueError:
+            pass
+    try:
+        entry["text"] = body.decode("utf-8")
+    except UnicodeDecodeError:
+        entry["b64"] = base64.b64encode(body).decode()
+    return entry
+
+
+def _body(entry: dict) -> bytes:
+    if "json" in entry:
+        return json.dumps(entry["json"], separators=(",", ":")).encode()
+    if "text" in entry:
+        return entry["text"].encode()
+    return base64.b64decode(entry.get("b64", ""))
+
+
+def _chunks(entry: dict, body: bytes) -> list:
+    """A streamed (SSE) body split into its events, anything else as one chunk."""
+    if "event-stream" not in entry["content_type"]:
+        return [body]
+    events = body.split(b"\n\n")
+    return [event + b"\n\n" for event in events[:-1]] + ([events[-1]] if events[-1] else [])
+
+
+def _delays(entry: dict, n_chunks: int) -> list:
+    """Seconds to wait before each chunk: the recorded time to first byte, then the rest spread evenly."""
+    first = entry["ttfb_ms"] / 1000
+    rest = max(entry["elapsed_ms"] - entry["ttfb_ms"], 0) / 1000
+    return [first] + [rest / (n_chunks - 1)] * (n_chunks - 1) if n_chunks > 1 else [entry["elapsed_ms"] / 1000]
+
+
+# ------------------------------------------------------
+#  Replayed and recording streams (httpx)
+# ------------------------------------------------------
+class _ReplayStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    def __init__(self, chunks: list, delays: list) -> None:
+        self.chunks = chunks
+        self.delays = delays
+
+    def __iter__(self):
+        for chunk, delay in zip(self.chunks, self.delays):
+            if delay:
+                time.sleep(delay)
+            yield chunk
+
+    async def __aiter__(self):
+        for chunk, delay in zip(self.chunks, self.delays):
+            if delay:
+                await asyncio.sleep(delay)
+            yield chunk
+
+
+class _RecordingStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    """Passes the real response body through, and saves it with its timing when closed."""
+
+    def __init__(self, stream, start: float, on_done) -> None:
+        self.stream = stream
+        self.start = start
+        self.on_done = on_done
+        self.parts = []
+        self.first = None
+
+    def _seen(self, chunk: bytes) -> None:
+        if self.first is None:
+            self.first = time.perf_counter()
+        self.parts.append(chunk)
+
+    def _done(self) -> None:
+        if self.on_done is not None:
+            end = time.perf_counter()
+            self.on_done(b"".join(self.parts), ((self.first or end) - self.start) * 1000, (end - self.start) * 1000)
+            self.on_done = None
+
+    def __iter__(self):
+        for chunk in self.stream:
+            self._seen(chunk)
+            yield chunk
+
+    def close(self) -> None:
+        self.stream.close()
+        self._done()
+
+    async def __aiter__(self):
+        async for chunk in self.stream:
+            self._seen(chunk)
+            yield chunk
+
+    async def aclose(self) -> None:
+        await self.stream.aclose()
+        self._done()
+
+
+# ------------------------------------------------------
+#  Replayed responses (requests, aiohttp)
+# ------------------------------------------------------
+def _requests_response(request, entry: dict, body: bytes):
+    import requests
+
+    response = requests.Response()
+    response.status_code = entry["status"]
+    response.headers["Content-Type"] = entry["content_type"]
+    response._content = body
+    response._content_consumed = True
+    response.url = request.url
+    response.request = request
+    response.reason = "OK" if entry["status"] < 400 else "Not Found"
+    return response
+
+
+class _AiohttpResponse:
+    """What the aiohttp code in the integrations uses of a ClientResponse."""
+
+    def __init__(self, method: str, url: str, entry: dict, body: bytes) -> None:
+        self.method = method
+        self.url = url
+        self.status = entry["status"]
+        self.ok = self.status < 400
+        self.reason = "OK" if self.ok else "Not Found"
+        self.headers = {"Content-Type": entry["content_type"]}
+        self.content_type = entry["content_type"].split(";")[0]
+        self._body = body
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def text(self, encoding: str = None, errors: str = "strict") -> str:
+        return self._body.decode(encoding or "utf-8", errors)
+
+    async def json(self, *args, loads=json.loads, **kwargs):
+        return loads(self._body.decode())
+
+    def raise_for_status(self) -> None:
+        if not self.ok:
+            raise CassetteError(f"{self.status} for {self.method} {self.url}: {self._body.decode()[:200]}")
+
+    def release(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    async def wait_for_close(self) -> None:
+        pass
+
+    async def __aenter__(self) -> "_AiohttpResponse":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        pass
+
+
+# ------------------------------------------------------
+#  Cassette
+# ------------------------------------------------------
+class Cassette:
+    """
+    Records or replays the HTTP calls made inside `with Cassette(...)`.
+
+    Args:
+        path (str): Cassette file (JSON lines; gzip-compressed if it ends with .gz).
+        mode (str): "record", "replay" or "auto".
+        latency (str): When replaying, "recorded" or "zero".
+    """
+
+    _active = None
+
+    def __init__(self, path: str, mode: str = "replay", latency: str = "recorded") -> None:
+        if mode not in ("record", "replay", "auto"):
+            raise ValueError(f"mode must be record, replay or auto, not {mode!r}")
+        if latency not in ("recorded", "zero"):
+            raise ValueError(f"latency must be recorded or zero, not {latency!r}")
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self.entries = {}
+        self.used = {}
+        self.stats = {"replayed": 0, "recorded": 0, "missed": 0}
+        self.misses = []
+        self._lock = threading.Lock()
+        self._file = None
+        self._patches = []
+
+    # ----- Storage -----
+    def _open(self, mode: str):
+        if self.path.endswith(".gz"):
+            return gzip.open(self.path, mode + "t", encoding="utf-8")
+        return open(self.path, mode, encoding="utf-8")
+
+    def load(self) -> None:
+        self.entries = {}
+        if not os.path.exists(self.path):
+            return
+        with self._open("r") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self.entries.setdefault(entry["key"], []).append(entry)
+
+    def _lookup(self, key: str):
+        """The next recording for this request (the last one again once all have been used)."""
+        with self._lock:
+            recordings = self.entries.get(key)
+            if not recordings:
+                return None
+            index = self.used.get(key, 0)
+            self.used[key] = index + 1
+            self.stats["replayed"] += 1
+            return recordings[min(index, len(recordings) - 1)]
+
+    def _save(self, entry: dict) -> None:
+        with self._lock:
+            self._file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            self._file.flush()
+            self.entries.setdefault(entry["key"], []).append(entry)
+            self.stats["recorded"] += 1
+
+    def _miss(self, method: str, url: str, key: str) -> dict:
+        """A 404 naming the unrecorded request, in the error shapes the OpenAI and Tavily clients read."""
+        message = f"No recorded response for {method.upper()} {_clean_url(url)} (key {key}) in {self.path}"
+        with self._lock:
+            self.stats["missed"] += 1
+            self.misses.append(message)
+        return {
+            "key": key, "status": 404, "content_type": "application/json", "ttfb_ms": 0.0, "elapsed_ms": 0.0,
+            "json": {"error": {"message": message, "type": "cassette_miss"}, "detail": {"error": message}},
+        }
+
+    def _should_record(self, key: str) -> bool:
+        return self.mode == "record" or (self.mode == "auto" and key not in self.entries)
+
+    def _replay_delay(self, entry: dict) -> float:
+        return entry["elapsed_ms"] / 1000 if self.latency == "recorded" else 0.0
+
+    # ----- httpx -----
+    def _httpx_replay(self, request, entry: dict) -> httpx.Response:
+        body = _body(entry)
+        chunks = _chunks(entry, body)
+        delays = _delays(entry, len(chunks)) if self.latency == "recorded" else [0.0] * len(chunks)
+        return httpx.Response(
+            entry["status"], headers={"content-type": entry["content_type"]},
+            stream=_ReplayStream(chunks, delays), request=request,
+        )
+
+    def _httpx_recording(self, request, response, key: str, start: float) -> httpx.Response:
+        def done(body, ttfb_ms, elapsed_ms):
+            self._save(_entry(key, request.method, str(request.url), response.status_code,
+                              response.headers.get("content-type", ""), body, ttfb_ms, elapsed_ms))
+
+        return httpx.Response(
+            response.status_code, headers=response.headers, extensions=response.extensions,
+            stream=_RecordingStream(response.stream, start, done), request=request,
+        )
+
+    def _patch_httpx(self) -> None:
+        cassette = self
+        sync_send = httpx.HTTPTransport.handle_request
+        async_send = httpx.AsyncHTTPTransport.handle_async_request
+
+        def handle_request(transport, request):
+            key = request_key(request.method, str(request.url), request.read())
+            if cassette._should_record(key):
+                request.headers["Accept-Encoding"] = "identity"   # store bodies as the client reads them
+                start = time.perf_counter()
+                return cassette._httpx_recording(request, sync_send(transport, request), key, start)
+            entry = cassette._lookup(key) or cassette._miss(request.method, str(request.url), key)
+            return cassette._httpx_replay(request, entry)
+
+        async def handle_async_request(transport, request):
+            key = request_key(request.method, str(request.url), await request.aread())
+            if cassette._should_record(key):
+                request.headers["Accept-Encoding"] = "identity"
+                start = time.perf_counter()
+                return cassette._httpx_recording(request, await async_send(transport, request), key, start)
+            entry = cassette._lookup(key) or cassette._miss(request.method, str(request.url), key)
+            return cassette._httpx_replay(request, entry)
+
+        httpx.HTTPTransport.handle_request = handle_request
+        httpx.AsyncHTTPTransport.handle_async_request = handle_async_request
+        self._patches.append((httpx.HTTPTransport, "handle_request", sync_send))
+        self._patches.append((httpx.AsyncHTTPTransport, "handle_async_request", async_send))
+
+    # ----- requests -----
+    def _patch_requests(self) -> None:
+        try:
+            from requests.adapters import HTTPAdapter
+        except ImportError:
+            return
+        cassette = self
+        original = HTTPAdapter.send
+
+        def send(adapter, request, *args, **kwargs):
+            key = request_key(request.method, request.url, request.body)
+            if cassette._should_record(key):
+                start = time.perf_counter()
+                response = original(adapter, request, *args, **kwargs)
+                ttfb_ms = (time.perf_counter() - start) * 1000
+                body = response.content
+                cassette._save(_entry(key, request.method, request.url, response.status_code,
+                                      response.headers.get("Content-Type", ""), body,
+                                      ttfb_ms, (time.perf_counter() - start) * 1000))
+                return response
+            entry = cassette._lookup(key) or cassette._miss(request.method, request.url, key)
+            time.sleep(cassette._replay_delay(entry))
+            return _requests_response(request, entry, _body(entry))
+
+        HTTPAdapter.send = send
+        self._patches.append((HTTPAdapter, "send", original))
+
+    # ----- aiohttp -----
+    def _patch_aiohttp(self) -> None:
+        try:
+            import aiohttp
+        except ImportError:
+            return
+        cassette = self
+        original = aiohttp.ClientSession._request
+
+        async def _request(session, method, str_or_url, *args, params=None, data=None, json=None, **kwargs):
+            url = str(str_or_url)
+            if params:
+                url += ("&" if "?" in url else "?") + urlencode(params)
+            key = request_key(method, url, json if json is not None else data)
+            if cassette._should_record(key):
+                start = time.perf_counter()
+                response = await original(session, method, str_or_url, *args, params=params, data=data,
+                                          json=json, **kwargs)
+                ttfb_ms = (time.perf_counter() - start) * 1000
+                body = await response.read()
+                cassette._save(_entry(key, method, url, response.status, response.headers.get("Content-Type", ""),
+                                      body, ttfb_ms, (time.perf_counter() - start) * 1000))
+                return response
+            entry = cassette._lookup(key) or cassette._miss(method, url, key)
+            await asyncio.sleep(cassette._replay_delay(entry))
+            return _AiohttpResponse(method, url, entry, _body(entry))
+
+        aiohttp.ClientSession._request = _request
+        self._patches.append((aiohttp.ClientSession, "_request", original))
+
+    # ----- Context manager -----
+    def __enter__(self) -> "Cassette":
+        if Cassette._active is not None:
+            raise CassetteError(f"Cassette {Cassette._active.path} is already active")
+        if self.mode == "record":
+            self.entries = {}
+        else:
+            self.load()
+            if self.mode == "replay" and not self.entries:
+                raise CassetteError(f"Nothing to replay: {self.path} is missing or empty")
+        if self.mode != "replay":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._file = self._open("w" if self.mode == "record" else "a")
+        else:
+            for name, value in REPLAY_ENV.items():
+                os.environ.setdefault(name, value)
+        self.used = {}
+        self._patch_httpx()
+        self._patch_requests()
+        self._patch_aiohttp()
+        Cassette._active = self
+        return self
+
+    def __exit__(self, *exc) -> None:
+        for owner, name, original in reversed(self._patches):
+            setattr(owner, name, original)
+        self._patches = []
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        Cassette._active = None
+
+    def report(self) -> dict:
+        return {**self.stats, "requests": sum(len(r) for r in self.entries.values()), "path": self.path}
+
+
+# ------------------------------------------------------
+#  Running scripts under a cassette
+# ------------------------------------------------------
+def run_script(script: str, script_args: list, inputs: list = None, cwd: str = None) -> None:
+    """
+    Run a repo script as `__main__` (as `python script.py` would).
+
+    `inputs` are answered to its `input()` prompts in order, then "exit" (every chat loop in the
+    repo stops on it). `cwd` is where it runs; scripts keep state in files (checkpoint databases,
+    node caches), so replays only match a recording made from the same starting files.
+    """
+    script = os.path.abspath(script)
+    answers = list(inputs) if inputs is not None else None
+    saved = sys.argv, list(sys.path), os.getcwd(), builtins.input
+
+    def scripted_input(prompt: str = "") -> str:
+        answer = answers.pop(0) if answers else "exit"
+        print(f"{prompt}{answer}")
+        return answer
+
+    sys.argv = [script, *script_args]
+    sys.path.insert(0, os.path.dirname(script))
+    if answers is not None:
+        builtins.input = scripted_input
+    try:
+        if cwd:
+            os.chdir(cwd)
+        runpy.run_path(script, run_name="__main__")
+    except SystemExit:
+        pass
+    finally:
+        sys.argv, sys.path[:], _, builtins.input = saved
+        os.chdir(saved[2])
+
+
+def main(args) -> None:
+    inputs = None
+    if args.inputs:
+        with open(args.inputs, encoding="utf-8") as f:
+            inputs = [line.rstrip("\n") for line in f if line.strip()]
+    cassette_path = os.path.abspath(args.cassette)
+    totals = []
+    for run in range(args.repeat):
+        mode = args.mode if run == 0 else "replay"   # later runs replay what the first one recorded
+        with tempfile.TemporaryDirectory() as workdir:
+            with Cassette(cassette_path, mode=mode, latency=args.latency) as cassette:
+                start = time.perf_counter()
+                run_script(args.script, args.script_args, inputs, cwd=args.cwd or workdir)
+                elapsed = time.perf_counter() - start
+        stats = cassette.stats
+        totals.append(elapsed)
+        print(f"[cassette] run {run + 1}: {stats['replayed']} replayed, {stats['recorded']} recorded, "
+              f"{stats['missed']} missed in {elapsed:.2f}s ({mode}, latency {args.latency})")
+        for miss in cassette.misses:
+            print(f"[cassette]   {miss}")
+    if len(totals) > 1:
+        print(f"[cassette] {len(totals)} runs: best {min(totals):.2f}s, median {sorted(totals)[len(totals) // 2]:.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a script with its OpenAI/Tavily calls recorded or replayed")
+    parser.add_argument("mode", choices=["record", "replay", "auto"])
+    parser.add_argument("--latency", choices=["recorded", "zero"], default="recorded")
+    parser.add_argument("--inputs", help="Text file of answers to the script's input() prompts, one per line")
+    parser.add_argument("--repeat", type=int, default=1, help="Run this many times (runs after the first replay)")
+    parser.add_argument("--cwd", help="Working directory for the script (default: a fresh temporary one per run)")
+    parser.add_argument("cassette", help="Cassette file (.jsonl or .jsonl.gz)")
+    parser.add_argument("script", help="Python script to run")
+    parser.add_argument("script_args", nargs=argparse.REMAINDER, help="Arguments passed on to the script")
+    main(parser.parse_args())
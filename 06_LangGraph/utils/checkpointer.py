@@ -0,0 +1,486 @@
+"""
+checkpointer.py
+
+Durable SQLite checkpointer that stores list channels (like `messages`) as deltas.
+
+`InMemorySaver` loses every thread on restart, and - like most savers - writes the full value
+of every channel that changed at every superstep. For a chat graph that is the whole, growing
+`messages` list each time, so storage grows quadratically with the conversation length.
+
+`DeltaSqliteSaver` keeps the same data in a SQLite file, but when a list channel's new value
+is its previous value plus some appended items (what `add_messages` produces for a normal turn),
+it stores only the appended items and a reference to the previous version. Every
+`snapshot_every`-th version of a channel (and whenever the list was edited rather than appended to,
+e.g. by a RemoveMessage) a full base snapshot is written instead, so rebuilding a value reads
+one base snapshot plus at most `snapshot_every - 1` small deltas.
+
+Also:
+    - WAL journal mode with synchronous=NORMAL: writes don't block readers and don't fsync every commit
+    - `prune(thread_id, keep_last)` (or `keep_last=` for automatic pruning) drops old checkpoints
+      of a thread, along with the writes and blobs only they needed
+    - async methods (aget_tuple, aput, ...) run the sync ones in a worker thread
+
+Usage:
+    memory = DeltaSqliteSaver("checkpoints.db")
+    graph = graph_builder.compile(checkpointer=memory)
+"""
+
+import asyncio
+import random
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import closing
+
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+
+
+# With keep_last set, prune a thread after this many new checkpoints rather than after every one
+PRUNE_EVERY = 10
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    type TEXT,
+    checkpoint BLOB,
+    metadata_type TEXT,
+    metadata BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+CREATE TABLE IF NOT EXISTS blobs (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    channel TEXT NOT NULL,
+    version TEXT NOT NULL,
+    kind TEXT NOT NULL,            -- 'full', 'delta' (items appended to base_version) or 'empty'
+    type TEXT,
+    value BLOB,
+    base_version TEXT,
+    depth INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+);
+CREATE TABLE IF NOT EXISTS writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    type TEXT,
+    value BLOB,
+    task_path TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+"""
+
+
+def _same_item(a, b) -> bool:
+    return a is b or a == b
+
+
+def _is_append(previous, value) -> bool:
+    """True if `value` is `previous` with items appended at the end."""
+    if not isinstance(previous, list) or not isinstance(value, list) or len(value) < len(previous):
+        return False
+    return all(_same_item(a, b) for a, b in zip(previous, value))
+
+
+class DeltaSqliteSaver(BaseCheckpointSaver):
+    """
+    SQLite checkpointer storing list channels as base snapshots plus appended-item deltas.
+
+    Args:
+        path (str): SQLite database file (":memory:" for a throwaway one).
+        snapshot_every (int): Write a full snapshot of a list channel every this many versions.
+            1 stores full values every time, like the other savers.
+        keep_last (int): If set, keep only this many checkpoints per thread (pruned every PRUNE_EVERY saves).
+        cache_threads (int): Threads whose last saved lists are kept in memory to diff the next save
+            against (least recently saved dropped first). Other threads read their parent back.
+        serde: Serializer; defaults to LangGraph's JsonPlusSerializer.
+    """
+
+    def __init__(self, path: str = "checkpoints.db", snapshot_every: int = 20, keep_last: int = None,
+                 cache_threads: int = 256, serde=None) -> None:
+        super().__init__(serde=serde)
+        self.path = path
+        self.snapshot_every = max(1, snapshot_every)
+        self.keep_last = max(1, keep_last) if keep_last is not None else None
+        self.cache_threads = max(0, cache_threads)
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.lock = threading.RLock()
+        # (thread_id, ns) -> (checkpoint_id, channel_versions, {channel: list value}) of the last put,
+        # so the next put can diff against it without reading anything back. An LRU, so a server with
+        # many threads holds at most cache_threads of them
+        self._last = OrderedDict()
+        self._puts_since_prune = {}
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "DeltaSqliteSaver":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ------------------------------------------------------
+    #  Channel values
+    # ------------------------------------------------------
+    def _load_value(self, thread_id: str, ns: str, channel: str, version: str):
+        """Rebuild a channel value: its base snapshot plus the deltas appended since. Returns (found, value)."""
+        chain = []
+        while True:
+            row = self.conn.execute(
+                "SELECT kind, type, value, base_version FROM blobs "
+                "WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?",
+                (thread_id, ns, channel, version),
+            ).fetchone()
+            if row is None or row[0] == "empty":
+                return False, None
+            kind, type_, blob, base_version = row
+            if kind == "full":
+                value = self.serde.loads_typed((type_, blob))
+                break
+            chain.append(self.serde.loads_typed((type_, blob)))
+            version = base_version
+        if chain:
+            value = list(value)
+            for appended in reversed(chain):
+                value.extend(appended)
+        return True, value
+
+    def _load_channel_values(self, thread_id: str, ns: str, versions: dict) -> dict:
+        values = {}
+        for channel, version in versions.items():
+            found, value = self._load_value(thread_id, ns, channel, str(version))
+            if found:
+                values[channel] = value
+        return values
+
+    def _previous_lists(self, thread_id: str, ns: str, parent_id: str):
+        """Channel versions and list values of the parent checkpoint (from the cache if possible)."""
+        cached = self._last.get((thread_id, ns))
+        if cached is not None and cached[0] == parent_id:
+            self._last.move_to_end((thread_id, ns))
+            return cached[1], cached[2]
+        if parent_id is None:
+            return {}, {}
+        row = self.conn.execute(
+            "SELECT type, checkpoint FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+            (thread_id, ns, parent_id),
+        ).fetchone()
+        if row is None:
+            return {}, {}
+        versions = self.serde.loads_typed(row)["channel_versions"]
+        lists = {}
+        for channel, version in versions.items():
+            found, value = self._load_value(thread_id, ns, channel, str(version))
+            if found and isinstance(value, list):
+                lists[channel] = value
+        return versions, lists
+
+    def _blob_row(self, thread_id: str, ns: str, channel: str, version: str, value, prev_versions: dict,
+                  prev_lists: dict) -> tuple:
+        previous = prev_lists.get(channel)
+        base_version = prev_versions.get(channel)
+        if self.snapshot_every > 1 and base_version is not None and _is_append(previous, value):
+            depth_row = self.conn.execute(
+                "SELECT depth FROM blobs WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?",
+                (thread_id, ns, channel, str(base_version)),
+            ).fetchone()
+            depth = (depth_row[0] if depth_row else self.snapshot_every) + 1
+            if depth < self.snapshot_every:
+                type_, blob = self.serde.dumps_typed(value[len(previous):])
+                return (thread_id, ns, channel, version, "delta", type_, blob, str(base_version), depth)
+        type_, blob = self.serde.dumps_typed(value)
+        return (thread_id, ns, channel, version, "full", type_, blob, None, 0)
+
+    # ------------------------------------------------------
+    #  BaseCheckpointSaver API
+    # ------------------------------------------------------
+    def _tuple(self, thread_id: str, ns: str, row: tuple) -> CheckpointTuple:
+        checkpoint_id, parent_id, type_, checkpoint_blob, metadata_type, metadata_blob = row
+        checkpoint = self.serde.loads_typed((type_, checkpoint_blob))
+        writes = self.conn.execute(
+            "SELECT task_id, channel, type, value FROM writes "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? ORDER BY task_id, idx",
+            (thread_id, ns, checkpoint_id),
+        ).fetchall()
+        return CheckpointTuple(
+            config={"configurable": {"thread_id": thread_id, "checkpoint_ns": ns, "checkpoint_id": checkpoint_id}},
+            checkpoint={
+                **checkpoint,
+                "channel_values": self._load_channel_values(thread_id, ns, checkpoint["channel_versions"]),
+            },
+            metadata=self.serde.loads_typed((metadata_type, metadata_blob)),
+            parent_config=(
+                {"configurable": {"thread_id": thread_id, "checkpoint_ns": ns, "checkpoint_id": parent_id}}
+                if parent_id else None
+            ),
+            pending_writes=[(task_id, channel, self.serde.loads_typed((t, v))) for task_id, channel, t, v in writes],
+        )
+
+    def get_tuple(self, config: dict):
+        thread_id = config["configurable"]["thread_id"]
+        ns = config["configurable"].get("checkpoint_ns", "")
+        columns = "checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, metadata"
+        with self.lock:
+            if checkpoint_id := get_checkpoint_id(config):
+                row = self.conn.execute(
+                    f"SELECT {columns} FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                    (thread_id, ns, checkpoint_id),
+                ).fetchone()
+            else:
+                row = self.conn.execute(
+                    f"SELECT {columns} FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+                    "ORDER BY checkpoint_id DESC LIMIT 1",
+                    (thread_id, ns),
+                ).fetchone()
+            return self._tuple(thread_id, ns, row) if row else None
+
+    def list(self, config, *, filter: dict = None, before=None, limit: int = None):
+        query = "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, " \
+                "metadata_type, metadata FROM checkpoints"
+        where, params = [], []
+        if config:
+            where.append("thread_id = ?")
+            params.append(config["configurable"]["thread_id"])
+            if (ns := config["configurable"].get("checkpoint_ns")) is not None:
+                where.append("checkpoint_ns = ?")
+                params.append(ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                where.append("checkpoint_id = ?")
+                params.append(checkpoint_id)
+        if before and (before_id := get_checkpoint_id(before)):
+            where.append("checkpoint_id < ?")
+            params.append(before_id)
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        query += " ORDER BY checkpoint_id DESC"
+        with self.lock:
+            rows = self.conn.execute(query, params).fetchall()
+        for thread_id, ns, *row in rows:
+            if limit is not None and limit <= 0:
+                break
+            if filter:
+                metadata = self.serde.loads_typed((row[4], row[5]))
+                if not all(metadata.get(key) == value for key, value in filter.items()):
+                    continue
+            if limit is not None:
+                limit -= 1
+            with self.lock:
+                yield self._tuple(thread_id, ns, row)
+
+    def put(self, config: dict, checkpoint: dict, metadata: dict, new_versions: dict) -> dict:
+        thread_id = config["configurable"]["thread_id"]
+        ns = config["configurable"]["checkpoint_ns"]
+        parent_id = config["configurable"].get("checkpoint_id")
+        stored = checkpoint.copy()
+        values = stored.pop("channel_values")
+
+        with self.lock:
+            prev_versions, prev_lists = self._previous_lists(thread_id, ns, parent_id)
+            blob_rows = []
+            for channel, version in new_versions.items():
+                if channel in values:
+                    blob_rows.append(self._blob_row(thread_id, ns, channel, str(version), values[channel],
+                                                    prev_versions, prev_lists))
+                else:
+                    blob_rows.append((thread_id, ns, channel, str(version), "empty", None, None, None, 0))
+            type_, checkpoint_blob = self.serde.dumps_typed(stored)
+            metadata_type, metadata_blob = self.serde.dumps_typed(get_checkpoint_metadata(config, metadata))
+
+            self.conn.execute("BEGIN")
+            try:
+                self.conn.executemany("INSERT OR REPLACE INTO blobs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", blob_rows)
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (thread_id, ns, checkpoint["id"], parent_id, type_, checkpoint_blob, metadata_type, metadata_blob),
+                )
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+
+            lists = {**prev_lists}
+            for channel in new_versions:
+                if isinstance(values.get(channel), list):
+                    lists[channel] = list(values[channel])
+                else:
+                    lists.pop(channel, None)
+            self._last[(thread_id, ns)] = (checkpoint["id"], dict(checkpoint["channel_versions"]), lists)
+            self._last.move_to_end((thread_id, ns))
+            while len(self._last) > self.cache_threads:
+                self._last.popitem(last=False)
+
+            if self.keep_last is not None:
+                puts = self._puts_since_prune.get(thread_id, 0) + 1
+                if puts >= PRUNE_EVERY:
+                    self.prune(thread_id, self.keep_last)
+                    puts = 0
+                self._puts_since_prune[thread_id] = puts
+
+        return {"configurable": {"thread_id": thread_id, "checkpoint_ns": ns, "checkpoint_id": checkpoint["id"]}}
+
+    def put_writes(self, config: dict, writes, task_id: str, task_path: str = "") -> None:
+        thread_id = config["configurable"]["thread_id"]
+        ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        # Special writes (errors, interrupts, ...) replace earlier ones; regular writes are kept once
+        special, regular = [], []
+        for idx, (channel, value) in enumerate(writes):
+            type_, blob = self.serde.dumps_typed(value)
+            row = (thread_id, ns, checkpoint_id, task_id, WRITES_IDX_MAP.get(channel, idx), channel, type_, blob, task_path)
+            (special if channel in WRITES_IDX_MAP else regular).append(row)
+        with self.lock:
+            self.conn.execute("BEGIN")
+            try:
+                self.conn.executemany("INSERT OR REPLACE INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", special)
+                self.conn.executemany("INSERT OR IGNORE INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", regular)
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self.lock:
+            self.conn.execute("BEGIN")
+            for table in ("checkpoints", "blobs", "writes"):
+                self.conn.execute(f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,))
+            self.conn.execute("COMMIT")
+            for key in [key for key in self._last if key[0] == thread_id]:
+                del self._last[key]
+
+    def get_next_version(self, current, channel=None) -> str:
+        # Same zero-padded "counter.random" strings as InMemorySaver, so versions sort as text
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+    # ------------------------------------------------------
+    #  Pruning
+    # ------------------------------------------------------
+    def prune(self, thread_id: str, keep_last: int = 1) -> int:
+        """
+        Keep only the `keep_last` most recent checkpoints of each namespace of a thread.
+        Deletes older checkpoints, their writes, and the blobs (and delta bases) no kept checkpoint needs.
+
+        Returns:
+            int: Number of checkpoints deleted.
+        """
+        keep_last = max(1, keep_last)
+        with self.lock:
+            deleted = 0
+            for (ns,) in self.conn.execute(
+                "SELECT DISTINCT checkpoint_ns FROM checkpoints WHERE thread_id = ?", (thread_id,)
+            ).fetchall():
+                old = self.conn.execute(
+                    "SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+                    "ORDER BY checkpoint_id DESC LIMIT -1 OFFSET ?",
+                    (thread_id, ns, keep_last),
+                ).fetchall()
+                if not old:
+                    continue
+                needed = self._needed_blobs(thread_id, ns, keep_last)
+                with closing(self.conn.cursor()) as cursor:
+                    cursor.execute("BEGIN")
+                    cursor.executemany(
+                        "DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                        [(thread_id, ns, checkpoint_id) for (checkpoint_id,) in old],
+                    )
+                    cursor.executemany(
+                        "DELETE FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                        [(thread_id, ns, checkpoint_id) for (checkpoint_id,) in old],
+                    )
+                    stale = [
+                        (thread_id, ns, channel, version)
+                        for channel, version in cursor.execute(
+                            "SELECT channel, version FROM blobs WHERE thread_id = ? AND checkpoint_ns = ?", (thread_id, ns)
+                        ).fetchall()
+                        if (channel, version) not in needed
+                    ]
+                    cursor.executemany(
+                        "DELETE FROM blobs WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?",
+                        stale,
+                    )
+                    cursor.execute("COMMIT")
+                deleted += len(old)
+            return deleted
+
+    def _needed_blobs(self, thread_id: str, ns: str, keep_last: int) -> set:
+        """(channel, version) of every blob the newest `keep_last` checkpoints read, including delta bases."""
+        needed = set()
+        for row in self.conn.execute(
+            "SELECT type, checkpoint FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+            "ORDER BY checkpoint_id DESC LIMIT ?",
+            (thread_id, ns, keep_last),
+        ).fetchall():
+            for channel, version in self.serde.loads_typed(row)["channel_versions"].items():
+                version = str(version)
+                while version is not None and (channel, version) not in needed:
+                    needed.add((channel, version))
+                    base = self.conn.execute(
+                        "SELECT base_version FROM blobs WHERE thread_id = ? AND checkpoint_ns = ? "
+                        "AND channel = ? AND version = ?",
+                        (thread_id, ns, channel, version),
+                    ).fetchone()
+                    version = base[0] if base else None
+        return needed
+
+    # ------------------------------------------------------
+    #  Async API (runs the sync methods in a worker thread)
+    # ------------------------------------------------------
+    async def aget_tuple(self, config: dict):
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(self, config, *, filter: dict = None, before=None, limit: int = None):
+        tuples = await asyncio.to_thread(lambda: list(self.list(config, filter=filter, before=before, limit=limit)))
+        for checkpoint_tuple in tuples:
+            yield checkpoint_tuple
+
+    async def aput(self, config: dict, checkpoint: dict, metadata: dict, new_versions: dict) -> dict:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config: dict, writes, task_id: str, task_path: str = "") -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+    # ------------------------------------------------------
+    #  Stats
+    # ------------------------------------------------------
+    def storage_stats(self, thread_id: str = None) -> dict:
+        """Row counts and stored bytes, for one thread or the whole database."""
+        where, params = ("WHERE thread_id = ?", (thread_id,)) if thread_id else ("", ())
+        with self.lock:
+            checkpoints, checkpoint_bytes = self.conn.execute(
+                f"SELECT COUNT(*), COALESCE(SUM(LENGTH(checkpoint) + LENGTH(metadata)), 0) FROM checkpoints {where}",
+                params,
+            ).fetchone()
+            blob_rows = self.conn.execute(
+                f"SELECT kind, COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM blobs {where} GROUP BY kind", params
+            ).fetchall()
+        blobs = {kind: {"count": count, "bytes": size} for kind, count, size in blob_rows}
+        return {
+            "checkpoints": checkpoints,
+            "checkpoint_bytes": checkpoint_bytes,
+            "blobs": blobs,
+            "total_bytes": checkpoint_bytes + sum(b["bytes"] for b in blobs.values()),
+        }
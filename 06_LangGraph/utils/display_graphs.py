@@ -1,9 +1,234 @@
-def show(compiled_graph, image_name):
+"""
+display_graphs.py
+
+Saves a picture of a compiled LangGraph graph, without slowing down (or breaking) startup.
+
+`draw_mermaid_png()` sends the graph to a remote rendering service, so calling it when an example
+starts costs a network round trip every time, and fails without network. `show()` instead:
+    - writes Mermaid (.mmd), Graphviz DOT (.dot) and SVG (.svg) files, all rendered locally
+    - skips rendering entirely when the graph's structure hasn't changed since the last run
+      (a hash of the nodes and edges is stored in the .mmd file)
+    - renders in a background thread by default, so it is never on the startup path
+    - only asks the remote Mermaid renderer for the PNG when GRAPH_RENDER_PNG=1; the offline SVG
+      shows the same graph
+
+Environment:
+    GRAPH_RENDER=background   (default) render in a background thread
+    GRAPH_RENDER=sync         render before returning
+    GRAPH_RENDER=off          don't render at all
+    GRAPH_RENDER_PNG=1        also render the PNG remotely (default: offline formats only). The
+                              background thread then keeps the interpreter alive until the PNG is
+                              written, and a missing PNG is retried on the next run
+"""
+
+import hashlib
+import html
+import json
+import os
+import threading
+from collections import defaultdict
+
+
+HASH_PREFIX = "%% graph-hash: "
+
+NODE_WIDTH, NODE_HEIGHT = 140, 36
+LAYER_GAP, NODE_GAP = 70, 30
+
+
+def structure_hash(graph) -> str:
+    """Hash of what the picture shows: node ids and edges (with their conditional flag and label)."""
+    structure = {
+        "nodes": sorted(graph.nodes),
+        "edges": sorted((e.source, e.target, bool(e.conditional), str(e.data or "")) for e in graph.edges),
+    }
+    return hashlib.sha256(json.dumps(structure).encode()).hexdigest()[:16]
+
+
+def _cached_hash(mermaid_path: str):
     try:
-        img_bytes = compiled_graph.get_graph().draw_mermaid_png()
-        with open(image_name, "wb") as f:
-            f.write(img_bytes)
-        print("Graph image saved as graph.png")
+        with open(mermaid_path) as f:
+            first_line = f.readline().strip()
+    except OSError:
+        return None
+    return first_line[len(HASH_PREFIX):] if first_line.startswith(HASH_PREFIX) else None
+
+
+def _write(path: str, data) -> None:
+    # Write then rename, so an interrupted render never leaves a half-written file behind
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb" if isinstance(data, bytes) else "w") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+# ------------------------------------------------------
+#  Offline renderers
+# ------------------------------------------------------
+def to_dot(graph) -> str:
+    lines = ["digraph G {", '  rankdir=TB;', '  node [shape=box, style="rounded,filled", fillcolor="#f2f0ff"];']
+    for node_id in graph.nodes:
+        shape = ', shape=oval, fillcolor="#bfb6fc"' if node_id in ("__start__", "__end__") else ""
+        lines.append(f'  "{node_id}" [label="{node_id}"{shape}];')
+    for edge in graph.edges:
+        attributes = ["style=dashed"] if edge.conditional else []
+        if edge.data:
+            attributes.append(f'label="{edge.data}"')
+        suffix = f" [{', '.join(attributes)}]" if attributes else ""
+        lines.append(f'  "{edge.source}" -> "{edge.target}"{suffix};')
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def _layers(graph) -> list:
+    """Nodes grouped into rows by their shortest distance from __start__ (unreachable nodes last)."""
+    children = defaultdict(list)
+    for edge in graph.edges:
+        children[edge.source].append(edge.target)
+    depth = {}
+    frontier = [n for n in graph.nodes if n == "__start__"] or list(graph.nodes)[:1]
+    for node_id in frontier:
+        depth[node_id] = 0
+    while frontier:
+        next_frontier = []
+        for node_id in frontier:
+            for child in children[node_id]:
+                if child not in depth:
+                    depth[child] = depth[node_id] + 1
+                    next_frontier.append(child)
+        frontier = next_frontier
+    last = max(depth.values(), default=0)
+    if "__end__" in graph.nodes:
+        depth["__end__"] = last + 1  # END always at the bottom
+    for node_id in graph.nodes:
+        depth.setdefault(node_id, last + 2)
+    rows = defaultdict(list)
+    for node_id in graph.nodes:
+        rows[depth[node_id]].append(node_id)
+    return [rows[d] for d in sorted(rows)]
+
+
+def to_svg(graph) -> str:
+    """A simple layered drawing: one row per distance from __start__, dashed arrows for conditional edges."""
+    layers = _layers(graph)
+    width = max(len(row) for row in layers) * (NODE_WIDTH + NODE_GAP) + NODE_GAP
+    height = len(layers) * (NODE_HEIGHT + LAYER_GAP) + LAYER_GAP
+    position = {}
+    for row_index, row in enumerate(layers):
+        row_width = len(row) * (NODE_WIDTH + NODE_GAP) - NODE_GAP
+        x0 = (width - row_width) / 2
+        for i, node_id in enumerate(row):
+            position[node_id] = (x0 + i * (NODE_WIDTH + NODE_GAP), LAYER_GAP / 2 + row_index * (NODE_HEIGHT + LAYER_GAP))
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:.0f}" height="{height:.0f}" '
+        f'font-family="sans-serif" font-size="13">',
+        '<defs><marker id="arrow" viewBox="0 0 10 10" refX="10" refY="5" markerWidth="7" markerHeight="7" '
+        'orient="auto-start-reverse"><path d="M 0 0 L 10 5 L 0 10 z" fill="#555"/></marker></defs>',
+    ]
+    for edge in graph.edges:
+        (sx, sy), (tx, ty) = position[edge.source], position[edge.target]
+        x1, x2 = sx + NODE_WIDTH / 2, tx + NODE_WIDTH / 2
+        if ty > sy:       # downwards: bottom of source to top of target
+            y1, y2 = sy + NODE_HEIGHT, ty
+            path = f"M {x1:.0f} {y1:.0f} L {x2:.0f} {y2:.0f}"
+        else:             # back edge (loop) or same row: curve around the right side
+            y1, y2 = sy + NODE_HEIGHT / 2, ty + NODE_HEIGHT / 2
+            bend = max(sx, tx) + NODE_WIDTH + NODE_GAP * 1.5
+            path = f"M {sx + NODE_WIDTH:.0f} {y1:.0f} C {bend:.0f} {y1:.0f}, {bend:.0f} {y2:.0f}, {tx + NODE_WIDTH:.0f} {y2:.0f}"
+        dash = ' stroke-dasharray="5,4"' if edge.conditional else ""
+        parts.append(f'<path d="{path}" fill="none" stroke="#555"{dash} marker-end="url(#arrow)"/>')
+        if edge.data:
+            parts.append(f'<text x="{(x1 + x2) / 2 + 4:.0f}" y="{(y1 + y2) / 2:.0f}" fill="#555">'
+                         f'{html.escape(str(edge.data))}</text>')
+    for node_id, (x, y) in position.items():
+        terminal = node_id in ("__start__", "__end__")
+        radius = NODE_HEIGHT / 2 if terminal else 8
+        fill = "#bfb6fc" if terminal else "#f2f0ff"
+        parts.append(f'<rect x="{x:.0f}" y="{y:.0f}" width="{NODE_WIDTH}" height="{NODE_HEIGHT}" rx="{radius:.0f}" '
+                     f'fill="{fill}" stroke="#7f72d6"/>')
+        parts.append(f'<text x="{x + NODE_WIDTH / 2:.0f}" y="{y + NODE_HEIGHT / 2 + 4:.0f}" text-anchor="middle">'
+                     f'{html.escape(node_id)}</text>')
+    parts.append("</svg>")
+    return "\n".join(parts) + "\n"
+
+
+# ------------------------------------------------------
+#  show()
+# ------------------------------------------------------
+def render(compiled_graph, image_name: str, png: bool = False) -> dict:
+    """
+    Render `compiled_graph` next to `image_name` (.mmd, .dot, .svg, and the PNG if `png`).
+    Does nothing if the files (the PNG too, if `png`) exist and the graph's structure hasn't changed.
+
+    Returns:
+        dict: {"cached": bool, "files": [...], "png_error": str or None}
+    """
+    graph = compiled_graph.get_graph()
+    stem = os.path.splitext(image_name)[0]
+    paths = {"mmd": f"{stem}.mmd", "dot": f"{stem}.dot", "svg": f"{stem}.svg"}
+    digest = structure_hash(graph)
+    want_png = png and image_name.lower().endswith(".png")
+    expected = list(paths.values()) + ([image_name] if want_png else [])
+
+    if _cached_hash(paths["mmd"]) == digest and all(os.path.exists(p) for p in expected):
+        return {"cached": True, "files": expected, "png_error": None}
+
+    _write(paths["dot"], to_dot(graph))
+    _write(paths["svg"], to_svg(graph))
+    files = [paths["dot"], paths["svg"]]
+    png_error = None
+    if want_png:
+        try:
+            _write(image_name, graph.draw_mermaid_png())
+            files.append(image_name)
+        except Exception as e:
+            png_error = str(e).splitlines()[0] if str(e) else type(e).__name__
+    # The .mmd (holding the hash) goes last: the cache is only valid once everything was written
+    _write(paths["mmd"], f"{HASH_PREFIX}{digest}\n" + graph.draw_mermaid())
+    files.insert(0, paths["mmd"])
+    return {"cached": False, "files": files, "png_error": png_error}
+
+
+def _render_and_report(compiled_graph, image_name: str, png: bool) -> None:
+    try:
+        result = render(compiled_graph, image_name, png)
     except Exception as e:
         print(f"Exception: {e}")
         print("Error occurred while displaying the graph")
+        return
+    if result["cached"]:
+        return
+    if result["png_error"]:
+        print(f"Graph saved as {', '.join(result['files'])} (PNG not rendered: {result['png_error']})")
+    else:
+        print(f"Graph saved as {', '.join(result['files'])}")
+
+
+def show(compiled_graph, image_name, background: bool = None):
+    """
+    Save a picture of the graph as `image_name` (plus .mmd/.dot/.svg), off the startup path.
+
+    Args:
+        compiled_graph: A compiled LangGraph graph.
+        image_name (str): Output file; its stem is used for the offline formats.
+        background (bool): Render in a background thread. Defaults to the GRAPH_RENDER setting.
+
+    Returns:
+        threading.Thread or None: The rendering thread (join() it to wait), or None if it already ran / was skipped.
+    """
+    mode = os.getenv("GRAPH_RENDER", "background").lower()
+    if mode in ("off", "0", "false", "no"):
+        return None
+    png = os.getenv("GRAPH_RENDER_PNG", "0").lower() in ("1", "true", "yes", "on")
+    if background is None:
+        background = mode != "sync"
+    if not background:
+        _render_and_report(compiled_graph, image_name, png)
+        return None
+    # The offline files are written in milliseconds and atomically, so exiting mid-render is harmless;
+    # a remote PNG may take seconds, and the script waits for it rather than dropping it half-done
+    thread = threading.Thread(
+        target=_render_and_report, args=(compiled_graph, image_name, png), name="show-graph", daemon=not png
+    )
+    thread.start()
+    return thread
@@ -0,0 +1,264 @@
+"""
+interrupt_queue.py
+
+A durable list of graph threads paused at an `interrupt(...)`, that any process can list and resume.
+
+A checkpointer already keeps a paused thread's state, but finding out *which* threads are
+waiting means loading every thread's latest checkpoint (`graph.get_state`) and looking at its
+interrupts. `InterruptQueue` records each interrupt as a small row in SQLite instead - thread id,
+interrupt id, the interrupt's value, and when it happened - indexed by thread and by age:
+    - listing pending threads (oldest first) reads only those rows, however many threads are waiting
+    - resuming claims the thread's rows and runs `Command(resume=...)`, which loads only that
+      thread's checkpoint
+    - a claim is a lease (claimed_at/claimed_by on the rows), not a delete: claimed rows can't be
+      resumed twice, even by two processes at once, and are deleted only once the resumed run has
+      finished (or paused again). If the run fails the claim is dropped; if its process dies, the
+      claim expires after `lease_s` and the thread is pending again
+
+Runs started through the queue keep it up to date: interrupts seen in the stream are recorded,
+and a thread that finishes without pausing again is removed. Needs langgraph 0.6 or later, where
+every Interrupt has an `id` and "values" streams carry `__interrupt__`.
+
+Usage:
+    queue = InterruptQueue("checkpoints.db")        # can share the checkpointer's SQLite file
+
+    for event in queue.stream(graph, {"messages": [...]}, config, stream_mode="values"):
+        ...                                          # pauses are recorded as they happen
+
+    # Later, possibly in another process with the same graph and checkpointer:
+    for item in queue.list(limit=20):
+        print(item["thread_id"], item["value"], item["age_s"])
+    for event in queue.resume(graph, "thread-42", {"data": "Here is the answer"}, stream_mode="values"):
+        ...
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+
+from langgraph.types import Command
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pending_interrupts (
+    graph TEXT NOT NULL DEFAULT '',
+    thread_id TEXT NOT NULL,
+    interrupt_id TEXT NOT NULL,
+    value TEXT,                    -- the interrupt's value, as JSON
+    created_at REAL NOT NULL,
+    claimed_at REAL,               -- set while a resume runs; a claim older than the lease has expired
+    claimed_by TEXT,
+    PRIMARY KEY (graph, thread_id, interrupt_id)
+);
+CREATE INDEX IF NOT EXISTS idx_pending_interrupts_age ON pending_interrupts (graph, created_at);
+"""
+
+
+def _interrupts_in(event) -> tuple:
+    """The Interrupt objects in one streamed event, for any stream_mode (single or a list of modes)."""
+    if isinstance(event, tuple) and len(event) == 2 and isinstance(event[0], str):
+        event = event[1]   # (mode, payload) when streaming several modes
+    if isinstance(event, dict):
+        return tuple(event.get("__interrupt__") or ())
+    return ()
+
+
+class InterruptQueue:
+    """
+    Pending interrupts of graph threads, stored in SQLite.
+
+    Args:
+        path (str): SQLite database file. Can be the same file as a DeltaSqliteSaver's.
+        graph_name (str): Label stored with every row, so several graphs can share one queue.
+        lease_s (float): Seconds a resume's claim lasts without news from its run. The claim is
+            renewed while the run streams events, so this only needs to outlast one graph step.
+    """
+
+    def __init__(self, path: str = "interrupts.db", graph_name: str = "", lease_s: float = 300.0) -> None:
+        self.path = path
+        self.graph_name = graph_name
+        self.lease_s = lease_s
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        # Queues created before claims were leases have no claim columns yet
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(pending_interrupts)")}
+        for column, kind in (("claimed_at", "REAL"), ("claimed_by", "TEXT")):
+            if column not in columns:
+                self.conn.execute(f"ALTER TABLE pending_interrupts ADD COLUMN {column} {kind}")
+        self.lock = threading.RLock()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "InterruptQueue":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ------------------------------------------------------
+    #  Rows
+    # ------------------------------------------------------
+    def add(self, thread_id: str, interrupts, created_at: float = None) -> None:
+        """Record the Interrupt objects a thread is paused on."""
+        created_at = created_at if created_at is not None else time.time()
+        rows = [
+            (self.graph_name, thread_id, item.id, json.dumps(item.value, default=str), created_at)
+            for item in interrupts
+        ]
+        with self.lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO pending_interrupts (graph, thread_id, interrupt_id, value, created_at) "
+                "VALUES (?, ?, ?, ?, ?)", rows
+            )
+
+    def remove(self, thread_id: str) -> int:
+        """Forget every pending interrupt of a thread. Returns the number of rows removed."""
+        with self.lock:
+            return self.conn.execute(
+                "DELETE FROM pending_interrupts WHERE thread_id = ? AND graph = ?", (thread_id, self.graph_name)
+            ).rowcount
+
+    @staticmethod
+    def _item(row: tuple, now: float) -> dict:
+        thread_id, interrupt_id, value, created_at = row
+        return {
+            "thread_id": thread_id,
+            "interrupt_id": interrupt_id,
+            "value": json.loads(value) if value is not None else None,
+            "created_at": created_at,
+            "age_s": round(now - created_at, 1),
+        }
+
+    def list(self, limit: int = 50, older_than: float = None) -> list:
+        """
+        Pending interrupts (not being resumed right now), oldest first.
+        `older_than` (seconds) keeps only those waiting at least that long.
+        """
+        now = time.time()
+        cutoff = now - older_than if older_than is not None else now + 1
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT thread_id, interrupt_id, value, created_at FROM pending_interrupts "
+                "WHERE graph = ? AND created_at <= ? AND (claimed_at IS NULL OR claimed_at < ?) "
+                "ORDER BY created_at LIMIT ?",
+                (self.graph_name, cutoff, now - self.lease_s, limit),
+            ).fetchall()
+        return [self._item(row, now) for row in rows]
+
+    def get(self, thread_id: str) -> list:
+        """The pending interrupts of one thread (empty if it isn't paused, or is being resumed)."""
+        now = time.time()
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT thread_id, interrupt_id, value, created_at FROM pending_interrupts "
+                "WHERE thread_id = ? AND graph = ? AND (claimed_at IS NULL OR claimed_at < ?) ORDER BY created_at",
+                (thread_id, self.graph_name, now - self.lease_s),
+            ).fetchall()
+        return [self._item(row, now) for row in rows]
+
+    def count(self) -> int:
+        with self.lock:
+            return self.conn.execute(
+                "SELECT COUNT(*) FROM pending_interrupts WHERE graph = ? AND (claimed_at IS NULL OR claimed_at < ?)",
+                (self.graph_name, time.time() - self.lease_s),
+            ).fetchone()[0]
+
+    def _claim(self, thread_id: str) -> tuple:
+        """
+        Lease a thread's rows atomically, so only one caller can resume it.
+        Returns (claim token, rows); no rows if the thread isn't paused or another live claim holds it.
+        """
+        token = uuid.uuid4().hex
+        now = time.time()
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self.conn.execute(
+                    "SELECT interrupt_id, claimed_at FROM pending_interrupts WHERE thread_id = ? AND graph = ?",
+                    (thread_id, self.graph_name),
+                ).fetchall()
+                if any(claimed_at is not None and claimed_at >= now - self.lease_s for _, claimed_at in rows):
+                    rows = []   # someone else is resuming it
+                if rows:
+                    self.conn.execute(
+                        "UPDATE pending_interrupts SET claimed_at = ?, claimed_by = ? WHERE thread_id = ? AND graph = ?",
+                        (now, token, thread_id, self.graph_name),
+                    )
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+        return token, [interrupt_id for interrupt_id, _ in rows]
+
+    def _renew(self, token: str) -> None:
+        with self.lock:
+            self.conn.execute(
+                "UPDATE pending_interrupts SET claimed_at = ? WHERE claimed_by = ?", (time.time(), token)
+            )
+
+    def _release(self, token: str) -> None:
+        """Drop a claim: its rows are pending again."""
+        with self.lock:
+            self.conn.execute(
+                "UPDATE pending_interrupts SET claimed_at = NULL, claimed_by = NULL WHERE claimed_by = ?", (token,)
+            )
+
+    # ------------------------------------------------------
+    #  Running graphs
+    # ------------------------------------------------------
+    def stream(self, graph, inputs, config: dict, **stream_kwargs):
+        """
+        `graph.stream(inputs, config, **stream_kwargs)`, recording the thread's interrupts.
+        When the run ends without an interrupt, the thread is no longer pending.
+        """
+        thread_id = config["configurable"]["thread_id"]
+        interrupted = False
+        for event in graph.stream(inputs, config, **stream_kwargs):
+            interrupts = _interrupts_in(event)
+            if interrupts:
+                if not interrupted:
+                    self.remove(thread_id)   # replaces whatever the thread was waiting on before
+                    interrupted = True
+                self.add(thread_id, interrupts)
+            yield event
+        if not interrupted:
+            self.remove(thread_id)
+
+    def resume(self, graph, thread_id: str, value, interrupt_id: str = None, config: dict = None,
+               **stream_kwargs):
+        """
+        Resume a paused thread with `value` and stream the rest of its run (iterate the result).
+
+        With several pending interrupts, `interrupt_id` picks the one `value` answers;
+        `value` can also be a {interrupt_id: value} dict answering several at once.
+
+        Raises (when iterated):
+            KeyError: The thread has no pending interrupt (never paused, or already resumed).
+        """
+        token, interrupt_ids = self._claim(thread_id)
+        if not interrupt_ids:
+            raise KeyError(f"No pending interrupt for thread '{thread_id}'")
+        if interrupt_id is not None:
+            resume = {interrupt_id: value}
+        elif len(interrupt_ids) > 1 and not isinstance(value, dict):
+            resume = {claimed: value for claimed in interrupt_ids}
+        else:
+            resume = value
+        config = {**(config or {}), "configurable": {**(config or {}).get("configurable", {}), "thread_id": thread_id}}
+        renewed = time.monotonic()
+        try:
+            # stream() deletes the claimed rows when the run ends or pauses again, after the
+            # checkpoint that moved past them is written
+            for event in self.stream(graph, Command(resume=resume), config, **stream_kwargs):
+                if time.monotonic() - renewed > self.lease_s / 4:
+                    self._renew(token)
+                    renewed = time.monotonic()
+                yield event
+        except BaseException:
+            self._release(token)   # the thread is still paused: let it be resumed again
+            raise
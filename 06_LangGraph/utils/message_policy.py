@@ -0,0 +1,149 @@
+"""
+message_policy.py
+
+Keeps old tool outputs from being re-sent to the LLM on every turn.
+
+With `messages: Annotated[list, add_messages]` every ToolMessage (e.g. each TavilySearch result)
+stays in the prompt forever, so prompt size - and cost - grows with every search the
+conversation ever made. Two ways to bound it:
+
+1. `MessagePolicy` - applied to what the LLM receives; the state keeps the full history:
+       policy = MessagePolicy(keep_turns=3, max_tokens=8000)
+       llm_with_tools.invoke(policy(state["messages"]))
+   - Turns = a HumanMessage and everything after it, up to the next HumanMessage.
+   - Tool outputs older than `keep_turns` turns collapse into short stubs. The ToolMessage itself,
+     its tool_call_id and name stay, so the AI tool call it answers is still paired.
+   - If the prompt is still over `max_tokens`, the oldest whole turns are dropped (system messages
+     and the latest turn are always kept, so tool calls never lose their results).
+
+2. `evicting_add_messages(keep_turns)` - a drop-in reducer for the state itself:
+       messages: Annotated[list, evicting_add_messages(keep_turns=3)]
+   Old tool outputs are stubbed in the stored state too (smaller checkpoints, but the full
+   outputs are gone, and the stored list is no longer append-only).
+"""
+
+from langchain_core.messages import HumanMessage, SystemMessage, ToolMessage
+from langgraph.graph.message import add_messages
+
+from .tool_output import estimate_tokens
+
+
+STUB_PREVIEW_CHARS = 120
+
+
+def split_turns(messages: list) -> tuple:
+    """(leading system messages, [turn, ...]) where each turn starts at a HumanMessage."""
+    head, turns = [], []
+    for message in messages:
+        if isinstance(message, HumanMessage):
+            turns.append([message])
+        elif turns:
+            turns[-1].append(message)
+        elif isinstance(message, SystemMessage):
+            head.append(message)
+        else:
+            # Something other than a system prompt before the first human message
+            turns.append([message])
+    return head, turns
+
+
+def is_stub(message) -> bool:
+    return bool(message.additional_kwargs.get("evicted"))
+
+
+def stub_tool_message(message: ToolMessage, turns_ago: int) -> ToolMessage:
+    """Same ToolMessage (id, tool_call_id, name), with the output replaced by a short stub."""
+    if is_stub(message):
+        return message
+    content = message.content if isinstance(message.content, str) else str(message.content)
+    preview = " ".join(content[:STUB_PREVIEW_CHARS].split())
+    return message.model_copy(update={
+        "content": f"[Output of '{message.name or 'tool'}' from {turns_ago} turns ago, removed to save space. "
+                   f"It started: {preview}...]",
+        "additional_kwargs": {**message.additional_kwargs, "evicted": True},
+    })
+
+
+def evict_stale_tool_messages(messages: list, keep_turns: int) -> list:
+    """Stub the ToolMessages of every turn except the last `keep_turns`."""
+    head, turns = split_turns(messages)
+    if len(turns) <= keep_turns:
+        return list(messages)
+    result = list(head)
+    for index, turn in enumerate(turns):
+        turns_ago = len(turns) - 1 - index
+        if turns_ago >= keep_turns:
+            turn = [stub_tool_message(m, turns_ago) if isinstance(m, ToolMessage) else m for m in turn]
+        result.extend(turn)
+    return result
+
+
+def count_tokens(message) -> int:
+    """Approximate prompt tokens of one message: content, tool call arguments, and a few per message."""
+    content = message.content if isinstance(message.content, str) else str(message.content)
+    tokens = estimate_tokens(content) + 4
+    for tool_call in getattr(message, "tool_calls", None) or []:
+        tokens += estimate_tokens(tool_call["name"] + str(tool_call["args"]))
+    return tokens
+
+
+class MessagePolicy:
+    """
+    Bounds what the LLM receives: recent turns intact, older tool outputs stubbed,
+    oldest turns dropped above a token ceiling.
+
+    Args:
+        keep_turns (int): Turns whose tool outputs are kept in full.
+        max_tokens (int): Token ceiling for the whole prompt. None disables trimming.
+    """
+
+    def __init__(self, keep_turns: int = 3, max_tokens: int = None) -> None:
+        self.keep_turns = keep_turns
+        self.max_tokens = max_tokens
+        # Token counts are asked for the same messages every turn; cache them by message id
+        self._token_cache = {}
+        self.stats = {"calls": 0, "tokens_in": 0, "tokens_out": 0, "turns_dropped": 0}
+
+    def _tokens(self, message) -> int:
+        if message.id is None:
+            return count_tokens(message)
+        if len(self._token_cache) > 50_000:
+            self._token_cache.clear()
+        key = (message.id, len(message.content) if isinstance(message.content, str) else None)
+        if key not in self._token_cache:
+            self._token_cache[key] = count_tokens(message)
+        return self._token_cache[key]
+
+    def __call__(self, messages: list) -> list:
+        self.stats["calls"] += 1
+        self.stats["tokens_in"] += sum(self._tokens(m) for m in messages)
+
+        messages = evict_stale_tool_messages(messages, self.keep_turns)
+        if self.max_tokens is not None:
+            head, turns = split_turns(messages)
+            turn_tokens = [sum(self._tokens(m) for m in turn) for turn in turns]
+            total = sum(self._tokens(m) for m in head) + sum(turn_tokens)
+            dropped = 0
+            while total > self.max_tokens and dropped < len(turns) - 1:
+                total -= turn_tokens[dropped]
+                dropped += 1
+            if dropped:
+                self.stats["turns_dropped"] += dropped
+                messages = head + [m for turn in turns[dropped:] for m in turn]
+
+        self.stats["tokens_out"] += sum(self._tokens(m) for m in messages)
+        return messages
+
+    def report(self) -> dict:
+        return {**self.stats, "tokens_saved": self.stats["tokens_in"] - self.stats["tokens_out"]}
+
+
+def evicting_add_messages(keep_turns: int = 3):
+    """
+    A reducer like `add_messages` that also stubs tool outputs older than `keep_turns` turns
+    in the stored state.
+    """
+    def reducer(left, right):
+        return evict_stale_tool_messages(add_messages(left, right), keep_turns)
+
+    return reducer
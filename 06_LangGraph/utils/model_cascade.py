@@ -0,0 +1,268 @@
+"""
+model_cascade.py
+
+A chat model that tries the cheapest/fastest model first and escalates to a bigger one only when needed.
+
+The cascade is a normal LangChain chat model, so it drops in wherever `init_chat_model(...)` or
+`ChatOpenAI(...)` is used (plain `invoke`, `bind_tools`, LangGraph nodes, agents).
+
+For every request:
+1. A cheap complexity estimate decides the starting tier (very long / "hard" prompts start at the top).
+2. The tier's answer is checked; it escalates to the next tier when:
+   - the call itself failed,
+   - the model produced malformed tool calls (`invalid_tool_calls`) or called an unknown tool,
+   - a user-supplied validator rejects the answer,
+   - the confidence check fails (mean token probability when logprobs are available,
+     otherwise an empty or hedging answer).
+3. The last tier's answer is always accepted.
+
+The token-probability check only runs on tiers that return logprobs: build the OpenAI tiers that
+can escalate with `logprobs=True` (`from_model_names` does this for "openai:" names). Without them
+only the empty/hedging-answer check applies.
+
+Scope: the cascade is wired into the 06_LangGraph examples (01_graph_simple.py,
+02_02_graph_with_tool.py) and benchmarks/bench_model_cascade.py. The 00-05 scripts still call
+their single model directly.
+
+Every routing decision is logged on the "model_cascade" logger and kept in `cascade.decisions`,
+and `cascade.report()` summarizes calls, escalations, latency and cost per tier.
+"""
+
+import logging
+import math
+import time
+from typing import Any, Callable, Optional
+
+from langchain_core.callbacks import CallbackManager
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import Field
+
+
+logger = logging.getLogger("model_cascade")
+
+# USD per 1M tokens (input, output), used for cost reporting only
+PRICES = {
+    "gpt-3.5-turbo": (0.50, 1.50),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1": (2.00, 8.00),
+}
+
+# Phrases that usually mean the small model is out of its depth
+HEDGES = (
+    "i'm not sure",
+    "i am not sure",
+    "i don't know",
+    "i do not know",
+    "i cannot determine",
+    "i can't determine",
+    "unable to answer",
+)
+
+# Words that hint at a multi-step / reasoning-heavy request
+HARD_HINTS = ("step by step", "prove", "analyze", "analyse", "compare", "derive", "design", "refactor", "debug")
+
+
+def model_name(model: Any) -> str:
+    """Best-effort model name of a chat model (or a tool-bound chat model)."""
+    bound = getattr(model, "bound", model)
+    name = getattr(bound, "model_name", None) or getattr(bound, "model", None)
+    return str(name) if name else type(bound).__name__
+
+
+def estimate_complexity(messages: list) -> float:
+    """
+    Rough request complexity: approximate prompt tokens (chars / 4),
+    plus a bonus for each "hard" hint word in the last message.
+    """
+    texts = [m.content if isinstance(m.content, str) else str(m.content) for m in messages]
+    score = sum(len(t) for t in texts) / 4
+    last = texts[-1].lower() if texts else ""
+    score += 500 * sum(hint in last for hint in HARD_HINTS)
+    return score
+
+
+def confidence(message: AIMessage) -> Optional[float]:
+    """Mean token probability from OpenAI logprobs, or None when the model didn't return them."""
+    logprobs = (message.response_metadata or {}).get("logprobs") or {}
+    tokens = logprobs.get("content") or []
+    if not tokens:
+        return None
+    return sum(math.exp(t["logprob"]) for t in tokens) / len(tokens)
+
+
+class CascadeChatModel(BaseChatModel):
+    """
+    Chat model that escalates through `tiers` (cheapest first).
+
+    Args:
+        tiers (list): Chat models (or tool-bound chat models), cheapest/fastest first.
+        validator: Optional function (messages, AIMessage) -> bool; False escalates.
+        min_confidence (float): Escalate when the mean token probability is below this
+            (only for tiers built with logprobs=True).
+        complexity_threshold (float): Requests scoring at least this start at the last tier.
+        tool_names (list[str]): Tools bound with bind_tools(); calls to any other name escalate.
+    """
+
+    tiers: list
+    validator: Optional[Callable] = None
+    min_confidence: float = 0.6
+    complexity_threshold: float = 4000
+    tool_names: list = Field(default_factory=list)
+    decisions: list = Field(default_factory=list)
+    max_decisions: int = 1000
+
+    @classmethod
+    def from_model_names(cls, names: list, **kwargs) -> "CascadeChatModel":
+        """
+        Build a cascade from init_chat_model names, e.g. ["openai:gpt-4.1-mini", "openai:gpt-4.1"].
+        OpenAI tiers that can escalate request logprobs, so min_confidence applies to them.
+        """
+        from langchain.chat_models import init_chat_model
+        tiers = [
+            init_chat_model(name, logprobs=True) if name.startswith("openai:") and i < len(names) - 1
+            else init_chat_model(name)
+            for i, name in enumerate(names)
+        ]
+        return cls(tiers=tiers, **kwargs)
+
+    @property
+    def _llm_type(self) -> str:
+        return "cascade"
+
+    def bind_tools(self, tools: list, **kwargs: Any) -> "CascadeChatModel":
+        """Bind the tools to every tier. The decision log is shared with the unbound cascade."""
+        bound = self.model_copy(update={"tiers": [tier.bind_tools(tools, **kwargs) for tier in self.tiers]})
+        bound.tool_names = [getattr(t, "name", None) or getattr(t, "__name__", str(t)) for t in tools]
+        bound.decisions = self.decisions
+        return bound
+
+    # ------------------------------------------------------
+    #  Routing
+    # ------------------------------------------------------
+    def _start_tier(self, messages: list) -> int:
+        if len(self.tiers) > 1 and estimate_complexity(messages) >= self.complexity_threshold:
+            return len(self.tiers) - 1
+        return 0
+
+    def _escalation_reason(self, messages: list, message: AIMessage) -> Optional[str]:
+        """Why this answer is not good enough, or None to accept it."""
+        if getattr(message, "invalid_tool_calls", None):
+            return "invalid tool call"
+        if self.tool_names:
+            unknown = [c["name"] for c in message.tool_calls if c["name"] not in self.tool_names]
+            if unknown:
+                return f"unknown tool {unknown[0]}"
+        if self.validator is not None and not self.validator(messages, message):
+            return "validator rejected"
+        if not message.tool_calls:
+            text = message.content if isinstance(message.content, str) else str(message.content)
+            if not text.strip():
+                return "empty answer"
+            if any(hedge in text.lower() for hedge in HEDGES):
+                return "low confidence (hedging)"
+        score = confidence(message)
+        if score is not None and score < self.min_confidence:
+            return f"low confidence ({score:.2f})"
+        return None
+
+    def _record(self, tier: int, latency: float, message: Optional[AIMessage], reason: Optional[str]) -> None:
+        name = model_name(self.tiers[tier])
+        usage = (getattr(message, "usage_metadata", None) or {}) if message is not None else {}
+        price_in, price_out = PRICES.get(name, (0.0, 0.0))
+        cost = (usage.get("input_tokens", 0) * price_in + usage.get("output_tokens", 0) * price_out) / 1e6
+        # The last tier's answer is kept even when a check fails; only a failed call is not an answer
+        accepted = reason is None or (tier == len(self.tiers) - 1 and message is not None)
+        decision = {
+            "tier": tier,
+            "model": name,
+            "latency_ms": round(latency * 1000, 1),
+            "cost_usd": cost,
+            "accepted": accepted,
+            "reason": reason,
+        }
+        self.decisions.append(decision)
+        if len(self.decisions) > self.max_decisions:
+            del self.decisions[: len(self.decisions) - self.max_decisions]
+        if accepted:
+            logger.info("cascade: answered by %s in %.0f ms", name, latency * 1000)
+        else:
+            logger.info("cascade: escalating from %s (%s)", name, reason)
+
+    # ------------------------------------------------------
+    #  BaseChatModel interface
+    # ------------------------------------------------------
+    @staticmethod
+    def _tier_config(run_manager) -> dict:
+        # Tier calls are child runs of the cascade's run, so callbacks - and with them LangGraph's
+        # stream_mode="messages" - see the tier's tokens as they are generated
+        if run_manager is None:
+            return {}
+        callbacks = CallbackManager(handlers=[], parent_run_id=run_manager.run_id)
+        callbacks.set_handlers(run_manager.inheritable_handlers)
+        callbacks.add_tags(run_manager.inheritable_tags)
+        callbacks.add_metadata(run_manager.inheritable_metadata)
+        return {"callbacks": callbacks}
+
+    def _generate(self, messages: list, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        start = self._start_tier(messages)
+        if start:
+            logger.info("cascade: complex request, starting at %s", model_name(self.tiers[start]))
+        for tier in range(start, len(self.tiers)):
+            last = tier == len(self.tiers) - 1
+            t0 = time.perf_counter()
+            try:
+                message = self.tiers[tier].invoke(messages, self._tier_config(run_manager), stop=stop, **kwargs)
+            except Exception as e:
+                self._record(tier, time.perf_counter() - t0, None, f"error: {e}")
+                if last:
+                    raise
+                continue
+            reason = self._escalation_reason(messages, message)
+            self._record(tier, time.perf_counter() - t0, message, reason)
+            if reason is None or last:
+                return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages: list, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        start = self._start_tier(messages)
+        if start:
+            logger.info("cascade: complex request, starting at %s", model_name(self.tiers[start]))
+        for tier in range(start, len(self.tiers)):
+            last = tier == len(self.tiers) - 1
+            t0 = time.perf_counter()
+            try:
+                message = await self.tiers[tier].ainvoke(messages, self._tier_config(run_manager), stop=stop, **kwargs)
+            except Exception as e:
+                self._record(tier, time.perf_counter() - t0, None, f"error: {e}")
+                if last:
+                    raise
+                continue
+            reason = self._escalation_reason(messages, message)
+            self._record(tier, time.perf_counter() - t0, message, reason)
+            if reason is None or last:
+                return ChatResult(generations=[ChatGeneration(message=message)])
+
+    # ------------------------------------------------------
+    #  Reporting
+    # ------------------------------------------------------
+    def report(self) -> dict:
+        """Calls, accepted answers, latency and cost per model, from the decision log."""
+        per_model = {}
+        for d in self.decisions:
+            row = per_model.setdefault(d["model"], {"calls": 0, "accepted": 0, "latency_ms": 0.0, "cost_usd": 0.0})
+            row["calls"] += 1
+            row["accepted"] += d["accepted"]
+            row["latency_ms"] += d["latency_ms"]
+            row["cost_usd"] += d["cost_usd"]
+        requests = sum(d["accepted"] for d in self.decisions)
+        escalations = sum(not d["accepted"] for d in self.decisions)
+        return {
+            "requests": requests,
+            "escalations": escalations,
+            "escalation_rate": round(escalations / requests, 3) if requests else 0.0,
+            "per_model": per_model,
+        }
@@ -0,0 +1,320 @@
+"""
+node_cache.py
+
+Memoization for graph nodes that call an LLM.
+
+A `chatbot` node calls `llm.invoke(state["messages"])` even when it has answered exactly the same
+history before - replayed threads, regression runs, the same first question in every session.
+`NodeCache.wrap(node)` returns a node that looks its input up first:
+
+    - The key is a canonical hash of the node's input state slice (by default `messages`) and the
+      model's configuration (model name, parameters, bound tools). Message ids, tool call ids,
+      response metadata and token usage are left out, so the same conversation hashes the same
+      in every thread and every run.
+    - On a hit the stored output is returned with fresh message and tool call ids (so `add_messages`
+      appends it instead of replacing an earlier message with the same id).
+    - Backends: `MemoryCache` (LRU, per process) or `SqliteCache` (on disk, shared by processes and
+      runs, LRU eviction above `max_entries` and optional `ttl`).
+    - `report()` gives hits, misses, hit rate and the LLM time saved, per node.
+
+Only cache nodes whose answer may be reused: with temperature > 0, a hit replays one sample
+instead of drawing a new one. That is why the examples build theirs with `NodeCache.from_env()`,
+which is off unless asked for:
+
+Environment:
+    NODE_CACHE=1              cache in node_cache.db (default: off, every turn calls the LLM)
+    NODE_CACHE_TTL=600        seconds an answer stays valid (default 600; 0 keeps it until evicted,
+                              for benchmarks and regression runs that replay the same conversations)
+
+Usage:
+    node_cache = NodeCache(SqliteCache("node_cache.db", max_entries=10_000))
+    graph_builder.add_node("chatbot", node_cache.wrap(chatbot, model=llm_with_tools))
+    ...
+    node_cache.print_report()
+"""
+
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from langchain_core.messages import AIMessage, BaseMessage
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+
+# ------------------------------------------------------
+#  Canonical keys
+# ------------------------------------------------------
+def _canonical_message(message, call_ids: dict):
+    """What a message means to the model: type, content, name and tool calls - no ids or metadata."""
+    if isinstance(message, dict):
+        return {"role": message.get("role") or message.get("type"), "content": message.get("content")}
+    if not isinstance(message, BaseMessage):
+        return message
+    canonical = {"type": message.type, "content": message.content}
+    if message.name:
+        canonical["name"] = message.name
+    # Tool call ids are random; number them in order of appearance so they still pair up
+    for tool_call in getattr(message, "tool_calls", None) or []:
+        call_ids.setdefault(tool_call["id"], len(call_ids))
+    if getattr(message, "tool_calls", None):
+        canonical["tool_calls"] = [
+            {"name": c["name"], "args": c["args"], "id": call_ids[c["id"]]} for c in message.tool_calls
+        ]
+    if getattr(message, "tool_call_id", None):
+        canonical["tool_call_id"] = call_ids.setdefault(message.tool_call_id, len(call_ids))
+    return canonical
+
+
+def model_fingerprint(model):
+    """The parts of a chat model's setup that change its answers: class, model, parameters, bound tools."""
+    if model is None:
+        return None
+    if hasattr(model, "tiers"):   # CascadeChatModel
+        return {"cascade": [model_fingerprint(tier) for tier in model.tiers]}
+    if hasattr(model, "bound"):   # RunnableBinding, e.g. llm.bind_tools(tools)
+        return {"model": model_fingerprint(model.bound), "kwargs": getattr(model, "kwargs", {})}
+    params = getattr(model, "_identifying_params", None)
+    return {"class": type(model).__name__, **(dict(params) if params else {})}
+
+
+def canonical_key(node_name: str, inputs: dict, model=None) -> str:
+    """sha256 of the node name, its canonical input slice and the model fingerprint."""
+    call_ids = {}
+    canonical = {
+        key: [_canonical_message(m, call_ids) for m in value] if isinstance(value, list) else value
+        for key, value in sorted(inputs.items())
+    }
+    payload = json.dumps(
+        {"node": node_name, "inputs": canonical, "model": model_fingerprint(model)},
+        sort_keys=True, default=str, separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _fresh_ids(value):
+    """A copy of a node output whose messages get new ids (and AI tool calls new tool call ids)."""
+    if isinstance(value, BaseMessage):
+        update = {"id": None}
+        if isinstance(value, AIMessage) and value.tool_calls:
+            update["tool_calls"] = [{**c, "id": f"call_{uuid.uuid4().hex[:24]}"} for c in value.tool_calls]
+        return value.model_copy(update=update)
+    if isinstance(value, list):
+        return [_fresh_ids(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _fresh_ids(v) for k, v in value.items()}
+    return value
+
+
+# ------------------------------------------------------
+#  Backends
+# ------------------------------------------------------
+class MemoryCache:
+    """In-process cache of the `max_entries` most recently used node outputs."""
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, node: str, value, elapsed_ms: float) -> None:
+        with self._lock:
+            self._entries[key] = (value, elapsed_ms)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SqliteCache:
+    """
+    Node outputs in a SQLite file, so they are reused across processes and runs.
+
+    Args:
+        path (str): SQLite database file.
+        max_entries (int): Evict the least recently used entries above this many. None keeps everything.
+        ttl (float): Seconds an entry stays valid. None never expires.
+    """
+
+    def __init__(self, path: str = "node_cache.db", max_entries: int = 10_000, ttl: float = None,
+                 serde=None) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.serde = serde or JsonPlusSerializer()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS node_cache (
+                key TEXT PRIMARY KEY,
+                node TEXT NOT NULL,
+                type TEXT,
+                value BLOB,
+                elapsed_ms REAL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_node_cache_last_used ON node_cache (last_used);
+        """)
+        self._lock = threading.Lock()
+        self._puts = 0
+
+    def get(self, key: str):
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT type, value, elapsed_ms, created_at FROM node_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            type_, blob, elapsed_ms, created_at = row
+            now = time.time()
+            if self.ttl is not None and now - created_at > self.ttl:
+                self.conn.execute("DELETE FROM node_cache WHERE key = ?", (key,))
+                return None
+            self.conn.execute("UPDATE node_cache SET last_used = ? WHERE key = ?", (now, key))
+        return self.serde.loads_typed((type_, blob)), elapsed_ms
+
+    def put(self, key: str, node: str, value, elapsed_ms: float) -> None:
+        type_, blob = self.serde.dumps_typed(value)
+        now = time.time()
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO node_cache VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, node, type_, blob, elapsed_ms, now, now),
+            )
+            self._puts += 1
+            # Counting rows on every put would cost more than the put; check every 100 puts
+            if self.max_entries is not None and self._puts % 100 == 1:
+                self._evict()
+
+    def _evict(self) -> None:
+        excess = self.conn.execute("SELECT COUNT(*) FROM node_cache").fetchone()[0] - self.max_entries
+        if excess > 0:
+            # Evict a little more than needed, so eviction doesn't run on every check
+            self.conn.execute(
+                "DELETE FROM node_cache WHERE key IN (SELECT key FROM node_cache ORDER BY last_used LIMIT ?)",
+                (excess + self.max_entries // 10,),
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self.conn.execute("DELETE FROM node_cache")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM node_cache").fetchone()[0]
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+# ------------------------------------------------------
+#  Node wrapper
+# ------------------------------------------------------
+class NodeCache:
+    """
+    Wraps graph nodes so identical inputs are answered from a cache backend.
+
+    Args:
+        backend: MemoryCache (default) or SqliteCache.
+        enabled (bool): False makes wrapped nodes call straight through (nothing read or stored).
+    """
+
+    def __init__(self, backend=None, enabled: bool = True) -> None:
+        self.backend = backend if backend is not None else MemoryCache()
+        self.enabled = enabled
+        self.stats = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, path: str = "node_cache.db", max_entries: int = 10_000) -> "NodeCache":
+        """
+        A SqliteCache-backed NodeCache if NODE_CACHE is set, with a NODE_CACHE_TTL ttl;
+        otherwise a disabled one (no file is created).
+        """
+        if os.getenv("NODE_CACHE", "0").lower() not in ("1", "true", "yes", "on"):
+            return cls(enabled=False)
+        ttl = float(os.getenv("NODE_CACHE_TTL", "600")) or None
+        return cls(SqliteCache(path, max_entries=max_entries, ttl=ttl))
+
+    def _count(self, node: str, field: str, amount: float = 1) -> None:
+        with self._lock:
+            row = self.stats.setdefault(node, {"hits": 0, "misses": 0, "saved_ms": 0.0, "lookup_ms": 0.0})
+            row[field] += amount
+
+    def wrap(self, node_fn, model=None, name: str = None, keys: tuple = ("messages",)):
+        """
+        A cached version of `node_fn(state)`.
+
+        Args:
+            node_fn: The node function.
+            model: The chat model (or tool-bound model) the node calls; part of the key.
+            name (str): Node name in keys and reports. Defaults to the function's name.
+            keys (tuple): State keys the node's output depends on.
+        """
+        node_name = name or getattr(node_fn, "__name__", "node")
+
+        @functools.wraps(node_fn)
+        def cached(state):
+            if not self.enabled:
+                return node_fn(state)
+            start = time.perf_counter()
+            key = canonical_key(node_name, {k: state.get(k) for k in keys}, model)
+            entry = self.backend.get(key)
+            self._count(node_name, "lookup_ms", (time.perf_counter() - start) * 1000)
+            if entry is not None:
+                value, elapsed_ms = entry
+                self._count(node_name, "hits")
+                self._count(node_name, "saved_ms", elapsed_ms or 0.0)
+                return _fresh_ids(value)
+            self._count(node_name, "misses")
+            start = time.perf_counter()
+            output = node_fn(state)
+            self.backend.put(key, node_name, output, (time.perf_counter() - start) * 1000)
+            return output
+
+        return cached
+
+    def report(self) -> dict:
+        """Per node: hits, misses, hit rate, LLM time saved and time spent on lookups."""
+        report = {}
+        for node, row in self.stats.items():
+            calls = row["hits"] + row["misses"]
+            report[node] = {
+                "hits": row["hits"],
+                "misses": row["misses"],
+                "hit_rate": round(row["hits"] / calls, 3) if calls else 0.0,
+                "saved_ms": round(row["saved_ms"], 1),
+                "lookup_ms": round(row["lookup_ms"], 1),
+            }
+        return report
+
+    def print_report(self) -> None:
+        report = self.report()
+        if not report:
+            return
+        print("-----------------------------------------")
+        print(f"{'node':<16}{'hits':>7}{'misses':>8}{'hit rate':>10}{'saved s':>9}{'lookup ms':>11}")
+        for node, row in report.items():
+            print(f"{node:<16}{row['hits']:>7}{row['misses']:>8}{row['hit_rate']:>10.0%}"
+                  f"{row['saved_ms'] / 1000:>9.1f}{row['lookup_ms']:>11.1f}")
+        print("-----------------------------------------")
@@ -1,36 +1,182 @@
+import asyncio
+import contextvars
 import json
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError as FutureTimeoutError, wait
 
 from langchain_core.messages import ToolMessage
 
 
+# While some calls are still queued for a worker, re-check their deadlines at least this often
+_POLL_INTERVAL = 0.05
+
+
 class BasicToolNode:
     """
     A node that runs the tools requested in the last AIMessage.
 
     - Finds out which tools the LLM has called
-    - Invokes those tools with provided arguments
+    - Invokes those tools with provided arguments, concurrently when there are several
     - Wraps the results into ToolMessage objects (so the LLM can process them)
-    - Returns those messages back to the graph
+    - Returns those messages back to the graph, in the same order as `message.tool_calls`
+
+    Sync graphs (`graph.invoke`) run the calls on a bounded thread pool; async graphs can use
+    `ainvoke`, which awaits every tool's `ainvoke` on the event loop:
+        tool_node = BasicToolNode(tools, timeout=10)
+        graph_builder.add_node("tools", tool_node)                                          # sync
+        graph_builder.add_node("tools", RunnableLambda(tool_node, afunc=tool_node.ainvoke))  # sync + async
+
+    Args:
+        tools (list): The tools the LLM may call.
+        max_workers (int): Most tool calls running at the same time.
+        timeout (float): Seconds a tool call may run before it is answered with an error ToolMessage.
+            None waits forever. A sync call cannot be stopped, so one that timed out keeps its
+            pool worker until it returns: size `max_workers` for the calls that may hang.
+        timeouts (dict): Per-tool overrides of `timeout`, by tool name.
+        sequential (bool): Run the calls one after another (the old behaviour), e.g. for tools
+            that are not thread-safe.
+        compactor (ToolOutputCompactor): Shrinks results to per-tool size budgets before they go into
+            `messages` (see tool_output.py). Its fetch_full_result tool is added to the node's tools.
     """
 
-    def __init__(self, tools: list) -> None:
+    def __init__(self, tools: list, max_workers: int = 8, timeout: float = None,
+                 timeouts: dict = None, sequential: bool = False, compactor=None) -> None:
         self.tools_by_name = {tool.name: tool for tool in tools}
+        self.compactor = compactor
+        if compactor is not None and compactor.fetch_tool is not None:
+            self.tools_by_name.setdefault(compactor.fetch_tool.name, compactor.fetch_tool)
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.timeouts = timeouts or {}
+        self.sequential = sequential
+        self._executor = None
 
-    def __call__(self, inputs: dict):
+    # ------------------------------------------------------
+    #  Helpers
+    # ------------------------------------------------------
+    @staticmethod
+    def _tool_calls(inputs: dict) -> list:
         if messages := inputs.get("messages", []):
-            message = messages[-1]
+            return messages[-1].tool_calls
+        raise ValueError("No message found in input")
+
+    def _timeout_for(self, tool_call: dict):
+        return self.timeouts.get(tool_call["name"], self.timeout)
+
+    def _result_message(self, tool_call: dict, tool_result) -> ToolMessage:
+        if self.compactor is not None:
+            content = self.compactor.compact(tool_call["name"], tool_call["id"], tool_result, tool_call["args"])
         else:
-            raise ValueError("No message found in input")
-        outputs = []
-        for tool_call in message.tool_calls:
-            tool_result = self.tools_by_name[tool_call["name"]].invoke(
-                tool_call["args"]
-            )
-            outputs.append(
-                ToolMessage(
-                    content=json.dumps(tool_result),
-                    name=tool_call["name"],
-                    tool_call_id=tool_call["id"],
-                )
+            content = json.dumps(tool_result)
+        return ToolMessage(
+            content=content,
+            name=tool_call["name"],
+            tool_call_id=tool_call["id"],
+        )
+
+    def _timeout_message(self, tool_call: dict) -> ToolMessage:
+        return ToolMessage(
+            content=json.dumps(f"Error: tool '{tool_call['name']}' timed out after {self._timeout_for(tool_call)}s"),
+            name=tool_call["name"],
+            tool_call_id=tool_call["id"],
+            status="error",
+        )
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # One pool per node, reused across steps; a timed-out call keeps its worker until it returns
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="tool")
+        return self._executor
+
+    # ------------------------------------------------------
+    #  Sync: bounded thread pool
+    # ------------------------------------------------------
+    def __call__(self, inputs: dict):
+        tool_calls = self._tool_calls(inputs)
+        if self.sequential or len(tool_calls) <= 1:
+            return {"messages": [self._run_sequential(tool_call) for tool_call in tool_calls]}
+        return {"messages": self._run_threaded(tool_calls)}
+
+    def _run_sequential(self, tool_call: dict) -> ToolMessage:
+        tool = self.tools_by_name[tool_call["name"]]
+        timeout = self._timeout_for(tool_call)
+        if timeout is None:
+            return self._result_message(tool_call, tool.invoke(tool_call["args"]))
+        # Run in a copy of the caller's context, so the run config (callbacks, tracing) and other
+        # contextvars reach the tool on the worker thread
+        future = self._get_executor().submit(contextvars.copy_context().run, tool.invoke, tool_call["args"])
+        try:
+            return self._result_message(tool_call, future.result(timeout=timeout))
+        except FutureTimeoutError:
+            return self._timeout_message(tool_call)
+
+    def _run_threaded(self, tool_calls: list) -> list:
+        started = {}
+
+        def run(index: int, tool_call: dict):
+            # Timeouts count from when a worker picks the call up, not from when it was queued
+            started[index] = time.monotonic()
+            return self.tools_by_name[tool_call["name"]].invoke(tool_call["args"])
+
+        # Look every tool up first, so an unknown tool fails before anything runs
+        for tool_call in tool_calls:
+            self.tools_by_name[tool_call["name"]]
+        executor = self._get_executor()
+        # A copy of the caller's context per call (one context can't be entered by two threads at once)
+        futures = {
+            executor.submit(contextvars.copy_context().run, run, i, tool_call): i
+            for i, tool_call in enumerate(tool_calls)
+        }
+        outputs = [None] * len(tool_calls)
+        pending = set(futures)
+        while pending:
+            now = time.monotonic()
+            deadlines = []
+            for future in list(pending):
+                index = futures[future]
+                timeout = self._timeout_for(tool_calls[index])
+                if timeout is None or index not in started:
+                    continue
+                deadline = started[index] + timeout
+                if now >= deadline and not future.done():
+                    outputs[index] = self._timeout_message(tool_calls[index])
+                    pending.discard(future)
+                else:
+                    deadlines.append(deadline)
+            if not pending:
+                break
+            # Sleep until the next call finishes or the next deadline passes
+            wait_for = max(min(deadlines) - now, 0) if deadlines else None
+            queued_with_timeout = any(
+                futures[f] not in started and self._timeout_for(tool_calls[futures[f]]) is not None for f in pending
             )
-        return {"messages": outputs}
+            if queued_with_timeout:
+                wait_for = _POLL_INTERVAL if wait_for is None else min(wait_for, _POLL_INTERVAL)
+            done, _ = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = futures[future]
+                pending.discard(future)
+                # Re-raises the tool's exception, like the sequential loop did
+                outputs[index] = self._result_message(tool_calls[index], future.result())
+        return outputs
+
+    # ------------------------------------------------------
+    #  Async: tool.ainvoke on the event loop
+    # ------------------------------------------------------
+    async def ainvoke(self, inputs: dict):
+        tool_calls = self._tool_calls(inputs)
+        tools = [self.tools_by_name[tool_call["name"]] for tool_call in tool_calls]
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def run(tool, tool_call: dict) -> ToolMessage:
+            async with semaphore:
+                try:
+                    tool_result = await asyncio.wait_for(tool.ainvoke(tool_call["args"]), self._timeout_for(tool_call))
+                except asyncio.TimeoutError:
+                    return self._timeout_message(tool_call)
+            return self._result_message(tool_call, tool_result)
+
+        if self.sequential:
+            return {"messages": [await run(tool, tool_call) for tool, tool_call in zip(tools, tool_calls)]}
+        # gather keeps the order of tool_calls
+        return {"messages": list(await asyncio.gather(*(run(tool, tool_call) for tool, tool_call in zip(tools, tool_calls))))}
@@ -0,0 +1,112 @@
+"""
+registry.py
+
+Build chat models and other expensive components on first use, not at import time.
+
+`init_chat_model("openai:...")` imports langchain_openai and the openai SDK, about 0.6 s on top of
+langgraph, and every example paid it before its first prompt. A `LazyRegistry` holds factories
+instead:
+
+    - `registry.get(name)` builds the component the first time it is asked for, then returns the
+      same object; call it inside node functions
+    - `registry.lazy(name)` returns a stand-in that builds the component the first time one of its
+      attributes is used, for arguments like `NodeCache.wrap(model=...)` that are only used at run time
+    - `registry.prefetch()` builds everything on a background thread, e.g. while the CLI waits for
+      the user to type; a node that needs a component before then waits for that one build
+    - each component is built once, even when several threads ask for it at the same time
+    - `report()` gives the build time of each component (None if never built)
+
+Don't write `llm.invoke(...)` with a lazy stand-in inside a node: `compile()` reads the attributes
+a node function uses (looking for subgraphs), which would build it right there. Code that checks
+types (`isinstance`, ToolNode's tool list, `bind_tools`) needs the real object too - register a
+factory that does the binding instead.
+
+Usage:
+    registry = LazyRegistry()
+    registry.register("llm", lambda: init_chat_model("openai:gpt-4.1").bind_tools(tools))
+
+    def chatbot(state):
+        return {"messages": [registry.get("llm").invoke(state["messages"])]}
+
+    graph_builder.add_node("chatbot", node_cache.wrap(chatbot, model=registry.lazy("llm")))
+    ...
+    registry.prefetch()                 # before the first input()
+"""
+
+import threading
+import time
+
+
+class LazyComponent:
+    """Stand-in for a registered component: attribute access builds it (once) and forwards to it."""
+
+    def __init__(self, registry: "LazyRegistry", name: str) -> None:
+        object.__setattr__(self, "_registry", registry)
+        object.__setattr__(self, "_name", name)
+
+    def __getattr__(self, attr: str):
+        return getattr(self._registry.get(self._name), attr)
+
+    def __call__(self, *args, **kwargs):
+        return self._registry.get(self._name)(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        state = "built" if self._name in self._registry._built else "not built"
+        return f"<lazy {self._name!r} ({state})>"
+
+
+class LazyRegistry:
+    """Named factories whose results are built on first use and then shared."""
+
+    def __init__(self) -> None:
+        self._factories = {}
+        self._built = {}
+        self._build_ms = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, factory=None):
+        """Register `factory()` under `name`. Without a factory, returns a decorator."""
+        if factory is None:
+            return lambda fn: self.register(name, fn) or fn
+        with self._lock:
+            self._factories[name] = factory
+            self._locks[name] = threading.Lock()
+            self._built.pop(name, None)
+
+    def get(self, name: str):
+        """The component, built now if this is its first use."""
+        try:
+            return self._built[name]
+        except KeyError:
+            pass
+        if name not in self._factories:
+            raise KeyError(f"Nothing registered as {name!r}")
+        with self._locks[name]:
+            if name not in self._built:   # another thread may have built it while we waited
+                start = time.perf_counter()
+                self._built[name] = self._factories[name]()
+                self._build_ms[name] = (time.perf_counter() - start) * 1000
+        return self._built[name]
+
+    def lazy(self, name: str) -> LazyComponent:
+        return LazyComponent(self, name)
+
+    def prefetch(self, *names: str) -> threading.Thread:
+        """Build `names` (default: everything registered) on a daemon thread. Errors surface on first use."""
+        def build():
+            for name in names or list(self._factories):
+                try:
+                    self.get(name)
+                except Exception:
+                    pass   # get() will raise it again where the component is actually needed
+
+        thread = threading.Thread(target=build, name="registry-prefetch", daemon=True)
+        thread.start()
+        return thread
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._factories
+
+    def report(self) -> dict:
+        return {name: round(self._build_ms[name], 1) if name in self._build_ms else None for name in self._factories}
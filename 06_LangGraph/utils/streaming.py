@@ -0,0 +1,200 @@
+"""
+streaming.py
+
+Prints a graph's answer token by token, instead of all at once when the LLM call finishes.
+
+`graph.stream(inputs)` with the default stream mode ("updates") yields each node's output after
+the node is done, so the user stares at an empty prompt for the whole `llm.invoke`. `stream_chat()`
+streams with stream_mode=["messages", "updates"]:
+    - "messages": LLM tokens as they are generated (from any chat model called inside a node)
+    - "updates":  node completions, used to show tool progress
+
+For every turn it prints:
+    Assistant: LangGraph is a library for ...          <- tokens, as they arrive
+    [tool] tavily_search({"query": "..."}) ...         <- tool call requested by the LLM
+    [tool] tavily_search done (2,154 chars, 812 ms)    <- tool finished
+    (first token 412 ms, total 2,310 ms, 1 tool call)
+
+Usage:
+    from utils import stream_chat
+    stream_chat(graph, user_input)
+    stream_chat(graph, user_input, config={"configurable": {"thread_id": "1"}})
+"""
+
+import json
+import time
+
+from langchain_core.messages import AIMessageChunk, BaseMessage, ToolMessage
+
+
+def _text(content) -> str:
+    """Text of a message or chunk content (a string, or a list of content blocks)."""
+    if isinstance(content, str):
+        return content
+    return "".join(block.get("text", "") if isinstance(block, dict) else str(block) for block in content)
+
+
+def _short(value, limit: int = 60) -> str:
+    text = value if isinstance(value, str) else json.dumps(value, default=str)
+    return text if len(text) <= limit else text[: limit - 3] + "..."
+
+
+class TurnPrinter:
+    """
+    Turns the ("messages" | "updates", payload) events of one graph run into console output,
+    and keeps the turn's timings.
+    """
+
+    def __init__(self, out=print) -> None:
+        self.out = out
+        self.start = time.perf_counter()
+        self.first_token = None
+        self.chunks = 0
+        self.tool_calls = {}        # tool_call_id -> {"name", "args", "started"}
+        self.tool_results = 0
+        self._current = None        # (node, message id) of the message being printed
+        self._step_of_message = {}  # message id -> langgraph_step
+        self._line_open = False
+        self._pending_calls = {}    # index -> partial tool call (name / id / args json) of the message
+
+    def _ms(self, since: float = None) -> float:
+        return (time.perf_counter() - (since if since is not None else self.start)) * 1000
+
+    def _end_line(self) -> None:
+        if self._line_open:
+            self.out("")
+            self._line_open = False
+
+    # ------------------------------------------------------
+    #  "messages" events
+    # ------------------------------------------------------
+    def on_message(self, message: BaseMessage, metadata: dict) -> None:
+        if isinstance(message, ToolMessage) or message.type not in ("ai", "AIMessageChunk"):
+            return  # tool results are reported from "updates"; inputs are not echoed
+        node, step = metadata.get("langgraph_node"), metadata.get("langgraph_step")
+        key = (node, message.id)
+        if key != self._current:
+            self._flush_tool_calls()
+            if any(s == step for i, s in self._step_of_message.items() if i != message.id):
+                # Same node step, new message: the node called another model (e.g. a cascade escalating)
+                self._end_line()
+                self.out(f"[{node}] retrying with {metadata.get('ls_model_name') or 'another model'}")
+            self._step_of_message[message.id] = step
+            self._current = key
+            self._pending_calls = {}
+
+        text = _text(message.content)
+        if text:
+            if self.first_token is None:
+                self.first_token = self._ms()
+            if not self._line_open:
+                self.out("Assistant: ", end="", flush=True)
+                self._line_open = True
+            self.out(text, end="", flush=True)
+            self.chunks += 1
+
+        if isinstance(message, AIMessageChunk):
+            for chunk in message.tool_call_chunks:
+                call = self._pending_calls.setdefault(chunk.get("index") or 0, {"name": "", "id": None, "args": ""})
+                call["name"] += chunk.get("name") or ""
+                call["id"] = call["id"] or chunk.get("id")
+                call["args"] += chunk.get("args") or ""
+            # Calls are printed once complete: at the next message, node update or end of turn
+        else:
+            # A whole message (the model didn't stream)
+            for tool_call in message.tool_calls:
+                self._tool_call(tool_call["id"], tool_call["name"], tool_call["args"])
+
+    def _flush_tool_calls(self) -> None:
+        for call in self._pending_calls.values():
+            try:
+                args = json.loads(call["args"]) if call["args"] else {}
+            except ValueError:
+                args = call["args"]
+            self._tool_call(call["id"], call["name"], args)
+        self._pending_calls = {}
+
+    def _tool_call(self, call_id: str, name: str, args) -> None:
+        if call_id in self.tool_calls:
+            return
+        self.tool_calls[call_id] = {"name": name, "args": args, "started": time.perf_counter()}
+        self._end_line()
+        self.out(f"[tool] {name}({_short(args)}) ...")
+
+    # ------------------------------------------------------
+    #  "updates" events
+    # ------------------------------------------------------
+    def on_update(self, update: dict) -> None:
+        self._flush_tool_calls()
+        for node, value in (update or {}).items():
+            if node == "__interrupt__":
+                self._end_line()
+                for interrupt in value:
+                    self.out(f"[paused] {_short(interrupt.value, 120)}")
+                continue
+            messages = value.get("messages", []) if isinstance(value, dict) else []
+            for message in messages if isinstance(messages, list) else [messages]:
+                if isinstance(message, ToolMessage):
+                    self._tool_result(message)
+
+    def _tool_result(self, message: ToolMessage) -> None:
+        self.tool_results += 1
+        call = self.tool_calls.get(message.tool_call_id, {})
+        elapsed = f", {self._ms(call['started']):,.0f} ms" if call else ""
+        status = "failed" if message.status == "error" else "done"
+        self._end_line()
+        self.out(f"[tool] {message.name or call.get('name', 'tool')} {status} "
+                 f"({len(_text(message.content)):,} chars{elapsed})")
+
+    # ------------------------------------------------------
+    #  End of turn
+    # ------------------------------------------------------
+    def finish(self) -> dict:
+        self._flush_tool_calls()
+        self._end_line()
+        stats = {
+            "ttft_ms": round(self.first_token, 1) if self.first_token is not None else None,
+            "total_ms": round(self._ms(), 1),
+            "chunks": self.chunks,
+            "tool_calls": len(self.tool_calls),
+        }
+        first = f"first token {stats['ttft_ms']:,.0f} ms, " if stats["ttft_ms"] is not None else ""
+        calls = f", {stats['tool_calls']} tool call{'s' if stats['tool_calls'] != 1 else ''}" \
+            if stats["tool_calls"] else ""
+        self.out(f"({first}total {stats['total_ms']:,.0f} ms{calls})")
+        return stats
+
+
+def stream_chat(graph, user_input, config: dict = None, out=print) -> dict:
+    """
+    Run one chat turn through `graph`, printing LLM tokens and tool progress as they happen.
+
+    Args:
+        graph: A compiled graph whose state has a `messages` list.
+        user_input: The user's message (str), or any graph input (e.g. a `Command(resume=...)`).
+        config (dict): Run config, e.g. {"configurable": {"thread_id": "1"}} for graphs with memory.
+        out: print-like function used for all output.
+
+    Returns:
+        dict: {"ttft_ms", "total_ms", "chunks", "tool_calls"} for the turn.
+    """
+    inputs = {"messages": [{"role": "user", "content": user_input}]} if isinstance(user_input, str) else user_input
+    printer = TurnPrinter(out)
+    for mode, payload in graph.stream(inputs, config, stream_mode=["messages", "updates"]):
+        if mode == "messages":
+            printer.on_message(*payload)
+        else:
+            printer.on_update(payload)
+    return printer.finish()
+
+
+async def astream_chat(graph, user_input, config: dict = None, out=print) -> dict:
+    """Async version of `stream_chat` (uses `graph.astream`)."""
+    inputs = {"messages": [{"role": "user", "content": user_input}]} if isinstance(user_input, str) else user_input
+    printer = TurnPrinter(out)
+    async for mode, payload in graph.astream(inputs, config, stream_mode=["messages", "updates"]):
+        if mode == "messages":
+            printer.on_message(*payload)
+        else:
+            printer.on_update(payload)
+    return printer.finish()
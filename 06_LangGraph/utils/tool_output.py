@@ -0,0 +1,319 @@
+"""
+tool_output.py
+
+Size budgets for tool results before they go into `messages`.
+
+Every ToolMessage stays in the conversation, so one large search result (Tavily returns
+full page contents, raw HTML, scores, images ...) is re-sent to the LLM on every later step
+of the loop. `ToolOutputCompactor` shrinks each result to its tool's `OutputBudget`:
+
+    1. Field selection: keep only the fields that matter (e.g. title/url/content), drop the rest.
+    2. Structural truncation: cap list lengths, string lengths and nesting depth, leaving
+       markers like "... 3 more items" so the model knows something was cut.
+    3. Extractive summarization (optional): long strings keep their most informative
+       sentences (word-frequency scoring, boosted by the words of the tool call's query)
+       instead of just their first N characters.
+    4. If the result is still over budget, the limits are tightened until it fits.
+
+Serialization uses orjson when it is installed (several times faster than json), json otherwise.
+
+The full payload goes to a `ResultStore`, under the tool_call_id. The compacted result carries a
+reference to it, and the `fetch_full_result` tool returns it (in pages) only when the model asks.
+`report()` shows, per tool, how many bytes and (estimated) tokens compaction removed.
+
+Usage:
+    compactor = ToolOutputCompactor(
+        budgets={"tavily_search": OutputBudget(max_chars=2000, fields=["query", "results", "title", "url", "content"])},
+        store=ResultStore(),
+    )
+    tools = [tavily, compactor.fetch_tool]
+    llm_with_tools = llm.bind_tools(tools)
+    tool_node = BasicToolNode(tools, compactor=compactor)
+"""
+
+import json
+import re
+from collections import Counter, OrderedDict
+
+from langchain_core.tools import StructuredTool
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("o200k_base")
+except Exception:
+    _ENCODING = None
+
+
+FETCH_TOOL_NAME = "fetch_full_result"
+
+# Words that say nothing about what a sentence is about
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were will with".split()
+)
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def dumps(obj) -> str:
+    """Serialize a tool result to JSON (orjson if available)."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            pass  # not JSON-native (e.g. a pydantic model): fall back to json + str()
+    return json.dumps(obj, default=str)
+
+
+def estimate_tokens(text: str) -> int:
+    """Tokens in `text` (tiktoken if available, ~4 characters per token otherwise)."""
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text, disallowed_special=()))
+    return (len(text) + 3) // 4
+
+
+def summarize(text: str, max_chars: int, query: str = "") -> str:
+    """
+    Extractive summary: the highest-scoring sentences of `text`, in their original order,
+    within `max_chars`. A sentence scores by how frequent its words are in the whole text,
+    and words from `query` count three times as much.
+    """
+    if len(text) <= max_chars:
+        return text
+    sentences = [s.strip() for s in _SENTENCE_SPLIT.split(text) if s.strip()]
+    if len(sentences) <= 1:
+        return truncate_string(text, max_chars)
+
+    frequencies = Counter(w for w in _WORD.findall(text.lower()) if w not in _STOPWORDS)
+    query_words = set(_WORD.findall(query.lower())) - _STOPWORDS
+
+    def score(sentence: str) -> float:
+        words = [w for w in _WORD.findall(sentence.lower()) if w not in _STOPWORDS]
+        if not words:
+            return 0.0
+        return sum(frequencies[w] * (3 if w in query_words else 1) for w in words) / len(words)
+
+    ranked = sorted(range(len(sentences)), key=lambda i: score(sentences[i]), reverse=True)
+    chosen, used = set(), 0
+    for i in ranked:
+        if used + len(sentences[i]) + 1 > max_chars:
+            continue
+        chosen.add(i)
+        used += len(sentences[i]) + 1
+    if not chosen:
+        return truncate_string(sentences[ranked[0]], max_chars)
+    return " ".join(sentences[i] for i in sorted(chosen)) + f" [...{len(text) - used} chars omitted]"
+
+
+def truncate_string(text: str, max_chars: int) -> str:
+    """Cut at a word boundary and note how much was dropped."""
+    if len(text) <= max_chars:
+        return text
+    cut = text.rfind(" ", 0, max_chars)
+    cut = cut if cut > max_chars // 2 else max_chars
+    return f"{text[:cut]} [...{len(text) - cut} chars omitted]"
+
+
+class OutputBudget:
+    """
+    How much of a tool's result may go into the conversation.
+
+    Args:
+        max_chars (int): Target size of the serialized result.
+        max_items (int): Longest list kept; the rest is replaced by a "... N more items" marker.
+        max_string (int): Longest string kept.
+        max_depth (int): Deepest nesting kept; anything deeper becomes "...".
+        fields (list): Keys to keep in dicts (at any depth). None keeps every key.
+        drop_fields (list): Keys always removed (e.g. "raw_content", "images").
+        summarize (bool): Shorten long strings by extractive summarization instead of cutting them.
+    """
+
+    def __init__(self, max_chars: int = 4000, max_items: int = 5, max_string: int = 800, max_depth: int = 6,
+                 fields: list = None, drop_fields: list = None, summarize: bool = False) -> None:
+        self.max_chars = max_chars
+        self.max_items = max_items
+        self.max_string = max_string
+        self.max_depth = max_depth
+        self.fields = set(fields) if fields is not None else None
+        self.drop_fields = set(drop_fields or ())
+        self.summarize = summarize
+
+
+# Tavily returns page contents, raw HTML, scores and images; only title/url/content help the model
+TAVILY_BUDGET = OutputBudget(
+    max_chars=3000,
+    max_items=3,
+    max_string=700,
+    fields=["query", "answer", "results", "title", "url", "content"],
+    summarize=True,
+)
+
+
+class ResultStore:
+    """
+    Full tool results, kept outside the conversation and fetched by reference.
+
+    In memory, bounded to the `max_entries` most recent results (LRU).
+    """
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = max_entries
+        self._results = OrderedDict()
+
+    def put(self, ref: str, payload: str) -> None:
+        self._results[ref] = payload
+        self._results.move_to_end(ref)
+        while len(self._results) > self.max_entries:
+            self._results.popitem(last=False)
+
+    def get(self, ref: str):
+        payload = self._results.get(ref)
+        if payload is not None:
+            self._results.move_to_end(ref)
+        return payload
+
+    def __contains__(self, ref: str) -> bool:
+        return ref in self._results
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+
+class ToolOutputCompactor:
+    """
+    Applies per-tool OutputBudgets to tool results and keeps the full results in a ResultStore.
+
+    Args:
+        budgets (dict): OutputBudget per tool name.
+        default_budget (OutputBudget): Budget for tools not in `budgets`. None leaves them untouched.
+        store (ResultStore): Where full results of compacted outputs go. None drops them.
+        fetch_page_chars (int): Size of one page returned by the fetch_full_result tool.
+    """
+
+    def __init__(self, budgets: dict = None, default_budget: OutputBudget = None,
+                 store: ResultStore = None, fetch_page_chars: int = 8000) -> None:
+        self.budgets = budgets or {}
+        self.default_budget = default_budget
+        self.store = store
+        self.fetch_page_chars = fetch_page_chars
+        self.stats = {}
+        self.fetch_tool = self._make_fetch_tool() if store is not None else None
+
+    # ------------------------------------------------------
+    #  Compaction
+    # ------------------------------------------------------
+    def _shrink(self, value, budget: OutputBudget, limits: dict, query: str, depth: int = 0):
+        if depth > budget.max_depth:
+            return "..."
+        if isinstance(value, dict):
+            return {
+                key: self._shrink(item, budget, limits, query, depth + 1)
+                for key, item in value.items()
+                if key not in budget.drop_fields and (budget.fields is None or key in budget.fields)
+            }
+        if isinstance(value, (list, tuple)):
+            kept = [self._shrink(item, budget, limits, query, depth + 1) for item in value[:limits["items"]]]
+            if len(value) > limits["items"]:
+                kept.append(f"... {len(value) - limits['items']} more items")
+            return kept
+        if isinstance(value, str) and len(value) > limits["string"]:
+            if budget.summarize:
+                return summarize(value, limits["string"], query)
+            return truncate_string(value, limits["string"])
+        return value
+
+    def compact(self, tool_name: str, tool_call_id: str, result, args: dict = None) -> str:
+        """The serialized result to put in the ToolMessage: compacted if it is over its tool's budget."""
+        full = dumps(result)
+        budget = self.budgets.get(tool_name, self.default_budget)
+        if tool_name == FETCH_TOOL_NAME or budget is None or len(full) <= budget.max_chars:
+            self._record(tool_name, full, full, compacted=False)
+            return full
+
+        query = " ".join(str(v) for v in (args or {}).values() if isinstance(v, str))
+        limits = {"items": budget.max_items, "string": budget.max_string}
+        compacted = dumps(self._shrink(result, budget, limits, query))
+        # Still too big: tighten the limits until it fits (or they can't shrink further)
+        while len(compacted) > budget.max_chars and (limits["items"] > 1 or limits["string"] > 100):
+            limits = {"items": max(1, limits["items"] // 2), "string": max(100, limits["string"] // 2)}
+            compacted = dumps(self._shrink(result, budget, limits, query))
+        if len(compacted) > budget.max_chars:
+            compacted = dumps(truncate_string(compacted, budget.max_chars))
+
+        if self.store is not None:
+            self.store.put(tool_call_id, full)
+            compacted = dumps({
+                "result": json.loads(compacted),
+                "note": f"Output shortened from {len(full)} to {len(compacted)} chars. "
+                        f"Call {FETCH_TOOL_NAME}(ref=\"{tool_call_id}\") only if you need the full result.",
+            })
+        self._record(tool_name, full, compacted, compacted=True)
+        return compacted
+
+    def _record(self, tool_name: str, full: str, output: str, compacted: bool) -> None:
+        row = self.stats.setdefault(tool_name, {
+            "calls": 0, "compacted": 0, "bytes_in": 0, "bytes_out": 0, "tokens_in": 0, "tokens_out": 0,
+        })
+        row["calls"] += 1
+        row["bytes_in"] += len(full.encode())
+        row["bytes_out"] += len(output.encode())
+        tokens_in = estimate_tokens(full)
+        row["tokens_in"] += tokens_in
+        row["tokens_out"] += estimate_tokens(output) if compacted else tokens_in
+        row["compacted"] += compacted
+
+    # ------------------------------------------------------
+    #  Side store access
+    # ------------------------------------------------------
+    def fetch(self, ref: str, page: int = 0) -> str:
+        """One page of the full result stored under `ref`."""
+        payload = self.store.get(ref) if self.store is not None else None
+        if payload is None:
+            return f"No stored result for ref {ref!r}"
+        pages = max(1, -(-len(payload) // self.fetch_page_chars))
+        chunk = payload[page * self.fetch_page_chars:(page + 1) * self.fetch_page_chars]
+        if pages == 1:
+            return chunk
+        more = f"; call again with page={page + 1} for more" if page + 1 < pages else ""
+        return f"[page {page} of pages 0-{pages - 1}{more}]\n{chunk}"
+
+    def _make_fetch_tool(self) -> StructuredTool:
+        def fetch_full_result(ref: str, page: int = 0) -> str:
+            """
+            Fetch the full, unshortened output of an earlier tool call whose result was shortened.
+            Only use it when the shortened result is not enough to answer.
+
+            Args:
+                ref: The ref given in the shortened result's note.
+                page: Page of the full result (large results are returned in pages), starting at 0.
+            """
+            return self.fetch(ref, page)
+
+        return StructuredTool.from_function(fetch_full_result, name=FETCH_TOOL_NAME, parse_docstring=True)
+
+    # ------------------------------------------------------
+    #  Reporting
+    # ------------------------------------------------------
+    def report(self) -> dict:
+        """Per-tool bytes and tokens before/after compaction, and how much was removed."""
+        rows = {}
+        for tool_name, row in self.stats.items():
+            rows[tool_name] = {
+                **row,
+                "bytes_removed": row["bytes_in"] - row["bytes_out"],
+                "tokens_removed": row["tokens_in"] - row["tokens_out"],
+            }
+        return rows
+
+    def print_report(self) -> None:
+        print("-----------------------------------------")
+        print("Tool output compaction")
+        print(f"{'tool':<22}{'calls':>6}{'compacted':>10}{'bytes in':>10}{'bytes out':>11}{'tokens removed':>16}")
+        for tool_name, row in self.report().items():
+            print(f"{tool_name:<22}{row['calls']:>6}{row['compacted']:>10}{row['bytes_in']:>10}"
+                  f"{row['bytes_out']:>11}{row['tokens_removed']:>16}")
+        print("-----------------------------------------")
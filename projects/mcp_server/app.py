@@ -1,10 +1,18 @@
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
-from routes import router
+from models import async_engine
+from routes import router, writer
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await writer.close()  # commit the writes still queued
+    await async_engine.dispose()  # close the pooled aiosqlite connections (each runs on its own thread)
+
+app = FastAPI(lifespan=lifespan)
 app.include_router(router)
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8080)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8080)
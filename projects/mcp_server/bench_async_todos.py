@@ -0,0 +1,223 @@
+"""
+bench_async_todos.py
+
+Load test of the todo API at rising concurrency: the async routes (AsyncSession over aiosqlite)
+against the same routes written the previous, synchronous way (Session, `def` handlers that FastAPI
+runs in its threadpool).
+
+Each version is served by uvicorn in its own process, on a copy of the same seeded database. A pool
+of simulated clients sends requests back to back for --duration seconds at each concurrency level:
+    80%  GET  /todos/{id}                      a random existing todo
+    10%  GET  /todos/search?completed=false    one page of 20 from a random point in time
+    10%  POST /todos/                          a new todo
+and the throughput, latency percentiles and failed requests are reported per level.
+
+Usage:
+    python bench_async_todos.py                                  # 50,000 todos; 1, 8, 32, 128, 256 clients
+    python bench_async_todos.py --concurrency 16 64 --duration 10
+"""
+
+import argparse
+import asyncio
+import contextlib
+import os
+import random
+import shutil
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+
+START = datetime(2025, 1, 1)
+
+
+def build_sync_app():
+    """The todo routes the workload uses, as they were before the async database layer."""
+    from typing import Generator, Optional
+    from fastapi import Depends, FastAPI, HTTPException
+    from sqlalchemy.orm import Session
+    from models import SessionLocal, Todo, TodoCreate, TodoDB, TodoPage
+    from routes import decode_cursor, encode_cursor, keyset_query, todo_filters
+
+    app = FastAPI()
+
+    def get_db() -> Generator[Session, None, None]:
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    @app.post("/todos/", response_model=Todo)
+    def create_todo(todo: TodoCreate, db: Session = Depends(get_db)):
+        new_todo = TodoDB(id=str(uuid.uuid4()), title=todo.title, description=todo.description,
+                          completed=todo.completed, created_at=datetime.utcnow())
+        db.add(new_todo)
+        db.commit()
+        db.refresh(new_todo)
+        return new_todo
+
+    @app.get("/todos/search", response_model=TodoPage)
+    def search_todos(created_from: Optional[datetime] = None, completed: Optional[bool] = None,
+                     limit: int = 100, cursor: Optional[str] = None, db: Session = Depends(get_db)):
+        after = decode_cursor(cursor) if cursor else None
+        filters = todo_filters(created_from=created_from, completed=completed)
+        todos = db.execute(keyset_query(after, limit + 1, filters=filters)).scalars().all()
+        next_cursor = encode_cursor(todos[limit - 1].created_at, todos[limit - 1].id) if len(todos) > limit else None
+        return {"items": todos[:limit], "next_cursor": next_cursor}
+
+    @app.get("/todos/{todo_id}", response_model=Todo)
+    def get_todo(todo_id: str, db: Session = Depends(get_db)):
+        todo = db.query(TodoDB).filter(TodoDB.id == todo_id).first()
+        if not todo:
+            raise HTTPException(status_code=404, detail="Todo not found")
+        return todo
+
+    return app
+
+
+def serve(mode: str, port: int) -> None:
+    import uvicorn
+    if mode == "async":
+        from app import app
+    else:
+        app = build_sync_app()
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def build_db(path: str, rows: int) -> list:
+    """`rows` todos one minute apart, with the app's schema. Returns their ids."""
+    subprocess.run([sys.executable, "-c", "import models"], check=True,
+                   env={**os.environ, "TODO_DATABASE_URL": f"sqlite:///{path}"},
+                   cwd=os.path.dirname(os.path.abspath(__file__)))
+    ids = [str(uuid.uuid4()) for _ in range(rows)]
+    # The schema set the file to WAL, so the rows land in seed.db-wal first. Closing the last
+    # connection checkpoints them into seed.db, which is the only file the servers' copies get.
+    with contextlib.closing(sqlite3.connect(path)) as conn:
+        with conn:
+            conn.executemany(
+                "INSERT INTO todos (id, title, description, completed, created_at) VALUES (?, ?, ?, ?, ?)",
+                ((todo_id, f"todo #{i}", f"Description of todo #{i}", i % 3 == 0,
+                  (START + timedelta(minutes=i)).isoformat(" ", "microseconds")) for i, todo_id in enumerate(ids)),
+            )
+    return ids
+
+
+# ------------------------------------------------------
+#  Load generator
+# ------------------------------------------------------
+def percentile(values: list, p: float) -> float:
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+
+async def client_loop(client, ids: list, rows: int, deadline: float, latencies: list, errors: list) -> None:
+    while time.perf_counter() < deadline:
+        roll = random.random()
+        start = time.perf_counter()
+        try:
+            if roll < 0.8:
+                response = await client.get(f"/todos/{random.choice(ids)}")
+            elif roll < 0.9:
+                created_from = START + timedelta(minutes=random.randrange(rows))
+                response = await client.get("/todos/search", params={
+                    "completed": "false", "created_from": created_from.isoformat(), "limit": 20})
+            else:
+                response = await client.post("/todos/", json={"title": "load test", "description": "bench"})
+            if response.status_code != 200:
+                errors.append(str(response.status_code))
+                continue
+        except Exception as e:
+            errors.append(type(e).__name__)
+            continue
+        latencies.append(time.perf_counter() - start)
+
+
+async def run_level(port: int, ids: list, rows: int, concurrency: int, duration: float) -> dict:
+    import httpx
+    latencies, errors = [], []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60) as client:
+        start = time.perf_counter()
+        deadline = start + duration
+        await asyncio.gather(*(client_loop(client, ids, rows, deadline, latencies, errors) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "errors": len(errors),
+        "error_kinds": sorted(set(errors)),
+    }
+
+
+def start_server(mode: str, db_path: str) -> tuple:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    proc = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "--serve", mode, "--port", str(port)],
+        env={**os.environ, "TODO_DATABASE_URL": f"sqlite:///{db_path}"},
+        cwd=os.path.dirname(os.path.abspath(__file__)), stderr=subprocess.DEVNULL,  # failures are counted instead
+    )
+    for _ in range(200):
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            return proc, port
+        except OSError:
+            time.sleep(0.05)
+    proc.kill()
+    raise RuntimeError(f"{mode} server did not start")
+
+
+# ------------------------------------------------------
+#  Driver
+# ------------------------------------------------------
+def main(args) -> None:
+    workdir = tempfile.mkdtemp()
+    seed = os.path.join(workdir, "seed.db")
+    ids = build_db(seed, args.rows)
+
+    results = {}
+    for mode in ("sync", "async"):
+        db_path = os.path.join(workdir, f"{mode}.db")
+        shutil.copy(seed, db_path)
+        proc, port = start_server(mode, db_path)
+        try:
+            for concurrency in args.concurrency:
+                results[(mode, concurrency)] = asyncio.run(run_level(port, ids, args.rows, concurrency, args.duration))
+        finally:
+            proc.terminate()
+            proc.wait()
+    shutil.rmtree(workdir)
+
+    print("-----------------------------------------")
+    print(f"{args.rows:,} todos, {args.duration:.0f}s per level; 80% get, 10% search, 10% create")
+    print(f"{'clients':>8}{'mode':>7}{'req/s':>9}{'p50 ms':>9}{'p99 ms':>9}{'errors':>8}")
+    for concurrency in args.concurrency:
+        for mode in ("sync", "async"):
+            r = results[(mode, concurrency)]
+            kinds = f"  {', '.join(r['error_kinds'])}" if r["errors"] else ""
+            print(f"{concurrency:>8}{mode:>7}{r['rps']:>9.0f}{r['p50_ms']:>9.1f}{r['p99_ms']:>9.1f}{r['errors']:>8}{kinds}")
+    print("-----------------------------------------")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sync vs. async todo routes at rising concurrency")
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--concurrency", type=int, nargs="*", default=[1, 8, 32, 128, 256])
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per concurrency level")
+    parser.add_argument("--serve", choices=["sync", "async"], help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve:
+        serve(args.serve, args.port)
+    else:
+        main(args)
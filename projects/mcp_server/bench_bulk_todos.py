@@ -0,0 +1,129 @@
+"""
+bench_bulk_todos.py
+
+Creating, updating and deleting N todos through the per-item routes (one request, one commit and
+one fsync per todo) against POST /todos/bulk (one request and one transaction per batch).
+
+Each mode starts from an empty database in a temporary folder, with the API served by uvicorn in
+this process, and runs the three phases one after another: create N, update all N, delete all N.
+
+Usage:
+    python bench_bulk_todos.py                          # 10,000 todos, bulk batches of 1000
+    python bench_bulk_todos.py --todos 2000 --batch 500
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+
+# ------------------------------------------------------
+#  One mode (child process, so each gets a fresh database and engine)
+# ------------------------------------------------------
+def per_item(client, n: int, batch: int) -> dict:
+    timings = {}
+    start = time.perf_counter()
+    ids = [client.post("/todos/", json={"title": f"todo #{i}"}).json()["id"] for i in range(n)]
+    timings["create"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i, todo_id in enumerate(ids):
+        client.put(f"/todos/{todo_id}", json={"title": f"todo #{i}", "completed": True}).raise_for_status()
+    timings["update"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for todo_id in ids:
+        client.delete(f"/todos/{todo_id}").raise_for_status()
+    timings["delete"] = time.perf_counter() - start
+    return timings
+
+
+def bulk(client, n: int, batch: int) -> dict:
+    def send(operations: list) -> list:
+        results = []
+        for i in range(0, len(operations), batch):
+            response = client.post("/todos/bulk", json=operations[i:i + batch])
+            response.raise_for_status()
+            results.extend(response.json())
+        return results
+
+    timings = {}
+    start = time.perf_counter()
+    ids = [r["id"] for r in send([{"op": "create", "todo": {"title": f"todo #{i}"}} for i in range(n)])]
+    timings["create"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    send([{"op": "update", "id": todo_id, "todo": {"title": f"todo #{i}", "completed": True}}
+          for i, todo_id in enumerate(ids)])
+    timings["update"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = send([{"op": "delete", "id": todo_id} for todo_id in ids])
+    timings["delete"] = time.perf_counter() - start
+    assert all(r["status"] == "deleted" for r in results)
+    return timings
+
+
+def run_mode(mode: str, n: int, batch: int) -> dict:
+    import httpx
+    import uvicorn
+    from app import app
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+
+    with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=600) as client:
+        timings = (bulk if mode == "bulk" else per_item)(client, n, batch)
+    server.should_exit = True
+    return timings
+
+
+# ------------------------------------------------------
+#  Driver
+# ------------------------------------------------------
+def main(args) -> None:
+    results = {}
+    for mode in ("per_item", "bulk"):
+        with tempfile.TemporaryDirectory() as workdir:
+            proc = subprocess.run(
+                [sys.executable, __file__, "--child", mode, "--todos", str(args.todos), "--batch", str(args.batch)],
+                env={**os.environ, "TODO_DATABASE_URL": f"sqlite:///{workdir}/todos_bench.db"},
+                capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)),
+            )
+        if proc.returncode != 0:
+            print(f"{mode} failed:\n{proc.stderr[-2000:]}")
+            continue
+        results[mode] = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    print("-----------------------------------------")
+    print(f"{args.todos:,} todos, bulk batches of {args.batch}")
+    print(f"{'mode':<12}" + "".join(f"{phase + ' todos/s':>18}" for phase in ("create", "update", "delete")))
+    for mode, timings in results.items():
+        print(f"{mode:<12}" + "".join(f"{args.todos / timings[phase]:>18,.0f}" for phase in ("create", "update", "delete")))
+    if len(results) == 2:
+        print("speed-up    " + "".join(f"{results['per_item'][p] / results['bulk'][p]:>17.0f}x"
+                                       for p in ("create", "update", "delete")))
+    print("-----------------------------------------")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-item todo routes vs. POST /todos/bulk")
+    parser.add_argument("--todos", type=int, default=10_000)
+    parser.add_argument("--batch", type=int, default=1000, help="Operations per /todos/bulk request (max 10000)")
+    parser.add_argument("--child", choices=["per_item", "bulk"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        print(json.dumps(run_mode(args.child, args.todos, args.batch)))
+    else:
+        main(args)
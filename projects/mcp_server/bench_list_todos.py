@@ -0,0 +1,187 @@
+"""
+bench_list_todos.py
+
+Listing a million todos through the API: the old load-everything endpoint against the streamed
+and keyset-paginated ones in routes.py.
+
+The old GET /todos/ ran `db.query(TodoDB).all()` and validated the whole table through
+`response_model=List[Todo]` before sending a byte, so its memory and time to first byte grew with
+the table. Now /todos/ streams the array batch by batch, and /todos/page returns one page per
+(created_at, id) index seek.
+
+Each scenario runs in its own process (with the API served by uvicorn in that process), so the
+peak RSS it reports belongs to that scenario alone:
+    old /todos/            query().all() + List[Todo] validation (the previous implementation)
+    /todos/                streamed JSON array
+    /todos/?format=ndjson  streamed NDJSON
+    /todos/page            first page, a page deep in the table, and walking every page
+
+Usage:
+    python bench_list_todos.py                     # 1,000,000 rows, in a temporary database
+    python bench_list_todos.py --rows 200000 --db /tmp/todos_bench.db   # reuses the file if it has the rows
+"""
+
+import argparse
+import json
+import os
+import resource
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+
+SCENARIOS = ["old", "json", "ndjson", "page_first", "page_deep", "page_walk"]
+
+
+def build_db(path: str, rows: int) -> None:
+    """`rows` todos, one second apart, created with the app's own schema and indexes and its timestamp format."""
+    if os.path.exists(path):
+        with sqlite3.connect(path) as conn:
+            if conn.execute("SELECT COUNT(*) FROM todos").fetchone()[0] == rows:
+                return
+        os.remove(path)
+    subprocess.run([sys.executable, "-c", "import models"], check=True,
+                   env={**os.environ, "TODO_DATABASE_URL": f"sqlite:///{path}"}, cwd=os.path.dirname(__file__) or ".")
+    start = datetime(2025, 1, 1)
+    with sqlite3.connect(path) as conn:
+        conn.executemany(
+            "INSERT INTO todos (id, title, description, completed, created_at) VALUES (?, ?, ?, ?, ?)",
+            (
+                (str(uuid.uuid4()), f"todo #{i}", f"Description of todo #{i}, long enough to look real.",
+                 i % 3 == 0, (start + timedelta(seconds=i)).isoformat(" ", "microseconds"))
+                for i in range(rows)
+            ),
+        )
+
+
+def max_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+# ------------------------------------------------------
+#  One scenario (child process)
+# ------------------------------------------------------
+def add_old_endpoint(app) -> None:
+    """The previous GET /todos/, for comparison."""
+    from typing import List
+    from models import SessionLocal, Todo, TodoDB
+
+    @app.get("/bench/old_todos", response_model=List[Todo])
+    def old_get_all_todos():
+        with SessionLocal() as db:
+            return db.query(TodoDB).all()
+
+
+def fetch(client, url: str, params: dict = None) -> dict:
+    start = time.perf_counter()
+    ttfb = None
+    size = 0
+    with client.stream("GET", url, params=params) as response:
+        response.raise_for_status()
+        for chunk in response.iter_raw():
+            if ttfb is None:
+                ttfb = time.perf_counter() - start
+            size += len(chunk)
+    return {"ttfb_ms": (ttfb or 0) * 1000, "total_ms": (time.perf_counter() - start) * 1000, "bytes": size}
+
+
+def run_scenario(scenario: str, rows: int) -> dict:
+    import httpx
+    import uvicorn
+    from app import app
+
+    add_old_endpoint(app)
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+
+    rss_before = max_rss_mb()
+    with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=600) as client:
+        if scenario == "old":
+            result = fetch(client, "/bench/old_todos")
+        elif scenario == "json":
+            result = fetch(client, "/todos/")
+        elif scenario == "ndjson":
+            result = fetch(client, "/todos/", {"format": "ndjson"})
+        elif scenario == "page_first":
+            result = fetch(client, "/todos/page", {"limit": 100})
+        elif scenario == "page_deep":
+            # A cursor 90% of the way into the table: still one index seek
+            from routes import encode_cursor
+            cursor = encode_cursor(datetime(2025, 1, 1) + timedelta(seconds=int(rows * 0.9)), "")
+            result = fetch(client, "/todos/page", {"limit": 100, "cursor": cursor})
+        else:
+            start = time.perf_counter()
+            pages, cursor, first, size = 0, None, None, 0
+            while True:
+                params = {"limit": 1000, **({"cursor": cursor} if cursor else {})}
+                response = client.get("/todos/page", params=params)
+                size += len(response.content)
+                page = response.json()
+                pages += 1
+                first = first or (time.perf_counter() - start) * 1000
+                cursor = page["next_cursor"]
+                if not cursor:
+                    break
+            result = {"ttfb_ms": first, "total_ms": (time.perf_counter() - start) * 1000, "bytes": size, "pages": pages}
+    server.should_exit = True
+    return {**result, "rss_before_mb": rss_before, "peak_rss_mb": max_rss_mb()}
+
+
+# ------------------------------------------------------
+#  Driver
+# ------------------------------------------------------
+def main(args) -> None:
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.abspath(args.db or os.path.join(workdir, "todos_bench.db"))
+        start = time.perf_counter()
+        build_db(path, args.rows)
+        build_s = time.perf_counter() - start
+
+        results = {}
+        for scenario in args.scenarios:
+            proc = subprocess.run(
+                [sys.executable, __file__, "--child", scenario, "--rows", str(args.rows)],
+                env={**os.environ, "TODO_DATABASE_URL": f"sqlite:///{path}"}, capture_output=True, text=True,
+                cwd=os.path.dirname(os.path.abspath(__file__)),
+            )
+            if proc.returncode != 0:
+                print(f"{scenario} failed:\n{proc.stderr[-2000:]}")
+                continue
+            results[scenario] = json.loads(proc.stdout.strip().splitlines()[-1])
+
+        print("-----------------------------------------")
+        print(f"{args.rows:,} todos ({os.path.getsize(path) / 2**20:.0f} MB database, built in {build_s:.1f}s)")
+        print(f"{'scenario':<30}{'first byte ms':>14}{'total ms':>11}{'MB sent':>9}{'peak RSS MB':>13}{'added MB':>10}")
+        labels = {
+            "old": "old /todos/ (all())", "json": "/todos/ (stream)", "ndjson": "/todos/?format=ndjson",
+            "page_first": "/todos/page first", "page_deep": "/todos/page at 90%", "page_walk": "/todos/page all pages",
+        }
+        for scenario, r in results.items():
+            label = labels[scenario] + (f" ({r['pages']})" if "pages" in r else "")
+            print(f"{label:<30}{r['ttfb_ms']:>14.1f}{r['total_ms']:>11.0f}{r['bytes'] / 2**20:>9.1f}"
+                  f"{r['peak_rss_mb']:>13.0f}{r['peak_rss_mb'] - r['rss_before_mb']:>10.0f}")
+        print("-----------------------------------------")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Listing todos: load-everything vs. streamed vs. keyset pages")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--db", help="Database file to build or reuse (default: a temporary file)")
+    parser.add_argument("--scenarios", nargs="*", default=SCENARIOS, choices=SCENARIOS)
+    parser.add_argument("--child", choices=SCENARIOS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        print(json.dumps(run_scenario(args.child, args.rows)))
+    else:
+        main(args)
@@ -0,0 +1,171 @@
+"""
+bench_write_coalescing.py
+
+Write throughput and latency of the todo storage under concurrent writers, for three setups:
+    per_request  rollback journal (SQLite's default), each write in its own session and commit
+                 (the write routes before storage.py)
+    wal          storage.SQLITE_PRAGMAS, still one commit per write
+    coalesced    storage.SQLITE_PRAGMAS and storage.WriteCoalescer: one writer, one commit per group
+                 (what the routes do now); --window-ms adds a variant that waits that long for a group
+
+First checks that a write failing inside a group raises for its caller while the rest of the group
+commits. Each setup then gets a fresh database; W writer tasks insert todos back to back for --duration seconds,
+each waiting for its commit, as concurrent POST /todos/ requests would. Reported per setup and W:
+committed writes/s, p50/p99 latency of one write, failed writes, and for the coalescer the
+average group size.
+
+The database goes in a temporary folder under --dir (default: the system temp folder), since
+what a commit costs depends on the disk's fsync.
+
+Usage:
+    python bench_write_coalescing.py
+    python bench_write_coalescing.py --writers 1 32 512 --window-ms 2 --dir .
+"""
+
+import argparse
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from datetime import datetime
+
+
+def percentile(values: list, p: float) -> float:
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+
+async def run_level(setup: str, url: str, writers: int, duration: float, window_ms: float) -> dict:
+    from sqlalchemy import create_engine
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from models import Base, TodoDB
+    from storage import WriteCoalescer, configure_sqlite
+
+    sync_engine = create_engine(url)
+    engine = create_async_engine(url.replace("sqlite://", "sqlite+aiosqlite://", 1), pool_size=16, max_overflow=16)
+    if setup != "per_request":
+        configure_sqlite(sync_engine)
+        configure_sqlite(engine.sync_engine)
+    Base.metadata.create_all(sync_engine)
+    sync_engine.dispose()
+    session_factory = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+    coalescer = WriteCoalescer(session_factory, window_ms=window_ms) if setup.startswith("coalesced") else None
+
+    def new_todo() -> TodoDB:
+        return TodoDB(id=str(uuid.uuid4()), title="bench", description="write coalescing",
+                      completed=False, created_at=datetime.utcnow())
+
+    async def write_once() -> None:
+        todo = new_todo()
+        if coalescer:
+            async def add(db):
+                db.add(todo)
+            await coalescer.submit(add)
+        else:
+            async with session_factory() as db:
+                db.add(todo)
+                await db.commit()
+
+    latencies, errors = [], []
+
+    async def writer(deadline: float) -> None:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                await write_once()
+            except Exception as e:
+                errors.append(type(e).__name__)
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(writer(start + duration) for _ in range(writers)))
+    elapsed = time.perf_counter() - start
+    if coalescer:
+        await coalescer.close()
+    await engine.dispose()
+    return {
+        "wps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "errors": len(errors),
+        "error_kinds": sorted(set(errors)),
+        "avg_group": coalescer.stats()["avg_group"] if coalescer else None,
+    }
+
+
+async def check_failed_write(url: str) -> None:
+    """A write that fails at flush, grouped with a good one, must raise for its caller and store nothing."""
+    from sqlalchemy import create_engine, func, select
+    from sqlalchemy.exc import IntegrityError
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from models import Base, TodoDB
+    from storage import WriteCoalescer, configure_sqlite
+
+    sync_engine = create_engine(url)
+    Base.metadata.create_all(sync_engine)
+    sync_engine.dispose()
+    engine = create_async_engine(url.replace("sqlite://", "sqlite+aiosqlite://", 1))
+    configure_sqlite(engine.sync_engine)
+    session_factory = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+    coalescer = WriteCoalescer(session_factory)
+
+    def insert(todo_id: str):
+        async def add(db):
+            db.add(TodoDB(id=todo_id, title=todo_id, description="", completed=False, created_at=datetime.utcnow()))
+            return todo_id
+        return add
+
+    await coalescer.submit(insert("existing"))
+    # Submitted together, so they share a group: the duplicate key fails, the other write commits
+    duplicate, fresh = await asyncio.gather(coalescer.submit(insert("existing")), coalescer.submit(insert("fresh")),
+                                            return_exceptions=True)
+    await coalescer.close()
+    async with session_factory() as db:
+        stored = await db.scalar(select(func.count()).select_from(TodoDB))
+    await engine.dispose()
+    assert coalescer.stats()["retried_groups"] == 1, coalescer.stats()
+    assert isinstance(duplicate, IntegrityError), f"failed write returned {duplicate!r}"
+    assert fresh == "fresh" and stored == 2, (fresh, stored)
+
+
+def main(args) -> None:
+    workdir = tempfile.mkdtemp(dir=args.dir)
+    # models.py opens its own engines at import: point them into the scratch folder too
+    os.environ["TODO_DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'models.db')}"
+    setups = ["per_request", "wal", "coalesced"] + ([f"coalesced+{args.window_ms:g}ms"] if args.window_ms else [])
+
+    results = {}
+    try:
+        asyncio.run(check_failed_write(f"sqlite:///{os.path.join(workdir, 'check.db')}"))
+        for setup in setups:
+            for writers in args.writers:
+                url = f"sqlite:///{os.path.join(workdir, f'{setup}-{writers}.db')}"
+                window = args.window_ms if "ms" in setup else 0.0
+                results[(setup, writers)] = asyncio.run(run_level(setup, url, writers, args.duration, window))
+    finally:
+        shutil.rmtree(workdir)
+
+    print("-----------------------------------------")
+    print(f"{args.duration:.0f}s per level, database under {os.path.abspath(args.dir or tempfile.gettempdir())}")
+    print(f"{'writers':>8}  {'setup':<20}{'writes/s':>10}{'p50 ms':>9}{'p99 ms':>9}{'errors':>8}{'avg group':>11}")
+    for writers in args.writers:
+        for setup in setups:
+            r = results[(setup, writers)]
+            group = f"{r['avg_group']:>11.1f}" if r["avg_group"] is not None else f"{'-':>11}"
+            kinds = f"  {', '.join(r['error_kinds'])}" if r["errors"] else ""
+            print(f"{writers:>8}  {setup:<20}{r['wps']:>10.0f}{r['p50_ms']:>9.1f}{r['p99_ms']:>9.1f}{r['errors']:>8}{group}{kinds}")
+    print("-----------------------------------------")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-request commits vs. WAL vs. group commit under concurrent writers")
+    parser.add_argument("--writers", type=int, nargs="*", default=[1, 16, 64, 256])
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per setup and writer count")
+    parser.add_argument("--window-ms", type=float, default=0.0, help="Also run the coalescer with this grouping window")
+    parser.add_argument("--dir", help="Folder for the scratch databases (default: the system temp folder)")
+    main(parser.parse_args())
@@ -1,13 +1,15 @@
 import os
+import signal
 import asyncio
 import gradio as gr
 import openai
 from dotenv import load_dotenv
 
-from langchain_mcp_adapters.client import MultiServerMCPClient
 from langgraph.prebuilt import create_react_agent
 from langchain_openai import ChatOpenAI
 
+from mcp_pool import MCPSessionPool
+
 load_dotenv()
 
 # Load OpenAI API Key
@@ -16,22 +18,29 @@ openai.api_key = os.getenv("OPENAI_API_KEY")
 # Global to be reused in UI function
 agent = None
 
+# Pooled MCP sessions, kept open while the UI runs, and the event loop that owns them
+pool = None
+main_loop = None
+
 async def setup_agent():
-    global agent
-    client = MultiServerMCPClient(
+    global agent, pool, main_loop
+    main_loop = asyncio.get_running_loop()
+    # Tool schemas come from the disk cache when it is up to date, and servers
+    # are only connected the first time one of their tools is called.
+    pool = MCPSessionPool(
         {
             "fastapi-mcp": {
                 "url": "http://localhost:8000/mcp",
                 "transport": "sse"
             },
+            # Co-located FastMCP server, mounted in this process instead of spawned over stdio
             "dateserver": {
-                    "command": "python",
-                    "args": ["dateserver.py"],
-                    "transport": "stdio"
+                    "server": "dateserver:mcp",
+                    "transport": "in_process"
             }
         }
     )
-    tools = await client.get_tools()
+    tools = await pool.get_tools()
     model = ChatOpenAI(model="gpt-4o-mini", temperature=0.1)
     agent = create_react_agent(model, tools)
 
@@ -39,9 +48,12 @@ async def setup_agent():
 async def agent_response(user_input):
     if agent is None:
         return "Agent not ready. Please wait..."
-    response = await agent.ainvoke(
-        {"messages": [{"role": "user", "content": user_input}]}
+    # Gradio may call us from its own event loop; the pooled MCP sessions live on the main loop
+    future = asyncio.run_coroutine_threadsafe(
+        agent.ainvoke({"messages": [{"role": "user", "content": user_input}]}),
+        main_loop
     )
+    response = await asyncio.wrap_future(future)
     return response['messages'][-1].content
 
 # Launch Gradio inside async app
@@ -59,9 +71,14 @@ async def main():
     # Prevent thread blocking in async env
     demo.launch(prevent_thread_lock=True)
 
-    # Keep the app running
-    while True:
-        await asyncio.sleep(3600)
+    # Keep the app running until Ctrl+C or `run.sh kill` (SIGTERM), then close the MCP sessions
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    try:
+        while True:
+            await asyncio.sleep(3600)
+    finally:
+        demo.close()
+        await pool.aclose()
 
 if __name__ == "__main__":
     asyncio.run(main())
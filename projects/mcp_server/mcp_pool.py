@@ -0,0 +1,331 @@
+"""
+mcp_pool.py
+
+Long-lived MCP sessions and cached tool schemas for the MCP clients.
+
+`MultiServerMCPClient.get_tools()` opens a session to every server (spawning every stdio server),
+lists its tools, and - for the tools it returns - opens a brand new session on every tool call.
+`MCPSessionPool` instead:
+- Keeps one long-lived session per server and reuses it for every tool call
+  (MCP sessions multiplex concurrent requests, so one per server is enough).
+- Reconnects once and retries when a call fails because the session/transport broke.
+- Caches each server's tool schemas on disk, keyed by a version hash of the server's
+  connection config and, for local stdio servers, the source of the server script.
+- Builds the LangChain tools from the cache, so a server is only spawned/connected
+  the first time one of its tools is actually called.
+- Can mount a co-located FastMCP server inside the client process instead of spawning it:
+    {"transport": "in_process", "server": "mathserver:mcp"}   # calls the tools directly, no JSON-RPC
+    {"transport": "in_memory", "server": "mathserver:mcp"}    # full MCP protocol over memory streams
+  Both run the server's own tool functions, argument validation and result conversion.
+
+The same module is in 05_MCP/mcp_pool.py. 05_MCP and projects/mcp_server are separate uv
+projects, each locking its own mcp/langgraph versions, so each keeps its own copy: change both.
+
+Usage:
+    async with MCPSessionPool(connections) as pool:
+        tools = await pool.get_tools()
+        agent = create_react_agent(model, tools)
+"""
+
+import asyncio
+import hashlib
+import importlib
+import importlib.util
+import json
+import os
+import time
+from contextlib import asynccontextmanager
+
+from langchain_core.tools import StructuredTool, ToolException
+from langchain_mcp_adapters.client import MultiServerMCPClient
+from mcp.shared.exceptions import McpError
+from mcp.shared.memory import create_connected_server_and_client_session
+from mcp.types import CONNECTION_CLOSED, CallToolResult, ListToolsResult, TextContent, Tool as MCPTool
+
+
+CACHE_PATH = ".mcp_tools_cache.json"
+# Remote (HTTP/SSE) servers can change without us noticing, so their cached schemas expire
+REMOTE_CACHE_TTL = 24 * 3600
+# Transports handled by this module rather than by langchain-mcp-adapters
+LOCAL_TRANSPORTS = ("in_process", "in_memory")
+
+
+def server_source(connection: dict):
+    """Path of the module behind an in-process server spec like "mathserver:mcp", if any."""
+    server = connection.get("server")
+    if not isinstance(server, str):
+        return None
+    spec = importlib.util.find_spec(server.split(":")[0])
+    return spec.origin if spec else None
+
+
+def version_hash(connection: dict) -> str:
+    """
+    Hash of everything that defines a server's tools as seen from the client:
+    the connection config, plus the source of the local server script (stdio or in-process).
+    """
+    digest = hashlib.sha256(json.dumps(connection, sort_keys=True, default=str).encode())
+    paths = [os.path.join(connection.get("cwd") or "", arg) for arg in connection.get("args", [])]
+    if connection.get("transport") in LOCAL_TRANSPORTS:
+        paths.append(server_source(connection))
+    for path in paths:
+        if path and os.path.isfile(path):
+            with open(path, "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def is_local(connection: dict) -> bool:
+    return connection.get("transport") in ("stdio", *LOCAL_TRANSPORTS)
+
+
+def load_server(server):
+    """A FastMCP instance, given as-is or as a "module:attribute" string (attribute defaults to `mcp`)."""
+    if not isinstance(server, str):
+        return server
+    module_name, _, attribute = server.partition(":")
+    return getattr(importlib.import_module(module_name), attribute or "mcp")
+
+
+class InProcessSession:
+    """
+    The part of ClientSession the pool uses (list_tools / call_tool), backed directly by a FastMCP server.
+
+    Calls go straight to FastMCP's tool manager, so arguments are validated and results converted
+    exactly like on a real server, minus JSON-RPC framing, transport and process hops.
+    """
+
+    def __init__(self, server) -> None:
+        self.server = server
+
+    async def list_tools(self, cursor=None) -> ListToolsResult:
+        return ListToolsResult(tools=await self.server.list_tools())
+
+    async def call_tool(self, name: str, arguments: dict = None) -> CallToolResult:
+        try:
+            content = await self.server.call_tool(name, arguments or {})
+        except Exception as e:
+            # Same shape a server sends back for a failing tool
+            return CallToolResult(content=[TextContent(type="text", text=str(e))], isError=True)
+        if isinstance(content, tuple):
+            # (unstructured, structured) when the tool declares an output schema
+            content = content[0]
+        if isinstance(content, dict):
+            content = [TextContent(type="text", text=json.dumps(content))]
+        return CallToolResult(content=list(content), isError=False)
+
+
+@asynccontextmanager
+async def in_process_session(server):
+    yield InProcessSession(load_server(server))
+
+
+def tool_result_content(result):
+    """Convert an MCP CallToolResult to what LangChain tools return: a string, or a list of strings."""
+    texts = [c.text for c in result.content if isinstance(c, TextContent)]
+    content = texts[0] if len(texts) == 1 else texts or ""
+    if result.isError:
+        raise ToolException(content)
+    return content
+
+
+class ServerSession:
+    """
+    One long-lived session, owned by a background task.
+
+    The MCP transports use anyio cancel scopes, which must be exited by the task that entered them.
+    Tool calls may come from any task, so the session is opened and closed by a dedicated runner task.
+    """
+
+    def __init__(self, open_session) -> None:
+        self._open_session = open_session
+        self._ready = asyncio.get_running_loop().create_future()
+        self._stop = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        try:
+            async with self._open_session() as session:
+                self._ready.set_result(session)
+                await self._stop.wait()
+        except BaseException as e:
+            if not self._ready.done():
+                self._ready.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+
+    @property
+    def alive(self) -> bool:
+        return not self._task.done()
+
+    async def get(self):
+        return await asyncio.shield(self._ready)
+
+    async def close(self) -> None:
+        self._stop.set()
+        try:
+            await self._task
+        except Exception:
+            pass
+
+
+class MCPSessionPool:
+    """
+    Pool of long-lived MCP sessions, one per server, opened lazily.
+
+    Args:
+        connections (dict): Same format as MultiServerMCPClient, e.g.
+            {"math": {"command": "python", "args": ["mathserver.py"], "transport": "stdio"}}
+        cache_path (str): JSON file holding the cached tool schemas. None disables the cache.
+        remote_cache_ttl (float): Seconds a cached schema of a non-stdio server stays valid.
+    """
+
+    def __init__(self, connections: dict, cache_path: str = CACHE_PATH, remote_cache_ttl: float = REMOTE_CACHE_TTL) -> None:
+        self.connections = connections
+        self.cache_path = cache_path
+        self.remote_cache_ttl = remote_cache_ttl
+        self._client = MultiServerMCPClient(
+            {name: c for name, c in connections.items() if c.get("transport") not in LOCAL_TRANSPORTS}
+        )
+        self._sessions = {}
+        self._locks = {name: asyncio.Lock() for name in connections}
+        self.stats = {"connects": 0, "reconnects": 0, "calls": 0, "cache_hits": 0, "cache_misses": 0}
+
+    async def __aenter__(self) -> "MCPSessionPool":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    # ------------------------------------------------------
+    #  Sessions
+    # ------------------------------------------------------
+    def _open_session(self, server: str):
+        """Async context manager yielding an initialized ClientSession for `server`."""
+        connection = self.connections[server]
+        if connection.get("transport") == "in_process":
+            return in_process_session(connection["server"])
+        if connection.get("transport") == "in_memory":
+            return create_connected_server_and_client_session(load_server(connection["server"]))
+        return self._client.session(server)
+
+    async def session(self, server: str):
+        """The live session for `server`, connecting (or spawning the stdio server) on first use."""
+        async with self._locks[server]:
+            current = self._sessions.get(server)
+            if current is None or not current.alive:
+                if current is not None:
+                    self.stats["reconnects"] += 1
+                self.stats["connects"] += 1
+                current = ServerSession(lambda: self._open_session(server))
+                self._sessions[server] = current
+        return await current.get()
+
+    async def _drop(self, server: str, session) -> None:
+        """Close the pooled session if it is still the one that failed."""
+        async with self._locks[server]:
+            current = self._sessions.get(server)
+            if current is not None and current._ready.done() and not current._ready.exception() \
+                    and current._ready.result() is session:
+                del self._sessions[server]
+                await current.close()
+
+    async def call_tool(self, server: str, name: str, arguments: dict):
+        """Call a tool on the pooled session, reconnecting once if the session is broken."""
+        self.stats["calls"] += 1
+        session = await self.session(server)
+        try:
+            result = await session.call_tool(name, arguments)
+        except Exception as e:
+            # A JSON-RPC error from the server is an answer; only a broken session is worth a retry
+            if isinstance(e, McpError) and e.error.code != CONNECTION_CLOSED:
+                raise
+            await self._drop(server, session)
+            self.stats["reconnects"] += 1
+            session = await self.session(server)
+            result = await session.call_tool(name, arguments)
+        return tool_result_content(result)
+
+    async def aclose(self) -> None:
+        sessions, self._sessions = self._sessions, {}
+        for current in sessions.values():
+            await current.close()
+
+    # ------------------------------------------------------
+    #  Tool schemas
+    # ------------------------------------------------------
+    def _load_cache(self) -> dict:
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_cache(self, cache: dict) -> None:
+        if not self.cache_path:
+            return
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(cache, f, indent=2)
+        os.replace(tmp_path, self.cache_path)
+
+    def _cached_schemas(self, cache: dict, server: str):
+        entry = cache.get(server)
+        connection = self.connections[server]
+        if not entry or entry.get("version") != version_hash(connection):
+            return None
+        if not is_local(connection) and time.time() - entry.get("saved_at", 0) > self.remote_cache_ttl:
+            return None
+        return [MCPTool.model_validate(tool) for tool in entry["tools"]]
+
+    async def list_server_tools(self, server: str) -> list:
+        """Tool schemas of one server, from the disk cache or by asking the server."""
+        cache = self._load_cache()
+        schemas = self._cached_schemas(cache, server)
+        if schemas is not None:
+            self.stats["cache_hits"] += 1
+            return schemas
+
+        self.stats["cache_misses"] += 1
+        session = await self.session(server)
+        schemas, cursor = [], None
+        while True:
+            page = await session.list_tools(cursor=cursor)
+            schemas.extend(page.tools)
+            cursor = page.nextCursor
+            if not cursor:
+                break
+
+        cache = self._load_cache()
+        cache[server] = {
+            "version": version_hash(self.connections[server]),
+            "saved_at": time.time(),
+            "tools": [tool.model_dump(mode="json", exclude_none=True) for tool in schemas],
+        }
+        self._save_cache(cache)
+        return schemas
+
+    def _to_langchain_tool(self, server: str, schema: MCPTool) -> StructuredTool:
+        async def call(**arguments):
+            return await self.call_tool(server, schema.name, arguments)
+
+        return StructuredTool(
+            name=schema.name,
+            description=schema.description or "",
+            args_schema=schema.inputSchema,
+            coroutine=call,
+            metadata={"mcp_server": server},
+        )
+
+    async def get_tools(self) -> list:
+        """LangChain tools for every server. Servers with a valid cache entry are not contacted."""
+        tools = []
+        for server in self.connections:
+            for schema in await self.list_server_tools(server):
+                tools.append(self._to_langchain_tool(server, schema))
+        return tools
+
+    def report(self) -> dict:
+        return {**self.stats, "open_sessions": sorted(s for s, c in self._sessions.items() if c.alive)}
@@ -1,15 +1,32 @@
+import os
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Literal, Optional
 from datetime import datetime
-from sqlalchemy import Column, String, Boolean, DateTime
+from sqlalchemy import Column, String, Boolean, DateTime, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from storage import configure_sqlite
 
 # SQLAlchemy setup
-DATABASE_URL = "sqlite:///./todos.db"
+DATABASE_URL = os.getenv("TODO_DATABASE_URL", "sqlite:///./todos.db")
 engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# The API routes use the same database through aiosqlite, so a request waiting on SQLite doesn't
+# hold one of FastAPI's threadpool workers. The sync engine above creates the tables and serves scripts.
+ASYNC_DATABASE_URL = DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1)
+async_engine = create_async_engine(ASYNC_DATABASE_URL, pool_size=16, max_overflow=16)
+
+# WAL and the rest of storage.SQLITE_PRAGMAS on every connection of both engines
+if DATABASE_URL.startswith("sqlite"):
+    configure_sqlite(engine)
+    configure_sqlite(async_engine.sync_engine)
+# expire_on_commit=False: routes return the ORM object after commit, and reloading its
+# attributes would need an await that the response serializer can't do
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 Base = declarative_base()
 
 # SQLAlchemy Todo table
@@ -21,6 +38,13 @@ class TodoDB(Base):
     completed = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    # Keyset pagination walks the table in (created_at, id) order; /todos/search filters on
+    # completed first and pages through the rest in the same order
+    __table_args__ = (
+        Index("ix_todos_created_at_id", "created_at", "id"),
+        Index("ix_todos_completed_created_at_id", "completed", "created_at", "id"),
+    )
+
 # Pydantic models
 class TodoCreate(BaseModel):
     title: str
@@ -34,5 +58,23 @@ class Todo(BaseModel):
     completed: bool
     created_at: datetime
 
-# Create tables
-Base.metadata.create_all(bind=engine)
\ No newline at end of file
+class TodoPage(BaseModel):
+    items: List[Todo]
+    next_cursor: Optional[str] = None  # pass back as ?cursor= for the next page; None on the last page
+
+class TodoBulkOperation(BaseModel):
+    op: Literal["create", "update", "delete"]
+    id: Optional[str] = None          # the todo to update or delete
+    todo: Optional[TodoCreate] = None  # the new todo, or the new values of the updated one
+
+class TodoBulkResult(BaseModel):
+    index: int                         # position of the operation in the request
+    op: str
+    id: Optional[str] = None
+    status: Literal["created", "updated", "deleted", "not_found", "invalid"]
+    todo: Optional[Todo] = None        # the todo as created or updated
+
+# Create tables, and indexes added since the table was first created (create_all skips existing tables)
+Base.metadata.create_all(bind=engine)
+for index in TodoDB.__table__.indexes:
+    index.create(bind=engine, checkfirst=True)
\ No newline at end of file
@@ -1,43 +1,47 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
-from uuid import uuid4
+import base64
+import json
 from datetime import datetime
-from sqlalchemy.orm import Session
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List, Generator, Dict
+from typing import AsyncGenerator, AsyncIterator, Dict, List, Literal, Optional
 from uuid import uuid4
-from datetime import datetime
-from sqlalchemy.orm import Session
 
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import delete, insert, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from models import Todo, TodoCreate, TodoDB, SessionLocal
+from models import Todo, TodoBulkOperation, TodoBulkResult, TodoCreate, TodoDB, TodoPage, AsyncSessionLocal
+from storage import WriteCoalescer
 
 router = APIRouter()
 
-def get_db() -> Generator[Session, None, None]:
+PAGE_SIZE_MAX = 1000
+STREAM_BATCH_SIZE = 1000
+BULK_MAX_OPERATIONS = 10000
+SQL_IN_CHUNK = 500  # ids per IN (...) list, well under SQLite's bound-parameter limit
+
+# Every write goes through this one writer, which commits concurrent writes together
+writer = WriteCoalescer(AsyncSessionLocal)
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
-    Dependency that provides a SQLAlchemy database session.
+    Dependency that provides an async SQLAlchemy database session.
     Yields:
-        db (Session): SQLAlchemy session object.
-    Ensures the session is closed after use.
+        db (AsyncSession): SQLAlchemy session object.
+    Ensures the session is closed (and its connection returned to the pool) after use.
     """
-    db = SessionLocal()
-    try:
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 @router.post("/todos/", response_model=Todo)
-def create_todo(todo: TodoCreate, db: Session = Depends(get_db)) -> Todo:
+async def create_todo(todo: TodoCreate) -> Todo:
     """
     Create a new todo item in the database.
 
     Args:
         todo (TodoCreate): The todo item data from the request body.
-        db (Session): Database session (provided by dependency).
 
     Returns:
-        Todo: The created todo item.
+        Todo: The created todo item, once it is committed.
     """
     new_todo = TodoDB(
         id=str(uuid4()),
@@ -46,33 +50,258 @@ def create_todo(todo: TodoCreate, db: Session = Depends(get_db)) -> Todo:
         completed=todo.completed,
         created_at=datetime.utcnow()
     )
-    db.add(new_todo)
-    db.commit()
-    db.refresh(new_todo)
-    return new_todo
+
+    async def write(db: AsyncSession) -> TodoDB:
+        db.add(new_todo)
+        return new_todo  # nothing is generated by the database, so no refresh() round trip
+
+    return await writer.submit(write)
+
+async def find_created_at(db: AsyncSession, ids: List[str]) -> Dict[str, datetime]:
+    """created_at of each of `ids` that exists, looked up SQL_IN_CHUNK ids per query."""
+    found = {}
+    for i in range(0, len(ids), SQL_IN_CHUNK):
+        chunk = ids[i:i + SQL_IN_CHUNK]
+        found.update((await db.execute(select(TodoDB.id, TodoDB.created_at).where(TodoDB.id.in_(chunk)))).all())
+    return found
+
+@router.post("/todos/bulk", response_model=List[TodoBulkResult], operation_id="bulk_todos")
+async def bulk_todos(operations: List[TodoBulkOperation]) -> List[TodoBulkResult]:
+    """
+    Create, update and delete many todo items in one request and one transaction.
+
+    Each operation is {"op": "create", "todo": {...}}, {"op": "update", "id": ..., "todo": {...}}
+    or {"op": "delete", "id": ...}. They take effect as if applied in order, and either all of
+    them are committed or none. An update or delete of a missing todo doesn't fail the batch: its
+    result has status "not_found" (and an operation without its id or todo, "invalid").
+
+    Args:
+        operations (List[TodoBulkOperation]): Up to 10000 operations.
+
+    Returns:
+        List[TodoBulkResult]: One result per operation, in request order.
+
+    Raises:
+        HTTPException: If there are more than 10000 operations.
+    """
+    if len(operations) > BULK_MAX_OPERATIONS:
+        raise HTTPException(status_code=413, detail=f"At most {BULK_MAX_OPERATIONS} operations per request")
+    return await writer.submit(lambda db: apply_bulk(db, operations))
+
+async def apply_bulk(db: AsyncSession, operations: List[TodoBulkOperation]) -> List[dict]:
+    """The writes of /todos/bulk, in the writer's transaction."""
+    # Replay the operations against the ids that exist, then write each kind in one statement
+    existing = await find_created_at(db, list({op.id for op in operations if op.id}))
+    now = datetime.utcnow()
+    inserts, updates, deletes, results = [], {}, set(), []
+    for index, op in enumerate(operations):
+        result = {"index": index, "op": op.op, "id": op.id}
+        if op.op == "create" and op.todo:
+            row = {"id": str(uuid4()), **op.todo.model_dump(), "created_at": now}
+            inserts.append(row)
+            result.update(id=row["id"], status="created", todo=row)
+        elif op.op in ("update", "delete") and op.id and (op.todo or op.op == "delete"):
+            if op.id not in existing:
+                result["status"] = "not_found"
+            elif op.op == "update":
+                row = {"id": op.id, **op.todo.model_dump()}
+                updates[op.id] = row
+                result.update(status="updated", todo={**row, "created_at": existing[op.id]})
+            else:
+                del existing[op.id]
+                updates.pop(op.id, None)
+                deletes.add(op.id)
+                result["status"] = "deleted"
+        else:
+            result["status"] = "invalid"
+        results.append(result)
+
+    if inserts:
+        await db.execute(insert(TodoDB), inserts)
+    if updates:
+        await db.execute(update(TodoDB), list(updates.values()))  # executemany UPDATE ... WHERE id = ?
+    deleted = list(deletes)
+    for i in range(0, len(deleted), SQL_IN_CHUNK):
+        await db.execute(delete(TodoDB).where(TodoDB.id.in_(deleted[i:i + SQL_IN_CHUNK])))
+    return results
+
+def encode_cursor(created_at: datetime, todo_id: str) -> str:
+    """Opaque cursor for the position right after (created_at, id)."""
+    raw = json.dumps([created_at.isoformat(), todo_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(cursor: str) -> tuple:
+    try:
+        created_at, todo_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(created_at), todo_id
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def keyset_query(after: Optional[tuple], limit: int, *columns, filters: tuple = ()):
+    """
+    SELECT of up to `limit` todos after the (created_at, id) position `after`, in that order.
+    Each page is an index seek on ix_todos_created_at_id, however deep into the table it is.
+    """
+    query = select(*columns) if columns else select(TodoDB)
+    query = query.where(*filters)
+    if after is not None:
+        query = query.where(tuple_(TodoDB.created_at, TodoDB.id) > after)
+    return query.order_by(TodoDB.created_at, TodoDB.id).limit(limit)
+
+def todo_filters(
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    completed: Optional[bool] = None,
+    title_prefix: Optional[str] = None,
+) -> tuple:
+    """
+    SQL conditions for /todos/search. Each one can be answered from an index:
+    created_at ranges from ix_todos_created_at_id, `completed` plus a range from
+    ix_todos_completed_created_at_id, and the title prefix as a range on ix_todos_title
+    (a LIKE 'prefix%' would scan the table, since SQLite's LIKE ignores case and the index doesn't).
+    """
+    filters = []
+    if created_from is not None:
+        filters.append(TodoDB.created_at >= created_from)
+    if created_to is not None:
+        filters.append(TodoDB.created_at < created_to)
+    if completed is not None:
+        filters.append(TodoDB.completed == completed)
+    if title_prefix:
+        filters.append(TodoDB.title >= title_prefix)
+        filters.append(TodoDB.title < title_prefix + "\U0010ffff")
+    return tuple(filters)
+
+async def fetch_page(db: AsyncSession, cursor: Optional[str], limit: int, filters: tuple = ()) -> dict:
+    """One page of todos after `cursor`, as a TodoPage dict. Fetches one extra row to know if there is a next page."""
+    after = decode_cursor(cursor) if cursor else None
+    todos = (await db.execute(keyset_query(after, limit + 1, filters=filters))).scalars().all()
+    next_cursor = None
+    if len(todos) > limit:
+        todos = todos[:limit]
+        next_cursor = encode_cursor(todos[-1].created_at, todos[-1].id)
+    return {"items": todos, "next_cursor": next_cursor}
+
+def todo_json(row) -> str:
+    """A todo row as the JSON object the Todo model produces."""
+    return json.dumps({
+        "id": row.id,
+        "title": row.title,
+        "description": row.description,
+        "completed": bool(row.completed),
+        "created_at": row.created_at.isoformat() if row.created_at else None,
+    }, separators=(",", ":"))
+
+async def iter_todo_batches(batch_size: int = STREAM_BATCH_SIZE) -> AsyncIterator[list]:
+    """
+    Every todo, batch by batch. Each batch is its own short query and session, so memory stays at one
+    batch and a slow client never holds a read transaction open on the database.
+    """
+    columns = (TodoDB.id, TodoDB.title, TodoDB.description, TodoDB.completed, TodoDB.created_at)
+    after = None
+    while True:
+        async with AsyncSessionLocal() as db:
+            rows = (await db.execute(keyset_query(after, batch_size, *columns))).all()
+        if rows:
+            yield rows
+        if len(rows) < batch_size:
+            return
+        after = (rows[-1].created_at, rows[-1].id)
+
+async def stream_todos_json() -> AsyncIterator[str]:
+    """A JSON array of all todos, written as rows are fetched."""
+    separator = "["
+    async for rows in iter_todo_batches():
+        yield separator + ",".join(todo_json(row) for row in rows)
+        separator = ","
+    yield "[]" if separator == "[" else "]"
+
+async def stream_todos_ndjson() -> AsyncIterator[str]:
+    """One JSON todo per line, written as rows are fetched."""
+    async for rows in iter_todo_batches():
+        yield "".join(todo_json(row) + "\n" for row in rows)
 
 @router.get("/todos/", response_model=List[Todo])
-def get_all_todos(db: Session = Depends(get_db)) -> List[Todo]:
+async def get_all_todos(format: Literal["json", "ndjson"] = "json") -> StreamingResponse:
     """
     Retrieve all todo items from the database.
 
+    The response is streamed: rows are fetched and serialized in batches, so memory use doesn't grow
+    with the table and the first bytes arrive right away. Use /todos/page to fetch one page at a time.
+
     Args:
-        db (Session): Database session (provided by dependency).
+        format (str): "json" for a JSON array (default), "ndjson" for one todo per line.
 
     Returns:
         List[Todo]: List of all todo items.
     """
-    todos = db.query(TodoDB).all()
-    return todos
+    if format == "ndjson":
+        return StreamingResponse(stream_todos_ndjson(), media_type="application/x-ndjson")
+    return StreamingResponse(stream_todos_json(), media_type="application/json")
+
+@router.get("/todos/page", response_model=TodoPage)
+async def get_todos_page(
+    limit: int = Query(100, ge=1, le=PAGE_SIZE_MAX),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+) -> TodoPage:
+    """
+    Retrieve one page of todo items, oldest first.
+
+    Args:
+        limit (int): Page size (1-1000).
+        cursor (str): `next_cursor` of the previous page; omit for the first page.
+        db (AsyncSession): Database session (provided by dependency).
+
+    Returns:
+        TodoPage: The todos of this page and the cursor of the next one (None on the last page).
+
+    Raises:
+        HTTPException: If the cursor is malformed.
+    """
+    return await fetch_page(db, cursor, limit)
+
+@router.get("/todos/search", response_model=TodoPage, operation_id="search_todos")
+async def search_todos(
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    completed: Optional[bool] = None,
+    title_prefix: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=PAGE_SIZE_MAX),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+) -> TodoPage:
+    """
+    Search todo items by creation date, completion status and title prefix, oldest first.
+
+    Every filter is optional; the query only reads the matching rows.
+
+    Args:
+        created_from (datetime): Only todos created at or after this time (UTC, e.g. 2025-01-31T00:00:00).
+        created_to (datetime): Only todos created before this time (UTC).
+        completed (bool): Only completed (true) or open (false) todos.
+        title_prefix (str): Only todos whose title starts with this text (case-sensitive).
+        limit (int): Page size (1-1000).
+        cursor (str): `next_cursor` of the previous page; omit for the first page.
+        db (AsyncSession): Database session (provided by dependency).
+
+    Returns:
+        TodoPage: The matching todos of this page and the cursor of the next one (None on the last page).
+
+    Raises:
+        HTTPException: If the cursor is malformed.
+    """
+    filters = todo_filters(created_from, created_to, completed, title_prefix)
+    return await fetch_page(db, cursor, limit, filters)
 
 @router.get("/todos/{todo_id}", response_model=Todo)
-def get_todo(todo_id: str, db: Session = Depends(get_db)) -> Todo:
+async def get_todo(todo_id: str, db: AsyncSession = Depends(get_db)) -> Todo:
     """
     Retrieve a single todo item by its ID.
 
     Args:
         todo_id (str): The ID of the todo item.
-        db (Session): Database session (provided by dependency).
+        db (AsyncSession): Database session (provided by dependency).
 
     Returns:
         Todo: The requested todo item.
@@ -80,55 +309,63 @@ def get_todo(todo_id: str, db: Session = Depends(get_db)) -> Todo:
     Raises:
         HTTPException: If the todo item is not found.
     """
-    todo = db.query(TodoDB).filter(TodoDB.id == todo_id).first()
+    todo = await db.get(TodoDB, todo_id)
     if not todo:
         raise HTTPException(status_code=404, detail="Todo not found")
     return todo
 
 @router.put("/todos/{todo_id}", response_model=Todo)
-def update_todo(todo_id: str, todo_update: TodoCreate, db: Session = Depends(get_db)) -> Todo:
+async def update_todo(todo_id: str, todo_update: TodoCreate) -> Todo:
     """
     Update an existing todo item by its ID.
 
     Args:
         todo_id (str): The ID of the todo item to update.
         todo_update (TodoCreate): The updated todo data.
-        db (Session): Database session (provided by dependency).
 
     Returns:
-        Todo: The updated todo item.
+        Todo: The updated todo item, once it is committed.
 
     Raises:
         HTTPException: If the todo item is not found.
     """
-    db_todo = db.query(TodoDB).filter(TodoDB.id == todo_id).first()
-    if not db_todo:
+    # A missing todo is a result (None), not an exception: an exception would fail the whole
+    # group of writes and make the writer redo it write by write
+    async def write(db: AsyncSession) -> Optional[TodoDB]:
+        db_todo = await db.get(TodoDB, todo_id)
+        if not db_todo:
+            return None
+        db_todo.title = todo_update.title
+        db_todo.description = todo_update.description
+        db_todo.completed = todo_update.completed
+        return db_todo
+
+    db_todo = await writer.submit(write)
+    if db_todo is None:
         raise HTTPException(status_code=404, detail="Todo not found")
-    db_todo.title = todo_update.title
-    db_todo.description = todo_update.description
-    db_todo.completed = todo_update.completed
-    db.commit()
-    db.refresh(db_todo)
     return db_todo
 
 @router.delete("/todos/{todo_id}")
-def delete_todo(todo_id: str, db: Session = Depends(get_db)) -> Dict[str, str]:
+async def delete_todo(todo_id: str) -> Dict[str, str]:
     """
     Delete a todo item by its ID.
 
     Args:
         todo_id (str): The ID of the todo item to delete.
-        db (Session): Database session (provided by dependency).
 
     Returns:
-        dict: A message indicating successful deletion.
+        dict: A message indicating successful deletion, once it is committed.
 
     Raises:
         HTTPException: If the todo item is not found.
     """
-    db_todo = db.query(TodoDB).filter(TodoDB.id == todo_id).first()
-    if not db_todo:
+    async def write(db: AsyncSession) -> bool:
+        db_todo = await db.get(TodoDB, todo_id)
+        if not db_todo:
+            return False  # not an exception, as in update_todo
+        await db.delete(db_todo)
+        return True
+
+    if not await writer.submit(write):
         raise HTTPException(status_code=404, detail="Todo not found")
-    db.delete(db_todo)
-    db.commit()
     return {"detail": "Todo deleted"}
\ No newline at end of file
@@ -0,0 +1,201 @@
+"""
+storage.py
+
+SQLite storage profile and a single, group-committing writer for the todo database.
+
+Every write route used to commit on its own: concurrent writers queued on SQLite's database lock
+(retrying until busy_timeout) and each paid its own fsync. Here:
+
+    - `configure_sqlite(engine)` opens every connection with SQLITE_PRAGMAS: WAL, so readers
+      never wait for the writer; synchronous=FULL, so a commit is on disk when it returns; a
+      busy timeout, a larger page cache and memory-mapped reads
+    - `WriteCoalescer` runs every write on one writer. Writes that arrive while it is committing
+      (or within `window_ms` of the first) are applied one after another in one transaction and
+      committed together, with one fsync for the whole group. If any write in the group fails, the
+      group is rolled back and redone with each write in its own SAVEPOINT, so only the failed one
+      is lost. Each caller gets its own result or exception only after the commit, so an
+      acknowledged write is durable. Expected outcomes such as "not found" should be returned,
+      not raised, and turned into errors after `submit()`: raising is for real database errors.
+
+Usage:
+    configure_sqlite(async_engine.sync_engine)
+    writer = WriteCoalescer(AsyncSessionLocal)
+
+    async def add(db):
+        db.add(todo)
+        return todo
+
+    todo = await writer.submit(add)   # returns once the group holding this write is committed
+    ...
+    await writer.close()              # on shutdown: finish what's queued
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",       # readers and the writer don't block each other
+    "synchronous": "FULL",       # fsync the WAL on commit: acknowledged writes survive power loss
+    "busy_timeout": 5000,        # ms to wait for a lock held by another process before failing
+    "cache_size": -32000,        # KiB of page cache per connection (default ~2 MB)
+    "temp_store": "MEMORY",
+    "mmap_size": 256 * 2**20,    # read pages through mmap instead of read() calls
+}
+
+
+def configure_sqlite(engine: Engine, pragmas: Dict[str, Any] = SQLITE_PRAGMAS) -> None:
+    """
+    Apply `pragmas` to every new connection of `engine` (for an async engine, pass `.sync_engine`),
+    and let SQLAlchemy emit BEGIN itself, as SAVEPOINTs need. A connection with the execution option
+    sqlite_begin="IMMEDIATE" takes the write lock when its transaction begins.
+    """
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None   # the driver no longer BEGINs (or COMMITs) on its own
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def on_begin(connection):
+        connection.exec_driver_sql(f"BEGIN {connection.get_execution_options().get('sqlite_begin', 'DEFERRED')}")
+
+
+class WriteCoalescer:
+    """One writer task that applies queued writes in groups, one commit per group."""
+
+    def __init__(self, session_factory, window_ms: float = 0.0, max_batch: int = 256) -> None:
+        self.session_factory = session_factory
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.groups = 0
+        self.writes = 0
+        self.retried_groups = 0
+        self.commit_ms = 0.0
+        self._queue = None
+        self._task = None
+        self._loop = None
+
+    def _ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._run(), name="write-coalescer")
+
+    async def submit(self, write: Callable[[Any], Awaitable[Any]]) -> Any:
+        """
+        Run `await write(session)` in the next group and return its result once the group is
+        committed. If `write` raises, the exception is raised here and the rest of the group still
+        commits. `write` may run twice (when another write of its group fails), so it should only
+        change the database through `session`. Return a marker (e.g. None) for outcomes like "not
+        found" rather than raising, which would cost the whole group a rollback and a retry.
+        """
+        self._ensure_started()
+        future = self._loop.create_future()
+        await self._queue.put((write, future))
+        return await future
+
+    async def close(self) -> None:
+        """Apply everything already submitted, then stop the writer task."""
+        if self._task is not None and not self._task.done():
+            await self._queue.put(None)
+            await self._task
+        self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "writes": self.writes,
+            "groups": self.groups,
+            "avg_group": round(self.writes / self.groups, 1) if self.groups else 0,
+            "retried_groups": self.retried_groups,
+            "avg_commit_ms": round(self.commit_ms / self.groups, 2) if self.groups else 0,
+        }
+
+    async def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            # Everything that queued up while the previous group was committing, then whatever
+            # arrives within the window, up to max_batch
+            deadline = time.perf_counter() + self.window
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._commit(batch)
+
+    async def _commit(self, batch: list) -> None:
+        try:
+            outcomes = await self._apply(batch, isolate=False)
+        except Exception as e:
+            if len(batch) == 1:
+                outcomes = [(batch[0][1], None, e)]
+            else:
+                self.retried_groups += 1
+                try:
+                    outcomes = await self._apply(batch, isolate=True)
+                except Exception as e:
+                    # Nothing in the group was committed: every write fails with the commit's error
+                    outcomes = [(future, None, e) for _, future in batch]
+        self.groups += 1
+        self.writes += len(batch)
+        for future, result, error in outcomes:
+            if future.done():   # the caller went away; its write still happened
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    async def _apply(self, batch: list, isolate: bool) -> list:
+        """
+        Run the writes of `batch` in one transaction and commit it. With `isolate`, each write gets
+        a SAVEPOINT and a failing one is rolled back alone; without, the first failure is raised.
+        """
+        outcomes = []
+        async with self.session_factory() as session:
+            try:
+                await session.connection(execution_options={"sqlite_begin": "IMMEDIATE"})
+                for write, future in batch:
+                    if not isolate:
+                        result = await write(session)
+                        await session.flush()   # the next write sees this one's rows (and deletions)
+                        outcomes.append((future, result, None))
+                        continue
+                    try:
+                        async with session.begin_nested():
+                            result = await write(session)
+                            await session.flush()   # fail here, inside the SAVEPOINT, not at commit
+                    except Exception as e:
+                        outcomes.append((future, None, e))
+                    else:
+                        outcomes.append((future, result, None))
+                start = time.perf_counter()
+                await session.commit()
+                self.commit_ms += (time.perf_counter() - start) * 1000
+            except Exception:
+                # Roll back before the session closes, so objects the writes added become new
+                # (not detached) again and a retry inserts them
+                await session.rollback()
+                raise
+        return outcomes
@@ -1,16 +1,25 @@
 import streamlit as st
 import requests
-from datetime import datetime
+from datetime import date, datetime, time, timedelta
 
 API_URL = "http://localhost:8080"
 
 st.title("Todo App")
 
-def get_todos():
-    resp = requests.get(f"{API_URL}/todos/")
-    if resp.status_code == 200:
-        return resp.json()
-    return []
+def get_todos_created_on(day: date):
+    """Todos created on `day`, filtered by the API (one page of up to 1000 per request)."""
+    start = datetime.combine(day, time.min)
+    params = {"created_from": start.isoformat(), "created_to": (start + timedelta(days=1)).isoformat(), "limit": 1000}
+    todos = []
+    while True:
+        resp = requests.get(f"{API_URL}/todos/search", params=params)
+        if resp.status_code != 200:
+            return todos
+        page = resp.json()
+        todos.extend(page["items"])
+        if not page["next_cursor"]:
+            return todos
+        params["cursor"] = page["next_cursor"]
 
 def create_todo(title: str, description: str, completed: bool):
     data = {"title": title, "description": description, "completed": completed}
@@ -26,12 +35,6 @@ def delete_todo(todo_id: str):
     resp = requests.delete(f"{API_URL}/todos/{todo_id}")
     return resp.ok
 
-def is_today(date_str: str) -> bool:
-    try:
-        return datetime.fromisoformat(date_str).date() == datetime.now().date()
-    except Exception:
-        return False
-
 def rerun_app():
     if hasattr(st, "rerun"):
         st.rerun()
@@ -85,8 +88,7 @@ if st.session_state["show_add_popup"]:
             rerun_app()
 
 # Get and show today's todos
-todos = get_todos()
-today_todos = [todo for todo in todos if is_today(todo["created_at"])]
+today_todos = get_todos_created_on(date.today())
 
 st.subheader("Today's Todos")
 if not today_todos: